@@ -25,6 +25,7 @@ class SubBuild:
     parent_build_number: Optional[int] = None
     depth: int = 0
     log_path: Optional[str] = None
+    collapsed: bool = False  # Subtree skipped by failure-directed discovery
 
 
 @dataclass
@@ -1,20 +1,76 @@
 import re  # Added for timestamp removal
 import fcntl
+import io
+import json
+import os
+import shutil
+import threading
 import time
-import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
 
 from .base import Build
 from .config import CacheConfig
+from .exceptions import CacheError
 from .logging_config import get_component_logger
+from .single_flight import SingleFlight
+from .streaming.hot_tier import HotLogTier
+from .streaming.log_store import (
+    BLOCK_INDEX_SUFFIX,
+    COMPRESSED_SUFFIX,
+    LINE_INDEX_SUFFIX,
+    LogStoreReader,
+    LogStoreWriter,
+    publish_log,
+)
+from .utils import instance_key
 
 if TYPE_CHECKING:
     from .jenkins.jenkins_client import JenkinsClient
+    from .jenkins.log_fetcher import LogSizeProbe, LogWindow
     from .vector_manager import VectorManager
 
 logger = get_component_logger("cache_manager")
 
+MANIFEST_NAME = "manifest.json"
+LOCK_SUFFIX = ".lock"
+RESCAN_INTERVAL = 300.0  # Seconds between rescans picking up other processes' entries
+
+
+@dataclass
+class CacheManifest:
+    """Catalog record published next to each cached console log"""
+
+    jenkins_url: str
+    job_name: str
+    build_number: int
+    log_file: str
+    compressed: bool
+    text_size: int
+    stored_size: int
+    complete: bool
+    created_at: float = field(default_factory=time.time)
+    progressive_offset: Optional[int] = None  # X-Text-Size to resume a build from
+    generation: int = 0  # Bumped whenever the log is downloaded again
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["CacheManifest"]:
+        """Loads a manifest, returning None if it is missing or unreadable"""
+        try:
+            return cls(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        """Publishes the manifest atomically"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
 
 class CacheManager:
     # Regex to match common timestamp patterns at the beginning of a line
@@ -34,47 +90,131 @@ class CacheManager:
         """
         Initializes the CacheManager with configuration.
 
+        Logs are stored under ``base_dir/logs/<instance>/<job>/<build>/`` so the
+        cache survives restarts and can be shared by several server processes.
+
         Args:
             config: Cache configuration containing directory, size limits, and retention settings
             vector_manager: Optional vector manager for automatic indexing
         """
         self.config = config
-        
-        # Generate unique instance UUID for multiple instance support
-        self.instance_uuid = str(uuid.uuid4())[:8]  # Use short UUID for readability
-        
-        # Create instance-specific cache directory to avoid conflicts
-        self.cache_dir = config.base_dir / f"instance-{self.instance_uuid}"
-        
+        self.cache_dir = config.base_dir / "logs"
+
         self.max_size_mb = config.max_size_mb
+        self.max_size_bytes = config.max_size_mb * 1024 * 1024
         self.retention_days = config.retention_days
         self.enable_compression = config.enable_compression
+        self.tail_threshold_bytes = config.tail_threshold_mb * 1024 * 1024
+        self.tail_window_bytes = config.tail_window_mb * 1024 * 1024
         self.vector_manager = vector_manager
 
-        logger.info(f"Cache manager initialized with instance UUID: {self.instance_uuid}")
+        # Size accounting, LRU order and pins for entries being analysed,
+        # guarded by one lock
+        self._lock = threading.RLock()
+        self._pins: Counter = Counter()
+        # Entries chosen for eviction whose files are still being deleted
+        self._evicting: Set[str] = set()
+        self._evicted = threading.Condition(self._lock)
+        # Entry directory -> (size, manifest), least recently used first
+        self._entries: "OrderedDict[str, Tuple[int, CacheManifest]]" = OrderedDict()
+        self._total_bytes = 0
+        self._scanned_at = 0.0
+        self._single_flight = SingleFlight()
+
+        # Small, repeatedly read logs are kept decoded in memory for tool calls
+        self.hot_tier = HotLogTier(
+            config.hot_tier_mb * 1024 * 1024,
+            max_entry_bytes=config.hot_tier_entry_mb * 1024 * 1024,
+        )
+
         logger.info(f"Cache directory: {self.cache_dir}")
 
         # Ensure cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._rescan()
+        logger.info(
+            f"Cache holds {self._total_bytes / (1024 * 1024):.1f}MB of {self.max_size_mb}MB budget"
+        )
+
+    def get_entry_dir(self, build: Build, jenkins_url: Optional[str] = None) -> Path:
+        """
+        Returns the cache directory holding one build's log and manifest.
+
+        Job names are percent-encoded per folder segment so folder jobs map to
+        nested directories and arbitrary names stay filesystem safe.
+        """
+        job_dir = self.cache_dir / instance_key(jenkins_url)
+        for segment in build.job_name.strip("/").split("/"):
+            job_dir = job_dir / quote(segment, safe="")
+        return job_dir / str(build.build_number)
 
-    def get_path(self, build: Build) -> Path:
+    def get_path(self, build: Build, jenkins_url: Optional[str] = None) -> Path:
         """
         Constructs the cache path for a given build's console log.
 
+        Compressed logs are stored as ``console.log.gz`` in the seekable block
+        format from ``streaming.log_store``; uncompressed logs as ``console.log``.
+        A log downloaded again is stored as ``console.<generation>.log[.gz]``;
+        the published manifest names the current file.
+
         Args:
             build: The Build object.
+            jenkins_url: URL of the Jenkins instance the build belongs to.
 
         Returns:
             The Path object for the console log file.
         """
-        return self.cache_dir / build.job_name / str(build.build_number) / "console.log"
+        entry_dir = self.get_entry_dir(build, jenkins_url)
+        manifest = self.get_manifest(build, jenkins_url)
+        if manifest is not None:
+            return entry_dir / manifest.log_file
+        return entry_dir / self._log_name(0)
+
+    def _log_name(self, generation: int) -> str:
+        """File name of one generation of an entry's log"""
+        filename = "console.log" if generation == 0 else f"console.{generation}.log"
+        if self.enable_compression:
+            filename += COMPRESSED_SUFFIX
+        return filename
+
+    def get_manifest(
+        self, build: Build, jenkins_url: Optional[str] = None
+    ) -> Optional[CacheManifest]:
+        """Returns the published manifest for a build, if the log is cached"""
+        entry_dir = self.get_entry_dir(build, jenkins_url)
+        manifest = CacheManifest.load(entry_dir / MANIFEST_NAME)
+        if manifest is None or not (entry_dir / manifest.log_file).exists():
+            return None
+        return manifest
+
+    def _lookup(self, build: Build, jenkins_url: str) -> Optional[Path]:
+        """Returns the cached log path for a completed build, or None"""
+        manifest = self.get_manifest(build, jenkins_url)
+        if manifest is None or not manifest.complete:
+            return None
+        entry_dir = self.get_entry_dir(build, jenkins_url)
+        with self._lock:
+            if str(entry_dir) in self._entries:
+                self._entries.move_to_end(str(entry_dir))
+        # The manifest mtime keeps the LRU order across restarts
+        try:
+            os.utime(entry_dir / MANIFEST_NAME)
+        except OSError:
+            pass
+        return entry_dir / manifest.log_file
 
     def fetch(self, client: "JenkinsClient", build: Build) -> Path:
         """
         Fetches the console log for a build, caching it if not already present.
-        Uses file locking to handle concurrent access safely.
+        Concurrent fetches of the same build within this process share a single
+        download; a file lock serialises downloads across processes.
         Automatically indexes the log for vector search if vector manager is available.
 
+        A log is only served from cache once its manifest marks the build as
+        complete. Logs of running builds are extended on each call with the
+        bytes appended since the previous call, using the progressiveText
+        offset stored in the manifest.
+
         Args:
             client: The JenkinsClient instance.
             build: The Build object.
@@ -82,68 +222,463 @@ class CacheManager:
         Returns:
             The Path to the cached console log file.
         """
-        log_path = self.get_path(build)
-        lock_path = log_path.with_suffix('.lock')
-        
-        # Check if file already exists (quick check before locking)
-        if log_path.exists():
-            return log_path
-        
-        # Use file locking for concurrent access safety
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        jenkins_url = client.jenkins_url
+        cached_path = self._lookup(build, jenkins_url)
+        if cached_path is not None:
+            return cached_path
+
+        # Concurrent callers in this process share one download
+        key = (instance_key(jenkins_url), build.job_name, build.build_number)
+        return self._single_flight.do(
+            key, lambda: self._fetch_exclusive(client, build, jenkins_url)
+        )
+
+    def fetch_for_analysis(
+        self, client: "JenkinsClient", build: Build
+    ) -> Union[Path, "LogWindow"]:
+        """
+        Returns a build's cached log, or only its tail if it is too large.
+
+        Failure analysis mostly needs the end of a log. A log that is not cached
+        yet and is larger than ``tail_threshold_mb`` is not downloaded; instead
+        the last ``tail_window_mb`` are fetched into memory and returned as a
+        ``LogWindow``, which callers can extend backwards if they need more.
+        """
+        cached_path = self._lookup(build, client.jenkins_url)
+        if cached_path is not None or self.tail_threshold_bytes <= 0:
+            return cached_path or self.fetch(client, build)
+
         try:
-            with open(lock_path, 'w') as lock_file:
-                # Try to acquire exclusive lock with timeout
-                for attempt in range(10):  # Max 10 seconds wait
-                    try:
-                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                        break
-                    except IOError:
-                        if attempt == 9:  # Last attempt
-                            logger.warning(f"Could not acquire lock for {build.job_name} #{build.build_number} after 10s")
-                            # Proceed without lock as fallback
-                            break
-                        time.sleep(1)
-                
-                # Double-check if file was created by another process while we waited
-                if log_path.exists():
-                    return log_path
-                
-                # Fetch and process the log
-                logger.info(f"Fetching log for {build.job_name} #{build.build_number}")
-                raw_console_text = client.get_console_text(
-                    build.job_name, build.build_number
-                )
-
-                # Store raw logs - timestamp processing moved to analysis phase for better performance
-                processed_console_text = raw_console_text
-
-                log_path.write_text(
-                    processed_console_text, encoding="utf-8"
-                )
-
-                # Automatically index the log for vector search if available and enabled
-                if self.vector_manager and not getattr(self.vector_manager, 'vector_search_disabled', True):
-                    try:
-                        logger.info(
-                            f"Auto-indexing log for vector search: {build.job_name} #{build.build_number}"
+            text_size = self.probe_log_size(client, build).text_size
+        except Exception as e:
+            logger.debug(
+                f"Could not probe log size of {build.job_name} #{build.build_number}: {e}"
+            )
+            text_size = None
+
+        if text_size is not None and text_size > self.tail_threshold_bytes:
+            logger.info(
+                f"Log of {build.job_name} #{build.build_number} is "
+                f"{text_size / (1024 * 1024):.0f}MB; analysing its last "
+                f"{self.config.tail_window_mb}MB"
+            )
+            return client.fetch_log_tail(
+                build.job_name, build.build_number, self.tail_window_bytes
+            )
+        return self.fetch(client, build)
+
+    def probe_log_size(self, client: "JenkinsClient", build: Build) -> "LogSizeProbe":
+        """
+        Returns a build's log size without downloading the log.
+
+        A completed log already in the cache is answered from its manifest and
+        line index with no request to Jenkins. Otherwise Jenkins is asked for
+        the size only; the line count is then unknown.
+        """
+        from .jenkins.log_fetcher import LogSizeProbe
+
+        manifest = self.get_manifest(build, client.jenkins_url)
+        if manifest is not None and manifest.complete:
+            entry_dir = self.get_entry_dir(build, client.jenkins_url)
+            return LogSizeProbe(
+                text_size=manifest.text_size,
+                more_data=False,
+                line_count=self.line_count(entry_dir / manifest.log_file),
+            )
+        return client.probe_log_size(build.job_name, build.build_number)
+
+    def _fetch_exclusive(
+        self, client: "JenkinsClient", build: Build, jenkins_url: str
+    ) -> Path:
+        """
+        Downloads or extends a build's log while holding the entry's file lock.
+
+        The blocking ``flock`` only coordinates with other processes sharing
+        the cache directory; callers in this process are already coalesced.
+        The lock file is left in place, since deleting it would let two
+        processes lock different inodes for the same entry. The entry is
+        pinned for the whole fetch, so eviction in this process never removes
+        a log that is still being written or is about to be returned.
+
+        A log that cannot be extended is downloaded into a new generation file
+        and switched to by publishing the manifest, so readers of the previous
+        generation never see its files replaced one at a time.
+        """
+        entry_dir = self.get_entry_dir(build, jenkins_url)
+        lock_path = (entry_dir / self._log_name(0)).with_suffix(LOCK_SUFFIX)
+
+        with self.pinned(build, jenkins_url=jenkins_url):
+            entry_dir.mkdir(parents=True, exist_ok=True)
+            with open(lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    # Another process may have published the log while we waited
+                    cached_path = self._lookup(build, jenkins_url)
+                    if cached_path is not None:
+                        return cached_path
+
+                    previous = CacheManifest.load(entry_dir / MANIFEST_NAME)
+                    manifest = self.get_manifest(build, jenkins_url)
+
+                    if (
+                        manifest is not None
+                        and manifest.compressed == self.enable_compression
+                    ):
+                        manifest = self._append_progressive(
+                            client, build, entry_dir / manifest.log_file, manifest
                         )
-                        self.vector_manager.index_build_log(build, log_path)
-                        logger.info(
-                            f"Successfully indexed log: {build.job_name} #{build.build_number}"
+                    else:
+                        manifest = None
+                    if manifest is None:
+                        generation = previous.generation + 1 if previous else 0
+                        manifest = self._download_full(
+                            client,
+                            build,
+                            entry_dir / self._log_name(generation),
+                            jenkins_url,
+                            generation,
                         )
-                    except Exception as e:
-                        logger.warning(f"Failed to auto-index log for vector search: {e}")
 
+                    # The manifest is published last; its presence marks the entry as usable
+                    manifest.save(entry_dir / MANIFEST_NAME)
+                    log_path = entry_dir / manifest.log_file
+                    self.hot_tier.invalidate(log_path)
+                    if previous is not None and previous.log_file != manifest.log_file:
+                        self._remove_old_generations(entry_dir, previous, manifest)
+
+                    self._record_entry(entry_dir, manifest)
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+            # Automatically index the log for vector search once it is complete
+            if (
+                manifest.complete
+                and self.vector_manager
+                and not getattr(self.vector_manager, "vector_search_disabled", True)
+            ):
+                try:
+                    logger.info(
+                        f"Auto-indexing log for vector search: {build.job_name} #{build.build_number}"
+                    )
+                    self.vector_manager.index_build_log(build, log_path)
+                    logger.info(
+                        f"Successfully indexed log: {build.job_name} #{build.build_number}"
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to auto-index log for vector search: {e}")
+
+            if time.monotonic() - self._scanned_at > RESCAN_INTERVAL:
+                self._rescan()
+            if self._total_bytes > self.max_size_bytes:
+                self.enforce_size_limit()
+
+        return log_path
+
+    def _download_full(
+        self,
+        client: "JenkinsClient",
+        build: Build,
+        log_path: Path,
+        jenkins_url: str,
+        generation: int = 0,
+    ) -> CacheManifest:
+        """
+        Downloads the whole log into ``log_path``, a file no reader uses yet.
+
+        The log is streamed into a process-private temporary file and renamed
+        into place, so readers never see a partial log and memory use is
+        bounded by the download buffer rather than the log size.
+        """
+        logger.info(f"Fetching log for {build.job_name} #{build.build_number}")
+        tmp_path = log_path.with_name(f"{log_path.name}.{os.getpid()}.tmp")
+        with LogStoreWriter(tmp_path, compress=self.enable_compression) as writer:
+            download = client.download_progressive_log(
+                build.job_name,
+                build.build_number,
+                writer,
+                chunk_size=self.config.download_buffer_kb * 1024,
+            )
+        publish_log(tmp_path, log_path)
+        if download.transfer is not None and download.transfer.content_encoding:
+            logger.debug(
+                f"Log of {build.job_name} #{build.build_number} arrived "
+                f"{download.transfer.content_encoding}-encoded: "
+                f"{download.transfer.wire_bytes} wire bytes for "
+                f"{download.transfer.decoded_bytes} log bytes"
+            )
+
+        if download.text_size is None:
+            logger.warning(
+                f"No X-Text-Size header for {build.job_name} #{build.build_number}; "
+                "log will be downloaded again on next access"
+            )
+        return CacheManifest(
+            jenkins_url=jenkins_url,
+            job_name=build.job_name,
+            build_number=build.build_number,
+            log_file=log_path.name,
+            compressed=self.enable_compression,
+            text_size=writer.text_size,
+            stored_size=log_path.stat().st_size,
+            complete=download.text_size is not None and not download.more_data,
+            progressive_offset=download.text_size,
+            generation=generation,
+        )
+
+    def _remove_old_generations(
+        self, entry_dir: Path, previous: CacheManifest, current: CacheManifest
+    ) -> None:
+        """
+        Deletes log files of generations before ``previous``.
+
+        The previous generation is kept until the next switch, so a caller
+        that was handed its path just before the switch can still open it;
+        readers that already opened it hold the file open anyway.
+        """
+        self.hot_tier.invalidate(entry_dir / previous.log_file)
+        keep = {current.log_file, previous.log_file}
+        for path in entry_dir.iterdir():
+            log_name = path.name
+            for suffix in (BLOCK_INDEX_SUFFIX, LINE_INDEX_SUFFIX):
+                log_name = log_name.removesuffix(suffix)
+            if log_name.startswith("console.") and log_name not in keep:
+                if path.suffix != LOCK_SUFFIX:
+                    path.unlink(missing_ok=True)
+
+    def _append_progressive(
+        self,
+        client: "JenkinsClient",
+        build: Build,
+        log_path: Path,
+        manifest: CacheManifest,
+    ) -> Optional[CacheManifest]:
+        """
+        Appends the bytes a running build logged since the last fetch.
+
+        Returns:
+            The updated manifest, or None if the entry cannot be resumed and the
+            log has to be downloaded again.
+        """
+        if manifest.progressive_offset is None:
+            return None
+        try:
+            writer = LogStoreWriter(log_path, compress=manifest.compressed, append=True)
+        except (CacheError, OSError) as e:
+            logger.warning(f"Cannot resume cached log {log_path}: {e}")
+            return None
+
+        try:
+            download = client.download_progressive_log(
+                build.job_name,
+                build.build_number,
+                writer,
+                start=manifest.progressive_offset,
+                chunk_size=self.config.download_buffer_kb * 1024,
+            )
+        except Exception:
+            writer.abort()
+            raise
+
+        if not download.consistent:
+            writer.abort()
+            logger.info(
+                f"Log of {build.job_name} #{build.build_number} no longer continues at "
+                f"offset {manifest.progressive_offset}; downloading it again"
+            )
+            return None
+
+        writer.close()
+        logger.info(
+            f"Appended {download.bytes_written} bytes to cached log of "
+            f"{build.job_name} #{build.build_number}"
+        )
+        return replace(
+            manifest,
+            text_size=writer.text_size,
+            stored_size=log_path.stat().st_size,
+            complete=not download.more_data,
+            progressive_offset=download.text_size,
+        )
+
+    def iter_entries(self) -> Iterator[CacheManifest]:
+        """Yields the manifest of every published cache entry"""
+        if not self.cache_dir.exists():
+            return
+        for manifest_path in self.cache_dir.rglob(MANIFEST_NAME):
+            manifest = CacheManifest.load(manifest_path)
+            if manifest is not None:
+                yield manifest
+
+    def entry_dir_for(self, manifest: CacheManifest) -> Path:
+        """Returns the directory holding the entry described by ``manifest``"""
+        build = Build(job_name=manifest.job_name, build_number=manifest.build_number)
+        return self.get_entry_dir(build, manifest.jenkins_url)
+
+    def remove_entry(self, manifest: CacheManifest) -> int:
+        """
+        Removes a cache entry. The manifest is unlinked first so concurrent
+        readers stop treating the entry as valid before its files disappear.
+        The entry's lock file is kept, like ``_fetch_exclusive`` expects.
+
+        Returns:
+            The number of bytes freed.
+        """
+        entry_dir = self.entry_dir_for(manifest)
+        with self._lock:
+            record = self._entries.pop(str(entry_dir), None)
+            if record is not None:
+                self._total_bytes -= record[0]
+        return self._delete_entry_files(entry_dir, manifest)
+
+    def _delete_entry_files(self, entry_dir: Path, manifest: CacheManifest) -> int:
+        """Deletes an entry's files, manifest first; returns the bytes freed"""
+        freed = self._entry_size(entry_dir)
+        (entry_dir / MANIFEST_NAME).unlink(missing_ok=True)
+        self.hot_tier.invalidate(entry_dir / manifest.log_file)
+        try:
+            entries = list(entry_dir.iterdir())
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if entry.suffix == LOCK_SUFFIX:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+        return freed
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held by published cache entries"""
+        return self._total_bytes
+
+    @staticmethod
+    def _entry_size(entry_dir: Path) -> int:
+        """Total size of the files in a cache entry directory"""
+        try:
+            return sum(
+                entry.stat().st_size for entry in entry_dir.iterdir() if entry.is_file()
+            )
+        except FileNotFoundError:
+            return 0
+
+    def _record_entry(self, entry_dir: Path, manifest: CacheManifest) -> None:
+        """Accounts a just published entry as the most recently used one"""
+        size = self._entry_size(entry_dir)
+        with self._lock:
+            record = self._entries.pop(str(entry_dir), None)
+            if record is not None:
+                self._total_bytes -= record[0]
+            self._entries[str(entry_dir)] = (size, manifest)
+            self._total_bytes += size
+
+    def _scan_entries(self):
+        """Yields ``(last_access, size, manifest)`` for every published entry"""
+        for manifest in self.iter_entries():
+            entry_dir = self.entry_dir_for(manifest)
+            try:
+                last_access = (entry_dir / MANIFEST_NAME).stat().st_mtime
+            except FileNotFoundError:
+                continue
+            yield last_access, self._entry_size(entry_dir), manifest
+
+    def _rescan(self) -> None:
+        """
+        Rebuilds the size and LRU index from disk.
+
+        This runs at startup and then every ``RESCAN_INTERVAL`` seconds, to
+        pick up entries other processes sharing the cache directory added or
+        removed. The directory walk happens outside the lock.
+        """
+        entries = sorted(self._scan_entries(), key=lambda entry: entry[0])
+        index = OrderedDict(
+            (str(self.entry_dir_for(manifest)), (size, manifest))
+            for _, size, manifest in entries
+        )
+        with self._lock:
+            self._entries = index
+            self._total_bytes = sum(size for size, _ in index.values())
+            self._scanned_at = time.monotonic()
+
+    @contextmanager
+    def pinned(self, *builds: Build, jenkins_url: Optional[str] = None):
+        """
+        Protects the given builds' entries from eviction for the duration of
+        the block. Pins are per process; other processes may still evict.
+        An entry whose eviction is under way is waited for, so its files are
+        gone before the block starts writing new ones.
+        """
+        keys = [str(self.get_entry_dir(build, jenkins_url)) for build in builds]
+        with self._evicted:
+            self._evicted.wait_for(lambda: self._evicting.isdisjoint(keys))
+            self._pins.update(keys)
+        try:
+            yield
         finally:
-            # Clean up lock file
+            with self._lock:
+                self._pins.subtract(keys)
+                self._pins += Counter()  # Drop keys whose count reached zero
+
+    def enforce_size_limit(self) -> int:
+        """
+        Evicts least recently used entries until the cache fits ``max_size_mb``.
+
+        Victims are chosen from the in-memory LRU index, which is updated as
+        entries are published, read and removed, so no directory walk is
+        needed. Their files, and the vector data of their builds, are deleted
+        after the lock is released. Pinned entries are skipped.
+
+        Returns:
+            The number of entries evicted.
+        """
+        evicted: List[Tuple[str, int, CacheManifest]] = []
+        with self._lock:
+            if self._total_bytes <= self.max_size_bytes:
+                return 0
+            for key, (size, manifest) in list(self._entries.items()):
+                if self._total_bytes <= self.max_size_bytes:
+                    break
+                if self._pins[key]:
+                    continue
+                del self._entries[key]
+                self._total_bytes -= size
+                self._evicting.add(key)
+                evicted.append((key, size, manifest))
+
+        for key, size, manifest in evicted:
             try:
-                lock_path.unlink(missing_ok=True)
-            except Exception:
-                pass  # Ignore cleanup errors
+                self._delete_entry_files(Path(key), manifest)
+            finally:
+                with self._evicted:
+                    self._evicting.discard(key)
+                    self._evicted.notify_all()
+            logger.info(
+                f"Evicted {manifest.job_name} #{manifest.build_number} from cache ({size} bytes)"
+            )
+        # Vector deletes are network calls; other fetches need not wait for them
+        for _, _, manifest in evicted:
+            self._delete_vector_data(manifest)
 
-        return log_path
+        if evicted:
+            logger.info(
+                f"Cache eviction removed {len(evicted)} entries, {self._total_bytes / (1024 * 1024):.1f}MB remain"
+            )
+        return len(evicted)
+
+    def _delete_vector_data(self, manifest: CacheManifest) -> None:
+        if not self.vector_manager or not hasattr(
+            self.vector_manager, "delete_build_data"
+        ):
+            return
+        try:
+            self.vector_manager.delete_build_data(
+                Build(job_name=manifest.job_name, build_number=manifest.build_number)
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to delete vector data for {manifest.job_name} #{manifest.build_number}: {e}"
+            )
 
     def read_lines(self, path: Path) -> List[str]:
         """
@@ -153,8 +688,60 @@ class CacheManager:
             path: The Path object of the file to read.
 
         Returns:
-            A list of strings, where each string is a line from the file.
+            A list of strings, where each string is a line from the file. For a
+            log in the hot tier the list is shared, so treat it as read-only.
+        """
+        lines = self.hot_tier.all_lines(Path(path))
+        if lines is not None:
+            return lines
+        with LogStoreReader(Path(path)) as reader:
+            return reader.read_lines()
+
+    def read_line_range(
+        self, path: Path, start_line: int, end_line: Optional[int] = None
+    ) -> List[str]:
+        """
+        Reads a window of lines without decompressing the whole log.
+
+        The line index maps line numbers straight to byte offsets, so only the
+        blocks covering the window are read. A log already in the hot tier is
+        sliced from memory, but a window never loads a log into it.
+
+        Args:
+            path: The Path object of the cached log.
+            start_line: First line to return (0-based).
+            end_line: Line to stop before (0-based, exclusive); None reads to the end.
+
+        Returns:
+            The requested lines.
+        """
+        hot_log = self.hot_tier.get(Path(path), load=False)
+        if hot_log is not None:
+            return hot_log.read_lines(start_line, end_line)
+        with LogStoreReader(Path(path)) as reader:
+            return reader.read_lines(start_line, end_line)
+
+    def line_count(self, path: Path) -> int:
+        """Returns the number of lines in a cached log."""
+        hot_log = self.hot_tier.get(Path(path), load=False)
+        if hot_log is not None:
+            return hot_log.line_count
+        with LogStoreReader(Path(path)) as reader:
+            return reader.line_count
+
+    def open_text(self, path: Path) -> io.TextIOBase:
+        """
+        Opens a cached log as a streaming text file, decompressing on the fly.
+
+        Args:
+            path: The Path object of the cached log.
+
+        Returns:
+            A text stream that can be iterated line by line or passed to
+            ``StreamingLogProcessor.process_streaming``.
         """
-        return path.read_text(
-            encoding="utf-8"
-        ).splitlines()  # Specify encoding and use splitlines()
+        hot_log = self.hot_tier.get(Path(path))
+        if hot_log is not None:
+            return hot_log.open_text()
+        with LogStoreReader(Path(path)) as reader:
+            return reader.open_text()
@@ -4,6 +4,8 @@ import time
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from .base import Build
+from .cache_manager import MANIFEST_NAME
 from .config import CleanupConfig
 from .exceptions import CleanupError
 from .logging_config import get_component_logger
@@ -39,10 +41,14 @@ class CleanupManager:
         """Clean up expired build data from cache directory.
 
         Args:
-            cache_dir: Cache directory to clean. If not provided, will use a default.
+            cache_dir: Cache directory to clean. If not provided, the cache
+                manager's entries are cleaned, falling back to a default directory.
         """
-        # This method can be called with a cache_dir parameter for flexibility
-        # In the future, this will be integrated with the cache manager
+        if cache_dir is None and self.cache_manager is not None:
+            self._cleanup_cache_entries()
+            self.cache_manager.enforce_size_limit()
+            return
+
         target_cache_dir = cache_dir or "/tmp/mcp-jenkins"
 
         now = time.time()
@@ -129,6 +135,50 @@ class CleanupManager:
             logger.error(f"Failed to cleanup expired builds: {e}")
             # Log error but don't re-raise to allow other operations to continue
 
+    def _cleanup_cache_entries(self) -> None:
+        """Remove cache manager entries not accessed within the retention period"""
+        now = time.time()
+        logger.info(
+            f"Starting cleanup of expired builds in {self.cache_manager.cache_dir}"
+        )
+
+        try:
+            for manifest in list(self.cache_manager.iter_entries()):
+                entry_dir = self.cache_manager.entry_dir_for(manifest)
+                build_id = f"{manifest.job_name}:{manifest.build_number}"
+                try:
+                    manifest_mtime = os.path.getmtime(entry_dir / MANIFEST_NAME)
+                except FileNotFoundError:
+                    logger.debug(
+                        f"Cache entry {entry_dir} was already removed. Skipping."
+                    )
+                    continue
+
+                if (now - manifest_mtime) <= self.retention_seconds:
+                    logger.debug(f"Cache entry {entry_dir} is not expired. Skipping.")
+                    continue
+
+                logger.info(f"Deleting expired cache entry: {entry_dir}")
+                self.cache_manager.remove_entry(manifest)
+
+                if self.vector_manager and hasattr(
+                    self.vector_manager, "delete_build_data"
+                ):
+                    try:
+                        self.vector_manager.delete_build_data(
+                            Build(
+                                job_name=manifest.job_name,
+                                build_number=manifest.build_number,
+                            )
+                        )
+                        logger.info(f"Successfully deleted vector data for {build_id}")
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to delete vector data for {build_id}: {e}"
+                        )
+        except Exception as e:
+            logger.error(f"Failed to cleanup expired builds: {e}")
+
     def cleanup_orphaned_vector_data(self) -> None:
         """Clean up orphaned vector data from Qdrant"""
         if not self.vector_manager or not hasattr(self.vector_manager, "client"):
@@ -146,20 +196,11 @@ class CleanupManager:
             # Note: This is a simplified approach. In practice, you'd want to
             # store creation timestamps in the payload and filter by them
 
-            # For now, we'll clean up based on build directories that no longer exist
+            # Clean up vector data for builds that are no longer cached
             cache_builds = set()
-            if self.cache_manager and self.cache_manager.cache_dir.exists():
-                for build_dir in self.cache_manager.cache_dir.iterdir():
-                    if build_dir.is_dir():
-                        # Extract build info from directory name
-                        try:
-                            parts = build_dir.name.split("_")
-                            if len(parts) >= 2:
-                                job_name = "_".join(parts[:-1])
-                                build_number = int(parts[-1])
-                                cache_builds.add(f"{job_name}:{build_number}")
-                        except (ValueError, IndexError):
-                            continue
+            if self.cache_manager:
+                for manifest in self.cache_manager.iter_entries():
+                    cache_builds.add(f"{manifest.job_name}:{manifest.build_number}")
 
             # Get all unique build_ids from Qdrant
             # This is a simplified approach - in production you'd want pagination
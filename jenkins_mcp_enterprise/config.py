@@ -38,6 +38,21 @@ class JenkinsConfig:
     token: Optional[str] = None
     timeout: int = 30
     verify_ssl: bool = True
+    metadata_ttl: float = 5.0  # Seconds to reuse metadata of running builds
+    metadata_cache_dir: Optional[Path] = None  # Persist completed build metadata
+    hierarchy_cache_dir: Optional[Path] = None  # Persist discovered build hierarchies
+    build_graph_db: Optional[Path] = None  # SQLite file for the reverse build graph
+    missing_build_ttl: float = 60.0  # Seconds to remember builds that returned 404
+    unsupported_endpoint_ttl: float = 3600.0  # Seconds to skip absent wfapi/flow graph
+    http2: bool = False  # Negotiate HTTP/2 in the async client (needs the h2 package)
+    pool_max_per_host: int = 32  # Pooled keep-alive connections per host
+    pool_hosts: int = 4  # Hosts (scheme/host/port) to keep pools for
+    pool_block: bool = False  # Wait for a free connection instead of opening extra ones
+    rate_limit: float = 0.0  # Requests per second to this controller, 0 for unlimited
+    rate_burst: int = 20  # Requests allowed at once above the rate after idling
+    max_concurrency: int = 16  # Upper bound of the adaptive in-flight request limit
+    min_concurrency: int = 2  # Lower bound the limit backs off to under overload
+    latency_target: float = 5.0  # Seconds to first byte seen as overload, 0 = off
 
     def __post_init__(self):
         if not self.url:
@@ -46,6 +61,20 @@ class JenkinsConfig:
             raise ConfigurationError("Jenkins username is required")
         if not self.url.startswith(("http://", "https://")):
             raise ConfigurationError("Jenkins URL must start with http:// or https://")
+        if self.metadata_ttl < 0:
+            raise ConfigurationError("Build metadata TTL cannot be negative")
+        if self.missing_build_ttl < 0 or self.unsupported_endpoint_ttl < 0:
+            raise ConfigurationError("Negative cache TTLs cannot be negative")
+        if self.pool_max_per_host <= 0 or self.pool_hosts <= 0:
+            raise ConfigurationError("HTTP pool sizes must be positive")
+        if self.rate_limit < 0 or self.latency_target < 0:
+            raise ConfigurationError("Rate limit and latency target cannot be negative")
+        if self.rate_burst <= 0:
+            raise ConfigurationError("Rate limit burst must be positive")
+        if not 0 < self.min_concurrency <= self.max_concurrency:
+            raise ConfigurationError(
+                "Concurrency limits must satisfy 0 < min_concurrency <= max_concurrency"
+            )
 
 
 @dataclass
@@ -56,12 +85,27 @@ class CacheConfig:
     max_size_mb: int = 1000
     retention_days: int = 7
     enable_compression: bool = True
+    download_buffer_kb: int = 64  # Read size when streaming logs to disk
+    hot_tier_mb: int = 256  # In-memory budget for recently used logs, 0 disables
+    hot_tier_entry_mb: int = 16  # Larger logs are always read from disk
+    tail_threshold_mb: int = 512  # Analyse larger uncached logs from the tail, 0 = off
+    tail_window_mb: int = 8  # Bytes fetched from the end of such logs
 
     def __post_init__(self):
         if self.max_size_mb <= 0:
             raise ConfigurationError("Cache max size must be positive")
         if self.retention_days <= 0:
             raise ConfigurationError("Cache retention days must be positive")
+        if self.download_buffer_kb <= 0:
+            raise ConfigurationError("Cache download buffer size must be positive")
+        if self.hot_tier_mb < 0:
+            raise ConfigurationError("Cache hot tier size cannot be negative")
+        if self.hot_tier_entry_mb <= 0:
+            raise ConfigurationError("Cache hot tier entry size must be positive")
+        if self.tail_threshold_mb < 0:
+            raise ConfigurationError("Cache tail threshold cannot be negative")
+        if self.tail_window_mb <= 0:
+            raise ConfigurationError("Cache tail window size must be positive")
 
 
 @dataclass
@@ -145,6 +189,11 @@ class MCPConfig:
             max_size_mb=int(os.getenv("CACHE_MAX_SIZE_MB", "1000")),
             retention_days=int(os.getenv("CACHE_RETENTION_DAYS", "7")),
             enable_compression=os.getenv("CACHE_COMPRESSION", "true").lower() == "true",
+            download_buffer_kb=int(os.getenv("CACHE_DOWNLOAD_BUFFER_KB", "64")),
+            hot_tier_mb=int(os.getenv("CACHE_HOT_TIER_MB", "256")),
+            hot_tier_entry_mb=int(os.getenv("CACHE_HOT_TIER_ENTRY_MB", "16")),
+            tail_threshold_mb=int(os.getenv("CACHE_TAIL_THRESHOLD_MB", "512")),
+            tail_window_mb=int(os.getenv("CACHE_TAIL_WINDOW_MB", "8")),
         )
 
         # Qdrant configuration
@@ -245,6 +294,11 @@ class MCPConfig:
                 "max_size_mb": self.cache.max_size_mb,
                 "retention_days": self.cache.retention_days,
                 "enable_compression": self.cache.enable_compression,
+                "download_buffer_kb": self.cache.download_buffer_kb,
+                "hot_tier_mb": self.cache.hot_tier_mb,
+                "hot_tier_entry_mb": self.cache.hot_tier_entry_mb,
+                "tail_threshold_mb": self.cache.tail_threshold_mb,
+                "tail_window_mb": self.cache.tail_window_mb,
             },
             "vector": {
                 "host": self.vector.host,
@@ -87,6 +87,10 @@ class DIContainer:
         from .multi_jenkins_manager import set_multi_jenkins_manager
 
         set_multi_jenkins_manager(multi_jenkins_manager)
+
+        # Validate credentials off the startup path
+        if multi_jenkins_manager.settings.get("warm_up_connections", True):
+            multi_jenkins_manager.warm_up()
         self._instances[JenkinsClient] = jenkins_client
         self._instances[CacheManager] = cache_manager
         self._instances[VectorManager] = vector_manager
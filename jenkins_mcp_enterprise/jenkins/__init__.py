@@ -6,8 +6,10 @@ This package contains decomposed Jenkins services for better maintainability:
 - LogFetcher: Console log retrieval
 - SubBuildDiscoverer: Sub-build hierarchy traversal
 - JenkinsClient: Unified client using all services
+- AsyncJenkinsClient: Asyncio client for concurrent read fan-outs
 """
 
+from .async_client import AsyncFanout, AsyncJenkinsClient
 from .build_manager import BuildManager
 from .connection_manager import JenkinsConnectionManager
 from .jenkins_client import JenkinsClient
@@ -15,6 +17,8 @@ from .log_fetcher import LogFetcher
 from .subbuild_discoverer import SubBuildDiscoverer
 
 __all__ = [
+    "AsyncFanout",
+    "AsyncJenkinsClient",
     "JenkinsClient",
     "JenkinsConnectionManager",
     "BuildManager",
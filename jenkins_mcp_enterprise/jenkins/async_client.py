@@ -0,0 +1,493 @@
+"""Asyncio Jenkins client on a pooled httpx connection
+
+``JenkinsClient`` blocks on python-jenkins and ``requests``, so fanning out
+over many sub-builds needs a thread per request. ``AsyncJenkinsClient`` covers
+the same read surface (build info, console logs, progressiveText, wfapi, tree
+API, queue) with coroutines sharing one keep-alive pool, optionally over
+HTTP/2, so hundreds of builds can be inspected concurrently from the MCP event
+loop.
+
+A client is bound to the event loop it is first used on; create one per loop
+and close it with ``aclose()`` or ``async with``. Synchronous code, such as
+sub-build discovery running inside a tool call, uses ``AsyncFanout``, which
+keeps one client on a private event-loop thread.
+"""
+
+import asyncio
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from ..base import Build
+from ..config import JenkinsConfig
+from ..exceptions import (
+    BuildNotFoundError,
+    JenkinsAuthenticationError,
+    JenkinsConnectionError,
+)
+from ..logging_config import get_component_logger
+from .build_metadata_cache import BuildMetadataCache
+from .connection_manager import JenkinsConnectionManager
+from .governor import RequestGovernor, retry_after_seconds
+from .job_name_utils import JobNameParser
+from .log_fetcher import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    LOG_TRANSFER_HEADERS,
+    ProgressiveDownload,
+    TransferStats,
+)
+from .negative_cache import MISSING_BUILD, NO_WFAPI, NegativeCache
+
+logger = get_component_logger("jenkins.async")
+
+DEFAULT_FANOUT_CONCURRENCY = 32
+
+T = TypeVar("T")
+
+
+class _GovernedTransport(httpx.AsyncBaseTransport):
+    """Admits each request through the controller's governor before sending"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: RequestGovernor):
+        self._transport = transport
+        self._governor = governor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._governor.acquire_async()
+        started = asyncio.get_running_loop().time()
+        status_code, failed, retry_after = None, True, 0.0
+        try:
+            response = await self._transport.handle_async_request(request)
+            status_code, failed = response.status_code, False
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            return response
+        finally:
+            self._governor.release(
+                asyncio.get_running_loop().time() - started,
+                status_code=status_code,
+                failed=failed,
+                retry_after=retry_after,
+            )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncJenkinsClient:
+    """Asyncio counterpart of ``JenkinsClient`` for read-heavy fan-outs"""
+
+    def __init__(
+        self,
+        config: JenkinsConfig,
+        build_metadata: Optional[BuildMetadataCache] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        governor: Optional[RequestGovernor] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.config = config
+        self.build_metadata = build_metadata or BuildMetadataCache(
+            config.url,
+            running_ttl=config.metadata_ttl,
+            persist_dir=config.metadata_cache_dir,
+        )
+        self.negative_cache = negative_cache or NegativeCache(
+            missing_build_ttl=config.missing_build_ttl,
+            unsupported_ttl=config.unsupported_endpoint_ttl,
+        )
+        self.governor = governor or RequestGovernor(
+            rate=config.rate_limit,
+            burst=config.rate_burst,
+            max_concurrency=config.max_concurrency,
+            min_concurrency=config.min_concurrency,
+            latency_target=config.latency_target,
+        )
+
+        http2 = config.http2
+        if http2 and transport is None and not _http2_available():
+            logger.warning(
+                "HTTP/2 requested but the h2 package is missing; using HTTP/1.1"
+            )
+            http2 = False
+
+        auth = None
+        if config.username and config.token:
+            auth = httpx.BasicAuth(config.username, config.token)
+        if transport is None:
+            # Sized like the sync pool unless overridden
+            transport = httpx.AsyncHTTPTransport(
+                verify=config.verify_ssl,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections or config.pool_max_per_host,
+                    max_keepalive_connections=(
+                        max_keepalive_connections or config.pool_max_per_host
+                    ),
+                ),
+            )
+        self._http = httpx.AsyncClient(
+            base_url=config.url.rstrip("/"),
+            auth=auth,
+            timeout=config.timeout,
+            transport=_GovernedTransport(transport, self.governor),
+        )
+        self._inflight: Dict[Tuple[str, int, int], "asyncio.Task"] = {}
+
+    @classmethod
+    def from_connection(
+        cls, connection: JenkinsConnectionManager, **kwargs: Any
+    ) -> "AsyncJenkinsClient":
+        """Creates an async client sharing a sync connection's caches and governor"""
+        return cls(
+            connection.config,
+            build_metadata=connection.build_metadata,
+            negative_cache=connection.negative_cache,
+            governor=connection.governor,
+            **kwargs,
+        )
+
+    async def __aenter__(self) -> "AsyncJenkinsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    @property
+    def jenkins_url(self) -> str:
+        return self.config.url
+
+    def _build_path(self, job_name: str, build_number: int, suffix: str) -> str:
+        api_job_path = JobNameParser.to_jenkins_api_path(job_name)
+        return f"/{api_job_path}/{build_number}/{suffix}"
+
+    def _raise_for_status(self, response: httpx.Response, what: str) -> None:
+        if response.status_code == 404:
+            raise BuildNotFoundError(f"{what} not found (404)")
+        if response.status_code in (401, 403):
+            raise JenkinsAuthenticationError(
+                f"Jenkins refused access to {what} ({response.status_code})"
+            )
+        if response.status_code >= 400:
+            raise JenkinsConnectionError(
+                f"Jenkins returned {response.status_code} for {what}"
+            )
+
+    async def _get_json(
+        self, path: str, what: str, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        try:
+            response = await self._http.get(path, params=params)
+        except httpx.HTTPError as e:
+            raise JenkinsConnectionError(f"Request for {what} failed: {e}") from e
+        self._raise_for_status(response, what)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise JenkinsConnectionError(f"Invalid JSON for {what}: {e}") from e
+
+    # Build metadata
+
+    async def get_build_info(
+        self, job_name: str, build_number: int, depth: int = 1
+    ) -> Dict[str, Any]:
+        """Get build JSON, served from the shared metadata cache when possible"""
+        if self.negative_cache.is_known(MISSING_BUILD, job_name, build_number):
+            raise BuildNotFoundError(
+                f"Build {job_name}#{build_number} does not exist (cached)"
+            )
+        info = self.build_metadata.peek(job_name, build_number, depth)
+        if info is not None:
+            return info
+
+        # Concurrent coroutines asking for the same build share one request
+        key = (job_name, int(build_number), depth)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._load_build_info(job_name, build_number, depth)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load_build_info(
+        self, job_name: str, build_number: int, depth: int
+    ) -> Dict[str, Any]:
+        try:
+            info = await self._get_json(
+                self._build_path(job_name, build_number, "api/json"),
+                f"Build {job_name}#{build_number}",
+                params={"depth": depth},
+            )
+        except BuildNotFoundError:
+            self.negative_cache.record(MISSING_BUILD, job_name, build_number)
+            raise
+        self.build_metadata.put(job_name, build_number, depth, info)
+        return info
+
+    async def get_build(
+        self, job_name: str, build_number: int, depth: int = 1
+    ) -> Build:
+        """Get information about a specific build"""
+        info = await self.get_build_info(job_name, build_number, depth)
+        status = "UNKNOWN"
+        if info.get("result"):
+            status = info["result"]
+        elif info.get("building"):
+            status = "BUILDING"
+        return Build(
+            job_name=job_name,
+            build_number=build_number,
+            status=status,
+            url=info.get("url"),
+        )
+
+    async def gather_build_info(
+        self,
+        builds: Iterable[Tuple[str, int]],
+        depth: int = 1,
+        concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Fetches many builds concurrently as coroutines.
+
+        At most ``concurrency`` requests are in flight at once. Results are in
+        input order; a build that could not be fetched yields its exception.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(job_name: str, build_number: int):
+            async with semaphore:
+                try:
+                    return await self.get_build_info(job_name, build_number, depth)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(fetch(job, number) for job, number in builds))
+
+    async def get_job_info(self, job_name: str) -> Dict[str, Any]:
+        api_job_path = JobNameParser.to_jenkins_api_path(job_name)
+        return await self._get_json(f"/{api_job_path}/api/json", f"Job {job_name}")
+
+    async def get_tree(
+        self, job_name: str, build_number: int, tree: str
+    ) -> Dict[str, Any]:
+        """Get build JSON restricted by a ``tree`` query"""
+        return await self._get_json(
+            self._build_path(job_name, build_number, "api/json"),
+            f"Build {job_name}#{build_number}",
+            params={"tree": tree},
+        )
+
+    async def get_wfapi(
+        self, job_name: str, build_number: int, endpoint: str = "describe"
+    ) -> Optional[Any]:
+        """
+        Get a pipeline's ``wfapi/<endpoint>`` data.
+
+        Returns None for jobs without the Pipeline Stage View API; such jobs
+        are remembered in the negative cache and not asked again.
+        """
+        if self.negative_cache.is_known(NO_WFAPI, job_name):
+            return None
+        try:
+            return await self._get_json(
+                self._build_path(job_name, build_number, f"wfapi/{endpoint}"),
+                f"wfapi/{endpoint} of {job_name}#{build_number}",
+            )
+        except BuildNotFoundError:
+            # Only blame the job if the build itself exists
+            try:
+                await self.get_build_info(job_name, build_number, depth=0)
+            except BuildNotFoundError:
+                return None
+            self.negative_cache.record(NO_WFAPI, job_name)
+            return None
+
+    # Queue
+
+    async def get_queue_info(self) -> List[Dict[str, Any]]:
+        data = await self._get_json("/queue/api/json", "Build queue")
+        return data.get("items", [])
+
+    async def get_queue_item(self, queue_id: int) -> Dict[str, Any]:
+        return await self._get_json(
+            f"/queue/item/{queue_id}/api/json", f"Queue item {queue_id}"
+        )
+
+    # Console logs
+
+    async def get_console_text(self, job_name: str, build_number: int) -> str:
+        try:
+            response = await self._http.get(
+                self._build_path(job_name, build_number, "consoleText"),
+                headers=LOG_TRANSFER_HEADERS,
+            )
+        except httpx.HTTPError as e:
+            raise JenkinsConnectionError(f"Log fetch failed: {e}") from e
+        self._raise_for_status(response, f"Log of {job_name}#{build_number}")
+        return response.text
+
+    async def download_console_log(
+        self,
+        job_name: str,
+        build_number: int,
+        sink: BinaryIO,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> int:
+        """Stream the raw console log into ``sink``, returning the bytes written"""
+        download = await self._stream_into(
+            job_name, build_number, "consoleText", None, sink, chunk_size
+        )
+        return download.bytes_written
+
+    async def download_progressive_log(
+        self,
+        job_name: str,
+        build_number: int,
+        sink: BinaryIO,
+        start: int = 0,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> ProgressiveDownload:
+        """Stream the log from byte offset ``start`` via ``logText/progressiveText``"""
+        return await self._stream_into(
+            job_name,
+            build_number,
+            "logText/progressiveText",
+            {"start": start},
+            sink,
+            chunk_size,
+        )
+
+    async def _stream_into(
+        self,
+        job_name: str,
+        build_number: int,
+        suffix: str,
+        params: Optional[Dict[str, Any]],
+        sink: BinaryIO,
+        chunk_size: int,
+    ) -> ProgressiveDownload:
+        if self.negative_cache.is_known(MISSING_BUILD, job_name, build_number):
+            raise BuildNotFoundError(
+                f"Build {job_name}#{build_number} does not exist (cached)"
+            )
+        written = 0
+        try:
+            async with self._http.stream(
+                "GET",
+                self._build_path(job_name, build_number, suffix),
+                params=params,
+                headers=LOG_TRANSFER_HEADERS,
+            ) as response:
+                try:
+                    self._raise_for_status(
+                        response, f"Log of {job_name}#{build_number}"
+                    )
+                except BuildNotFoundError:
+                    self.negative_cache.record(MISSING_BUILD, job_name, build_number)
+                    raise
+                text_size = response.headers.get("X-Text-Size")
+                more_data = response.headers.get("X-More-Data", "").lower() == "true"
+                async for chunk in response.aiter_bytes(chunk_size):
+                    sink.write(chunk)
+                    written += len(chunk)
+                transfer = TransferStats(
+                    response.num_bytes_downloaded,
+                    written,
+                    response.headers.get("Content-Encoding"),
+                )
+        except httpx.HTTPError as e:
+            raise JenkinsConnectionError(
+                f"Log download failed for {job_name}#{build_number}: {e}"
+            ) from e
+
+        return ProgressiveDownload(
+            start=(params or {}).get("start", 0),
+            bytes_written=written,
+            text_size=int(text_size) if text_size is not None else None,
+            more_data=more_data,
+            transfer=transfer,
+        )
+
+
+class AsyncFanout:
+    """
+    Runs an ``AsyncJenkinsClient`` on a private event-loop thread.
+
+    Synchronous callers, including tools that run on the MCP event loop
+    itself, hand it a batch of reads and block until all of them are done;
+    the requests share one keep-alive pool and the connection's caches and
+    governor instead of taking a thread each. The loop thread starts on
+    first use.
+    """
+
+    def __init__(self, connection: JenkinsConnectionManager, **client_kwargs: Any):
+        self._connection = connection
+        self._client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[AsyncJenkinsClient] = None
+
+    def _started(self) -> Tuple[asyncio.AbstractEventLoop, AsyncJenkinsClient]:
+        with self._lock:
+            if self._loop is None:
+                self._client = AsyncJenkinsClient.from_connection(
+                    self._connection, **self._client_kwargs
+                )
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="jenkins-fanout", daemon=True
+                ).start()
+            return self._loop, self._client
+
+    def run(self, make_coroutine: Callable[[AsyncJenkinsClient], Awaitable[T]]) -> T:
+        """Runs ``make_coroutine(client)`` on the fan-out loop and waits for it"""
+        loop, client = self._started()
+        return asyncio.run_coroutine_threadsafe(make_coroutine(client), loop).result()
+
+    def gather_build_info(
+        self,
+        builds: Iterable[Tuple[str, int]],
+        depth: int = 1,
+        concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Blocking ``AsyncJenkinsClient.gather_build_info``"""
+        builds = list(builds)
+        return self.run(
+            lambda client: client.gather_build_info(builds, depth, concurrency)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop = self._client = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
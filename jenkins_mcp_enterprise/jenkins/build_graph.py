@@ -0,0 +1,197 @@
+"""Reverse index of the build graph ("which build triggered this one?")
+
+Discovery only walks downwards, so finding the root pipeline of a failing
+leaf used to require knowing that root already. Every parent-to-child edge
+discovery observes is recorded here, together with edges learned from a
+build's ``hudson.model.Cause$UpstreamCause``, in a SQLite table indexed by
+child and by parent, so the parent and child lookups behind upstream chains
+and sibling queries are answered locally.
+
+The index lives in memory unless a database file is configured, in which
+case it is shared by all instances (rows carry the instance key) and
+survives restarts.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..logging_config import get_component_logger
+from ..utils import instance_key
+from .job_name_utils import JobNameParser
+
+logger = get_component_logger("jenkins.build_graph")
+
+UPSTREAM_CAUSE = "hudson.model.Cause$UpstreamCause"
+
+# Where an edge was learned from
+DISCOVERY = "discovery"
+UPSTREAM = "upstream_cause"
+
+BuildKey = Tuple[str, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS build_edges (
+    instance TEXT NOT NULL,
+    child_job TEXT NOT NULL,
+    child_build INTEGER NOT NULL,
+    parent_job TEXT NOT NULL,
+    parent_build INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    PRIMARY KEY (instance, child_job, child_build, parent_job, parent_build)
+);
+CREATE INDEX IF NOT EXISTS build_edges_by_parent
+    ON build_edges (instance, parent_job, parent_build);
+CREATE TABLE IF NOT EXISTS expanded_builds (
+    instance TEXT NOT NULL,
+    job TEXT NOT NULL,
+    build INTEGER NOT NULL,
+    PRIMARY KEY (instance, job, build)
+);
+"""
+
+
+def upstream_causes(build_info: Dict[str, Any]) -> List[BuildKey]:
+    """Builds named by the ``UpstreamCause`` entries of build JSON"""
+    upstream: List[BuildKey] = []
+    for action in build_info.get("actions") or []:
+        for cause in (action or {}).get("causes") or []:
+            if (cause or {}).get("_class") != UPSTREAM_CAUSE:
+                continue
+            project = cause.get("upstreamProject")
+            number = cause.get("upstreamBuild")
+            if project and number:
+                key = (JobNameParser.normalize_job_name(project), int(number))
+                if key not in upstream:
+                    upstream.append(key)
+    return upstream
+
+
+@dataclass
+class BuildGraphStats:
+    """Size of the index for one instance"""
+
+    edges: int = 0
+    expanded_builds: int = 0
+
+
+class BuildGraphIndex:
+    """Parent/child edges between builds of one Jenkins instance"""
+
+    def __init__(self, jenkins_url: str, db_path: Optional[Path] = None):
+        self.instance = instance_key(jenkins_url)
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = threading.Lock()
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(self.db_path) if self.db_path else ":memory:",
+            timeout=10.0,
+            check_same_thread=False,
+        )
+        with self._lock, self._db:
+            if self.db_path is not None:
+                self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    # Recording
+
+    def record_edges(
+        self, edges: Iterable[Tuple[str, int, str, int]], source: str = DISCOVERY
+    ) -> None:
+        """Adds ``(parent_job, parent_build, child_job, child_build)`` edges"""
+        now = time.time()
+        rows = [
+            (
+                self.instance,
+                child_job,
+                int(child_build),
+                parent_job,
+                int(parent_build),
+                source,
+                now,
+            )
+            for parent_job, parent_build, child_job, child_build in edges
+        ]
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO build_edges VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT "
+                "(instance, child_job, child_build, parent_job, parent_build) "
+                "DO UPDATE SET observed_at = excluded.observed_at",
+                rows,
+            )
+
+    def record_children(
+        self, parent_job: str, parent_build: int, children: Iterable[BuildKey]
+    ) -> None:
+        """
+        Records the complete child set of a finished build. Children of a
+        running build go through ``record_edges``, since more may follow.
+        """
+        self.record_edges(
+            (parent_job, parent_build, child_job, child_build)
+            for child_job, child_build in children
+        )
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO expanded_builds VALUES (?, ?, ?)",
+                (self.instance, parent_job, int(parent_build)),
+            )
+
+    # Queries
+
+    def parents(self, job_name: str, build_number: int) -> List[BuildKey]:
+        """Builds that triggered this one, most recently observed first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT parent_job, parent_build FROM build_edges "
+                "WHERE instance = ? AND child_job = ? AND child_build = ? "
+                "ORDER BY observed_at DESC",
+                (self.instance, job_name, int(build_number)),
+            ).fetchall()
+        return [(job, build) for job, build in rows]
+
+    def children(self, job_name: str, build_number: int) -> List[BuildKey]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT child_job, child_build FROM build_edges "
+                "WHERE instance = ? AND parent_job = ? AND parent_build = ? "
+                "ORDER BY child_job, child_build",
+                (self.instance, job_name, int(build_number)),
+            ).fetchall()
+        return [(job, build) for job, build in rows]
+
+    def has_all_children(self, job_name: str, build_number: int) -> bool:
+        """Whether discovery recorded this finished build's complete child set"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM expanded_builds "
+                "WHERE instance = ? AND job = ? AND build = ?",
+                (self.instance, job_name, int(build_number)),
+            ).fetchone()
+        return row is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = BuildGraphStats(
+                edges=self._db.execute(
+                    "SELECT COUNT(*) FROM build_edges WHERE instance = ?",
+                    (self.instance,),
+                ).fetchone()[0],
+                expanded_builds=self._db.execute(
+                    "SELECT COUNT(*) FROM expanded_builds WHERE instance = ?",
+                    (self.instance,),
+                ).fetchone()[0],
+            )
+        return asdict(stats)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -113,7 +113,7 @@ class BuildManager:
     def get_build_info(self, job_name: str, build_number: int, depth: int = 1) -> Build:
         """Get information about a specific build"""
         try:
-            build_info = self.connection.client.get_build_info(
+            build_info = self.connection.get_build_info(
                 job_name, build_number, depth=depth
             )
 
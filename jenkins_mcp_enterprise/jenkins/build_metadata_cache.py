@@ -0,0 +1,219 @@
+"""Cache of Jenkins build metadata (``/api/json`` of a build)
+
+A finished build never changes, yet discovery and diagnosis ask Jenkins for
+the same build's JSON over and over. Completed builds (``result`` set and not
+building) are therefore cached for good, while running builds are only reused
+for a short TTL. Completed entries can optionally be persisted to disk so they
+survive restarts.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from ..logging_config import get_component_logger
+from ..single_flight import SingleFlight
+from ..utils import instance_key
+
+logger = get_component_logger("jenkins.metadata_cache")
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def is_completed(build_info: Dict[str, Any]) -> bool:
+    """Whether build JSON describes a finished (and therefore immutable) build"""
+    return build_info.get("result") is not None and not build_info.get("building")
+
+
+@dataclass
+class MetadataCacheStats:
+    """Counters describing metadata cache effectiveness"""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+
+@dataclass
+class _Entry:
+    info: Dict[str, Any]
+    depth: int
+    expires_at: Optional[float]  # None for completed builds
+
+
+class BuildMetadataCache:
+    """
+    Per-instance cache of build JSON keyed by job, build number and depth.
+
+    A cached response fetched with a greater ``depth`` also answers requests
+    for a smaller one. Returned dictionaries are shared and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        jenkins_url: str,
+        running_ttl: float = 5.0,
+        persist_dir: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.instance = instance_key(jenkins_url)
+        self.running_ttl = running_ttl
+        self.persist_dir = Path(persist_dir) / self.instance if persist_dir else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], _Entry]" = OrderedDict()
+        self._single_flight = SingleFlight()
+        self._stats = MetadataCacheStats()
+
+    def get(
+        self,
+        job_name: str,
+        build_number: int,
+        depth: int,
+        loader: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Returns build JSON from the cache, calling ``loader`` on a miss.
+
+        Concurrent misses for the same build share one request.
+        """
+        key = (job_name, int(build_number))
+        info = self._lookup(key, depth)
+        if info is not None:
+            return info
+
+        return self._single_flight.do(
+            (key, depth), lambda: self._load(key, depth, loader)
+        )
+
+    def _lookup(self, key: Tuple[str, int], depth: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.depth >= depth:
+                if entry.expires_at is None or entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry.info
+
+        stored = self._read_persisted(key, depth)
+        if stored is not None:
+            with self._lock:
+                self._stats.disk_hits += 1
+                self._store_locked(key, stored)
+            return stored.info
+        return None
+
+    def _load(
+        self,
+        key: Tuple[str, int],
+        depth: int,
+        loader: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        # A waiter of an earlier flight may already have filled the entry
+        info = self._lookup(key, depth)
+        if info is not None:
+            return info
+
+        info = loader()
+        with self._lock:
+            self._stats.misses += 1
+        self._store(key, depth, info)
+        return info
+
+    def peek(
+        self, job_name: str, build_number: int, depth: int
+    ) -> Optional[Dict[str, Any]]:
+        """Returns cached build JSON without loading it, for async callers"""
+        return self._lookup((job_name, int(build_number)), depth)
+
+    def put(
+        self, job_name: str, build_number: int, depth: int, info: Dict[str, Any]
+    ) -> None:
+        """Stores build JSON that was fetched outside ``get``"""
+        with self._lock:
+            self._stats.misses += 1
+        self._store((job_name, int(build_number)), depth, info)
+
+    def _store(self, key: Tuple[str, int], depth: int, info: Dict[str, Any]) -> None:
+        if is_completed(info):
+            entry = _Entry(info, depth, None)
+            self._write_persisted(key, entry)
+        elif self.running_ttl > 0:
+            entry = _Entry(info, depth, time.monotonic() + self.running_ttl)
+        else:
+            return
+
+        with self._lock:
+            self._store_locked(key, entry)
+
+    def _store_locked(self, key: Tuple[str, int], entry: _Entry) -> None:
+        current = self._entries.get(key)
+        # Keep a deeper completed response over a shallower one
+        if (
+            current is not None
+            and current.expires_at is None
+            and current.depth > entry.depth
+        ):
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _persisted_path(self, key: Tuple[str, int]) -> Optional[Path]:
+        if self.persist_dir is None:
+            return None
+        job_name, build_number = key
+        return self.persist_dir / quote(job_name, safe="") / f"{build_number}.json"
+
+    def _read_persisted(self, key: Tuple[str, int], depth: int) -> Optional[_Entry]:
+        path = self._persisted_path(key)
+        if path is None:
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry = _Entry(data["info"], int(data["depth"]), None)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable build metadata {path}: {e}")
+            return None
+        return entry if entry.depth >= depth else None
+
+    def _write_persisted(self, key: Tuple[str, int], entry: _Entry) -> None:
+        path = self._persisted_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"depth": entry.depth, "info": entry.info}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist build metadata {path}: {e}")
+
+    def invalidate(self, job_name: str, build_number: int) -> None:
+        """Forgets a build, e.g. after it was deleted or rebuilt in place"""
+        key = (job_name, int(build_number))
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._persisted_path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit and miss counters"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return asdict(self._stats)
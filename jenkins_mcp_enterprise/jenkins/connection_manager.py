@@ -1,16 +1,30 @@
 """Core Jenkins connection and authentication management"""
 
+import threading
+import time
 from typing import Any, Dict, Optional
 
 import jenkins
 import requests
 
 from ..config import JenkinsConfig
-from ..exceptions import JenkinsAuthenticationError, JenkinsConnectionError
+from ..exceptions import (
+    BuildNotFoundError,
+    JenkinsAuthenticationError,
+    JenkinsConnectionError,
+)
 from ..logging_config import get_component_logger
+from .build_graph import BuildGraphIndex
+from .build_metadata_cache import BuildMetadataCache
+from .governor import RequestGovernor, background_priority
+from .hierarchy_cache import HierarchyCache
+from .http_pool import PooledHTTPAdapter
+from .negative_cache import MISSING_BUILD, NegativeCache, is_not_found
 
 logger = get_component_logger("jenkins.connection")
 
+AUTH_RETRY_SECONDS = 30.0  # How long a failed credential check is reused
+
 
 class JenkinsConnectionManager:
     """Manages Jenkins connection and authentication"""
@@ -19,23 +33,55 @@ class JenkinsConnectionManager:
         self.config = config
         self._client: Optional[jenkins.Jenkins] = None
         self._session: Optional[requests.Session] = None
+        self.build_metadata = BuildMetadataCache(
+            config.url,
+            running_ttl=config.metadata_ttl,
+            persist_dir=config.metadata_cache_dir,
+        )
+        self.hierarchy_cache = HierarchyCache(
+            config.url, persist_dir=config.hierarchy_cache_dir
+        )
+        # Parent/child edges between builds, for upstream lookups
+        self.build_graph = BuildGraphIndex(config.url, db_path=config.build_graph_db)
+        self.negative_cache = NegativeCache(
+            missing_build_ttl=config.missing_build_ttl,
+            unsupported_ttl=config.unsupported_endpoint_ttl,
+        )
+        # Admits every request to this controller, sync or async
+        self.governor = RequestGovernor(
+            rate=config.rate_limit,
+            burst=config.rate_burst,
+            max_concurrency=config.max_concurrency,
+            min_concurrency=config.min_concurrency,
+            latency_target=config.latency_target,
+        )
+        # One pool serves both python-jenkins and the raw session
+        self.http_adapter = PooledHTTPAdapter(
+            pool_hosts=config.pool_hosts,
+            pool_max_per_host=config.pool_max_per_host,
+            pool_block=config.pool_block,
+            governor=self.governor,
+        )
+        self._auth_lock = threading.Lock()
+        self._whoami: Optional[Dict[str, Any]] = None
+        self._auth_error: Optional[Exception] = None
+        self._auth_failed_at = 0.0
         self._initialize_connection()
 
     def _initialize_connection(self) -> None:
-        """Initialize Jenkins client and HTTP session"""
-        try:
-            self._client = jenkins.Jenkins(
-                self.config.url,
-                username=self.config.username,
-                password=self.config.token,
-            )
-
-            # Test connection
-            whoami = self._client.get_whoami()
-            logger.info(f"Connected to Jenkins as: {whoami}")
-
-        except Exception as e:
-            raise JenkinsConnectionError(f"Failed to connect to Jenkins: {e}") from e
+        """
+        Initialize Jenkins client and HTTP session.
+
+        No request is made here: credentials are validated by
+        ``ensure_authenticated`` on demand or from a background warm-up, so
+        creating a client never waits on a slow controller.
+        """
+        self._client = jenkins.Jenkins(
+            self.config.url,
+            username=self.config.username,
+            password=self.config.token,
+            timeout=self.config.timeout,
+        )
 
         # Setup HTTP session for Blue Ocean API
         self._session = requests.Session()
@@ -43,6 +89,77 @@ class JenkinsConnectionManager:
             self._session.auth = (self.config.username, self.config.token)
         self._session.verify = self.config.verify_ssl
 
+        for session in (self._session, self._client._session):
+            session.mount("http://", self.http_adapter)
+            session.mount("https://", self.http_adapter)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Utilisation of the connection pool shared by all calls to this instance"""
+        return self.http_adapter.stats()
+
+    def governor_stats(self) -> Dict[str, Any]:
+        """Admission control state for this controller"""
+        return self.governor.stats()
+
+    def ensure_authenticated(self) -> Dict[str, Any]:
+        """
+        Validates the credentials once and returns the ``whoami`` result.
+
+        Success is cached for the lifetime of the connection. A failure is
+        reported again without contacting Jenkins for ``AUTH_RETRY_SECONDS``
+        so a down controller is not asked again by every caller.
+        """
+        if self._whoami is not None:
+            return self._whoami
+        with self._auth_lock:
+            if self._whoami is not None:
+                return self._whoami
+            if (
+                self._auth_error is not None
+                and time.monotonic() - self._auth_failed_at < AUTH_RETRY_SECONDS
+            ):
+                raise JenkinsConnectionError(str(self._auth_error))
+            return self._check_credentials()
+
+    def _check_credentials(self) -> Dict[str, Any]:
+        """Asks Jenkins for ``whoami`` and records the outcome"""
+        try:
+            whoami = self.client.get_whoami()
+        except Exception as e:
+            self._auth_error = JenkinsConnectionError(
+                f"Failed to connect to Jenkins: {e}"
+            )
+            self._auth_failed_at = time.monotonic()
+            raise JenkinsConnectionError(str(self._auth_error)) from e
+        if self._whoami is None:
+            logger.info(f"Connected to Jenkins as: {whoami}")
+        self._whoami = whoami
+        self._auth_error = None
+        return whoami
+
+    @property
+    def authenticated(self) -> Optional[bool]:
+        """True or False once credentials were checked, None before"""
+        if self._whoami is not None:
+            return True
+        return False if self._auth_error is not None else None
+
+    def warm_up(self) -> threading.Thread:
+        """Validates the credentials in a background thread"""
+
+        def run() -> None:
+            try:
+                with background_priority():
+                    self.ensure_authenticated()
+            except Exception as e:
+                logger.warning(f"Warm-up of {self.config.url} failed: {e}")
+
+        thread = threading.Thread(
+            target=run, name=f"jenkins-warm-up-{self.config.url}", daemon=True
+        )
+        thread.start()
+        return thread
+
     @property
     def client(self) -> jenkins.Jenkins:
         """Get the Jenkins client"""
@@ -57,10 +174,31 @@ class JenkinsConnectionManager:
             raise JenkinsConnectionError("HTTP session not initialized")
         return self._session
 
+    def get_build_info(
+        self, job_name: str, build_number: int, depth: int = 1
+    ) -> Dict[str, Any]:
+        """Get build JSON, served from the metadata cache when possible"""
+        if self.negative_cache.is_known(MISSING_BUILD, job_name, build_number):
+            raise BuildNotFoundError(
+                f"Build {job_name}#{build_number} does not exist (cached)"
+            )
+        try:
+            return self.build_metadata.get(
+                job_name,
+                build_number,
+                depth,
+                lambda: self.client.get_build_info(job_name, build_number, depth=depth),
+            )
+        except Exception as e:
+            if is_not_found(e):
+                self.negative_cache.record(MISSING_BUILD, job_name, build_number)
+            raise
+
     def test_connection(self) -> bool:
-        """Test if the Jenkins connection is working"""
+        """Test if the Jenkins connection is working, asking Jenkins every time"""
         try:
-            self.client.get_whoami()
+            with self._auth_lock:
+                self._check_credentials()
             return True
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
@@ -76,7 +214,7 @@ class JenkinsConnectionManager:
     def authenticate(self) -> bool:
         """Test authentication explicitly"""
         try:
-            whoami = self.client.get_whoami()
+            whoami = self.ensure_authenticated()
             if whoami:
                 logger.info(
                     f"Authentication successful for user: {whoami.get('fullName', 'unknown')}"
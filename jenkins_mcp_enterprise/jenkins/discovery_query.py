@@ -0,0 +1,175 @@
+"""Projected build query used for sub-build discovery
+
+Discovery used to make four requests per build (build info, wfapi/runs,
+wfapi/describe, a flow graph tree query) plus one more per child just to read
+its status. A single ``api/json?tree=...`` projection returns everything the
+traversal needs: the build's own status and url, and every child reference
+the supported plugins expose, with status where Jenkins includes it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from .build_metadata_cache import is_completed
+from .job_name_utils import JobNameParser
+
+# Child references by plugin:
+# - subBuilds: MultiJob phases, with status and a url relative to Jenkins
+# - actions[].triggeredBuilds: Parameterized Trigger / BuildInfoExporterAction
+# - actions[].nodes[].actions[].description: Pipeline flow graph ("job » a #5")
+DISCOVERY_TREE = (
+    "_class,number,result,building,url,"
+    "subBuilds[jobName,buildNumber,result,url],"
+    "actions[triggeredBuilds[number,result,building,url],"
+    "nodes[actions[description]]]"
+)
+
+_FLOW_NODE_DESCRIPTION = re.compile(r"^(.*) #(\d+)")
+
+# Results whose subtrees failure-directed discovery descends into
+FAILED_STATUSES = frozenset({"FAILURE", "UNSTABLE", "ABORTED"})
+# Results of finished builds, as opposed to RUNNING and UNKNOWN
+FINAL_STATUSES = FAILED_STATUSES | {"SUCCESS", "NOT_BUILT"}
+
+
+def build_status(info: Dict[str, Any]) -> str:
+    """Maps build JSON to the status reported for sub-builds"""
+    status = info.get("result")
+    if status:
+        return status
+    return "RUNNING" if info.get("building") else "UNKNOWN"
+
+
+def expansion_statuses(
+    failures_only: bool, expand_running: bool = False
+) -> Optional[FrozenSet[str]]:
+    """
+    Statuses whose subtrees are expanded, None to expand every subtree.
+
+    UNKNOWN children are always expanded, since nothing rules out a failure
+    below them.
+    """
+    if not failures_only:
+        return None
+    expand = FAILED_STATUSES | {"UNKNOWN"}
+    return expand | {"RUNNING"} if expand_running else expand
+
+
+def should_expand(status: Optional[str], expand: Optional[FrozenSet[str]]) -> bool:
+    """
+    Whether discovery queries a child for its own children.
+
+    A child whose status the parent's response did not include is queried,
+    since that query is what reveals its status.
+    """
+    return expand is None or status is None or status in expand
+
+
+@dataclass
+class ChildRef:
+    """A reference to a child build, with status if the parent's JSON had it"""
+
+    job_name: str
+    build_number: int
+    status: Optional[str] = None
+    url: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return self.job_name, self.build_number
+
+
+@dataclass
+class DiscoveryNode:
+    """One build as seen by the projected discovery query"""
+
+    job_name: str
+    build_number: int
+    status: str
+    url: Optional[str]
+    children: List[ChildRef] = field(default_factory=list)
+    has_flow_graph: bool = False
+    is_pipeline: bool = False
+    completed: bool = False  # Finished builds can no longer gain children
+
+    @property
+    def needs_wfapi(self) -> bool:
+        """Pipeline runs whose flow graph was not exposed need wfapi instead"""
+        return self.is_pipeline and not self.has_flow_graph
+
+    def add_children(self, children: List[ChildRef]) -> None:
+        """Adds children not referenced yet, keeping the first (richest) reference"""
+        seen: Set[Tuple[str, int]] = {child.key for child in self.children}
+        for child in children:
+            if child.key not in seen:
+                seen.add(child.key)
+                self.children.append(child)
+
+
+def parse_discovery_node(
+    job_name: str, build_number: int, data: Dict[str, Any], base_url: str
+) -> DiscoveryNode:
+    """Builds a ``DiscoveryNode`` from a ``DISCOVERY_TREE`` response"""
+    node = DiscoveryNode(
+        job_name=job_name,
+        build_number=build_number,
+        status=build_status(data),
+        url=data.get("url"),
+        is_pipeline="WorkflowRun" in (data.get("_class") or ""),
+        completed=is_completed(data),
+    )
+    children: List[ChildRef] = []
+
+    for sub_build in data.get("subBuilds") or []:
+        child_job = sub_build.get("jobName")
+        child_number = sub_build.get("buildNumber")
+        if child_job and child_number:
+            url = sub_build.get("url")
+            children.append(
+                ChildRef(
+                    JobNameParser.normalize_job_name(child_job),
+                    int(child_number),
+                    status=sub_build.get("result"),
+                    url=urljoin(base_url.rstrip("/") + "/", url) if url else None,
+                )
+            )
+
+    for action in data.get("actions") or []:
+        if not action:
+            continue
+        for triggered in action.get("triggeredBuilds") or []:
+            if not triggered:
+                continue
+            child_job, child_number = JobNameParser.extract_from_url(
+                triggered.get("url", "")
+            )
+            if child_job and child_number:
+                children.append(
+                    ChildRef(
+                        child_job,
+                        child_number,
+                        status=build_status(triggered),
+                        url=triggered.get("url"),
+                    )
+                )
+        if "nodes" in action:
+            node.has_flow_graph = True
+            for flow_node in action.get("nodes") or []:
+                for node_action in (flow_node or {}).get("actions") or []:
+                    description = (node_action or {}).get("description")
+                    match = description and _FLOW_NODE_DESCRIPTION.match(
+                        description.strip()
+                    )
+                    if match:
+                        child_job = match.group(1).strip().replace(" » ", "/")
+                        children.append(
+                            ChildRef(
+                                JobNameParser.normalize_job_name(child_job),
+                                int(match.group(2)),
+                            )
+                        )
+
+    node.add_children(children)
+    return node
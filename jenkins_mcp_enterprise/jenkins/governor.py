@@ -0,0 +1,279 @@
+"""Per-controller admission control for outbound Jenkins requests
+
+Several MCP sessions diagnosing builds at once can start dozens of
+discovery and log workers against the same controller. Every request to an
+instance is admitted by its ``RequestGovernor`` first, which enforces:
+
+- a token-bucket rate limit (optional), and
+- an AIMD concurrency limit: the number of requests in flight grows by
+  about one per round of fast, successful responses and is halved when the
+  controller answers 429/503, fails, or gets slower than the latency target.
+
+Waiting requests are admitted in priority order, so interactive tool calls
+overtake background work such as live-log polling and connection warm-up.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..logging_config import get_component_logger
+
+logger = get_component_logger("jenkins.governor")
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+OVERLOAD_STATUSES = frozenset({429, 503})
+
+_priority: ContextVar[int] = ContextVar("jenkins_request_priority", default=INTERACTIVE)
+
+
+def current_priority() -> int:
+    """Priority of requests issued from the current thread or task"""
+    return _priority.get()
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Marks requests issued inside the block as background work"""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def retry_after_seconds(value: Optional[str]) -> float:
+    """Parses a numeric Retry-After header, ignoring HTTP dates"""
+    try:
+        return max(0.0, float(value)) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+@dataclass
+class GovernorStats:
+    """Admission counters of one controller's governor"""
+
+    concurrency_limit: float
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    overloads: int = 0
+    slow_responses: int = 0
+    decreases: int = 0
+
+
+class RequestGovernor:
+    """Token bucket plus AIMD concurrency limit for one Jenkins instance"""
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 20,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        latency_target: float = 2.0,
+    ):
+        """
+        Args:
+            rate: Sustained requests per second, 0 for no rate limit
+            burst: Requests that may be sent at once after an idle period
+            max_concurrency: Upper bound of the adaptive concurrency limit
+            min_concurrency: Lower bound of the adaptive concurrency limit
+            latency_target: Seconds to first byte above which the controller
+                is treated as overloaded, 0 to ignore latency
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_target = latency_target
+
+        self._cond = threading.Condition()
+        self._limit = float(max(self.min_concurrency, self.max_concurrency // 2))
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._stats = GovernorStats(concurrency_limit=self._limit)
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    # Admission
+
+    def acquire(
+        self, priority: Optional[int] = None, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Blocks until a request may be sent.
+
+        Returns False if ``timeout`` expired first. Every successful acquire
+        must be paired with ``release``.
+        """
+        entry = self._enqueue(priority)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            try:
+                while True:
+                    wait = self._try_admit_locked(entry)
+                    if wait == 0:
+                        return True
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._dequeue_locked(entry)
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._dequeue_locked(entry)
+                raise
+
+    async def acquire_async(self, priority: Optional[int] = None) -> None:
+        """Coroutine version of ``acquire`` that never blocks the event loop"""
+        entry = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit_locked(entry)
+                if wait == 0:
+                    return
+                await asyncio.sleep(min(wait or 0.05, 0.05))
+        except BaseException:
+            with self._cond:
+                self._dequeue_locked(entry)
+            raise
+
+    @contextmanager
+    def slot(self, priority: Optional[int] = None) -> Iterator["_Outcome"]:
+        """Admits one request; report its outcome on the yielded object"""
+        self.acquire(priority)
+        outcome = _Outcome(time.monotonic())
+        try:
+            yield outcome
+        except BaseException:
+            outcome.failed = True
+            raise
+        finally:
+            self.release(
+                time.monotonic() - outcome.started,
+                status_code=outcome.status_code,
+                failed=outcome.failed,
+                retry_after=outcome.retry_after,
+            )
+
+    def _enqueue(self, priority: Optional[int]) -> Tuple[int, int]:
+        entry = (
+            current_priority() if priority is None else priority,
+            next(self._sequence),
+        )
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            self._stats.queued = len(self._waiters)
+        return entry
+
+    def _dequeue_locked(self, entry: Tuple[int, int]) -> None:
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._stats.queued = len(self._waiters)
+            self._cond.notify_all()
+
+    def _try_admit_locked(self, entry: Tuple[int, int]) -> Optional[float]:
+        """
+        Admits ``entry`` if it is first in line and capacity allows.
+
+        Returns 0 when admitted, otherwise seconds until a token is available
+        or None to wait for a release.
+        """
+        if self._waiters[0] != entry or self._in_flight >= int(self._limit):
+            return None
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.rate > 0:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        heapq.heappop(self._waiters)
+        self._in_flight += 1
+        self._stats.admitted += 1
+        self._stats.queued = len(self._waiters)
+        # The next waiter may be admissible too
+        self._cond.notify_all()
+        return 0
+
+    # Feedback
+
+    def release(
+        self,
+        latency: float,
+        status_code: Optional[int] = None,
+        failed: bool = False,
+        retry_after: float = 0.0,
+    ) -> None:
+        """Returns a slot and adapts the concurrency limit to the outcome"""
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            overloaded = failed or status_code in OVERLOAD_STATUSES
+            slow = (
+                not overloaded
+                and self.latency_target > 0
+                and latency > self.latency_target
+            )
+            if overloaded:
+                self._stats.overloads += 1
+                if retry_after > 0:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            if slow:
+                self._stats.slow_responses += 1
+
+            if overloaded or slow:
+                # Halve at most once per latency window so one burst of
+                # errors from requests already in flight counts once
+                window = self.latency_target or 1.0
+                if now - self._last_decrease >= window:
+                    self._limit = max(self.min_concurrency, self._limit / 2)
+                    self._last_decrease = now
+                    self._stats.decreases += 1
+                    logger.info(
+                        f"Jenkins overloaded (status={status_code}, "
+                        f"latency={latency:.2f}s); concurrency limit now {int(self._limit)}"
+                    )
+            else:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            self._stats.concurrency_limit = self._limit
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._stats.in_flight = self._in_flight
+            return asdict(self._stats)
+
+
+@dataclass
+class _Outcome:
+    """What happened to a request admitted through ``RequestGovernor.slot``"""
+
+    started: float
+    status_code: Optional[int] = None
+    failed: bool = False
+    retry_after: float = 0.0
@@ -0,0 +1,205 @@
+"""Cache of discovered pipeline hierarchies
+
+Every diagnosis and sub-build listing used to rediscover a root build's whole
+tree, although a finished build can never gain children. For each root build
+this cache keeps:
+
+- the discovery node (status and child references) of every build that had
+  finished when it was queried, which later traversals reuse instead of
+  querying Jenkins again, and
+- the complete result of each traversal variant (depth and expansion mode)
+  whose builds had all finished, which is returned without any traversal.
+
+A refresh of a running root therefore only queries builds that were still
+running, and the new children they have started since. Entries can
+optionally be persisted to disk so they survive restarts.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from ..base import SubBuild
+from ..logging_config import get_component_logger
+from ..utils import instance_key
+from .discovery_query import ChildRef, DiscoveryNode
+
+logger = get_component_logger("jenkins.hierarchy_cache")
+
+DEFAULT_MAX_ROOTS = 256
+
+BuildKey = Tuple[str, int]
+
+
+@dataclass
+class HierarchyCacheStats:
+    """Counters describing hierarchy cache effectiveness"""
+
+    hits: int = 0  # Complete trees answered without any request
+    refreshes: int = 0  # Traversals that reused finished nodes
+    misses: int = 0
+    nodes_reused: int = 0
+    roots: int = 0
+
+
+@dataclass
+class CachedHierarchy:
+    """What is known about one root build's tree"""
+
+    nodes: Dict[BuildKey, DiscoveryNode] = field(default_factory=dict)
+    results: Dict[str, List[SubBuild]] = field(default_factory=dict)
+
+
+class HierarchyCache:
+    """Per-instance cache of sub-build trees keyed by root job and build number"""
+
+    def __init__(
+        self,
+        jenkins_url: str,
+        persist_dir: Optional[Path] = None,
+        max_roots: int = DEFAULT_MAX_ROOTS,
+    ):
+        self.instance = instance_key(jenkins_url)
+        self.persist_dir = Path(persist_dir) / self.instance if persist_dir else None
+        self.max_roots = max_roots
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[BuildKey, CachedHierarchy]" = OrderedDict()
+        self._stats = HierarchyCacheStats()
+
+    def lookup(
+        self, root_job: str, root_build: int, variant: str
+    ) -> Tuple[Optional[List[SubBuild]], Dict[BuildKey, DiscoveryNode]]:
+        """
+        Returns the complete result for ``variant`` if one is cached, else None
+        together with the finished nodes a new traversal may reuse.
+        """
+        key = (root_job, int(root_build))
+        entry = self._entry(key)
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+                return None, {}
+            result = entry.results.get(variant)
+            if result is not None:
+                self._stats.hits += 1
+                return [replace(sub_build) for sub_build in result], {}
+            self._stats.refreshes += 1
+            return None, dict(entry.nodes)
+
+    def record_reuse(self, count: int) -> None:
+        with self._lock:
+            self._stats.nodes_reused += count
+
+    def store(
+        self,
+        root_job: str,
+        root_build: int,
+        variant: str,
+        nodes: Dict[BuildKey, DiscoveryNode],
+        result: Optional[List[SubBuild]],
+    ) -> None:
+        """
+        Adds the finished ``nodes`` of a traversal, and its ``result`` if every
+        build in it had finished.
+        """
+        key = (root_job, int(root_build))
+        finished = {k: node for k, node in nodes.items() if node.completed}
+        if not finished and result is None:
+            return
+        entry = self._entry(key) or CachedHierarchy()
+        with self._lock:
+            entry.nodes.update(finished)
+            if result is not None:
+                entry.results[variant] = [replace(sub_build) for sub_build in result]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_roots:
+                self._entries.popitem(last=False)
+            snapshot = self._serialize(entry)
+        self._write_persisted(key, snapshot)
+
+    def _entry(self, key: BuildKey) -> Optional[CachedHierarchy]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_persisted(key)
+        if entry is not None:
+            with self._lock:
+                entry = self._entries.setdefault(key, entry)
+        return entry
+
+    @staticmethod
+    def _serialize(entry: CachedHierarchy) -> Dict[str, Any]:
+        return {
+            "nodes": [asdict(node) for node in entry.nodes.values()],
+            "results": {
+                variant: [asdict(sub_build) for sub_build in sub_builds]
+                for variant, sub_builds in entry.results.items()
+            },
+        }
+
+    @staticmethod
+    def _deserialize(data: Dict[str, Any]) -> CachedHierarchy:
+        entry = CachedHierarchy()
+        for node_data in data["nodes"]:
+            children = [ChildRef(**child) for child in node_data.pop("children")]
+            node = DiscoveryNode(children=children, **node_data)
+            entry.nodes[(node.job_name, node.build_number)] = node
+        for variant, sub_builds in data["results"].items():
+            entry.results[variant] = [SubBuild(**sub_build) for sub_build in sub_builds]
+        return entry
+
+    def _persisted_path(self, key: BuildKey) -> Optional[Path]:
+        if self.persist_dir is None:
+            return None
+        job_name, build_number = key
+        return self.persist_dir / quote(job_name, safe="") / f"{build_number}.json"
+
+    def _read_persisted(self, key: BuildKey) -> Optional[CachedHierarchy]:
+        path = self._persisted_path(key)
+        if path is None:
+            return None
+        try:
+            return self._deserialize(json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable build hierarchy {path}: {e}")
+            return None
+
+    def _write_persisted(self, key: BuildKey, snapshot: Dict[str, Any]) -> None:
+        path = self._persisted_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist build hierarchy {path}: {e}")
+
+    def invalidate(self, root_job: str, root_build: int) -> None:
+        """Forgets a root build's tree, e.g. after it was rebuilt in place"""
+        key = (root_job, int(root_build))
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._persisted_path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit and refresh counters"""
+        with self._lock:
+            self._stats.roots = len(self._entries)
+            return asdict(self._stats)
@@ -0,0 +1,108 @@
+"""Shared HTTP connection pool for one Jenkins instance
+
+python-jenkins and the raw ``requests`` session used for wfapi, tree and log
+calls each used to get their own default adapter (10 connections per host),
+so the discovery and diagnostics worker pools churned connections and hit
+"connection pool is full" discards. One ``PooledHTTPAdapter`` is mounted on
+both sessions so they draw from a single, configurable pool whose usage can
+be inspected. Its ``RequestGovernor``, if any, admits every request sent
+through it.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from ..logging_config import get_component_logger
+from .governor import RequestGovernor, retry_after_seconds
+
+logger = get_component_logger("jenkins.http_pool")
+
+
+@dataclass
+class PoolStats:
+    """Utilisation of a shared connection pool"""
+
+    max_per_host: int
+    hosts: int = 0
+    connections_opened: int = 0
+    idle_connections: int = 0
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    saturated_requests: int = 0  # Sent while every pooled connection was busy
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests in flight against its pool size"""
+
+    def __init__(
+        self,
+        pool_hosts: int,
+        pool_max_per_host: int,
+        pool_block: bool = False,
+        governor: Optional[RequestGovernor] = None,
+    ):
+        super().__init__(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_max_per_host,
+            pool_block=pool_block,
+        )
+        self.pool_max_per_host = pool_max_per_host
+        self.governor = governor
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._saturated = 0
+
+    def send(self, request, *args, **kwargs):
+        if self.governor is None:
+            return self._send_counted(request, *args, **kwargs)
+        # Streamed bodies are read after send returns; the slot covers the
+        # time to first byte, which is what the controller's load shows in
+        with self.governor.slot() as outcome:
+            response = self._send_counted(request, *args, **kwargs)
+            outcome.status_code = response.status_code
+            outcome.retry_after = retry_after_seconds(
+                response.headers.get("Retry-After")
+            )
+            return response
+
+    def _send_counted(self, request, *args, **kwargs):
+        with self._stats_lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            if self._in_flight > self.pool_max_per_host:
+                self._saturated += 1
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage across all hosts served by this adapter"""
+        with self._stats_lock:
+            stats = PoolStats(
+                max_per_host=self.pool_max_per_host,
+                requests=self._requests,
+                in_flight=self._in_flight,
+                peak_in_flight=self._peak_in_flight,
+                saturated_requests=self._saturated,
+            )
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.hosts += 1
+            stats.connections_opened += pool.num_connections
+            if pool.pool is not None:
+                stats.idle_connections += sum(
+                    1 for conn in list(pool.pool.queue) if conn is not None
+                )
+        return asdict(stats)
@@ -1,12 +1,21 @@
 """Unified Jenkins client using decomposed services"""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 from ..base import Build, SubBuild
 from ..config import JenkinsConfig
+from .async_client import AsyncFanout
 from .build_manager import BuildManager
 from .connection_manager import JenkinsConnectionManager
-from .log_fetcher import LogFetcher
+from .live_log_hub import LiveLogHub, LiveLogSubscription
+from .log_fetcher import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    LogChunk,
+    LogFetcher,
+    LogSizeProbe,
+    LogWindow,
+    ProgressiveDownload,
+)
 from .subbuild_discoverer import SubBuildDiscoverer
 
 
@@ -18,7 +27,14 @@ class JenkinsClient:
         self.connection = JenkinsConnectionManager(config)
         self.build_manager = BuildManager(self.connection)
         self.log_fetcher = LogFetcher(self.connection)
-        self.subbuild_discoverer = SubBuildDiscoverer(self.connection)
+        self.live_logs = LiveLogHub(self.log_fetcher)
+        self.fanout = AsyncFanout(self.connection)
+        self.subbuild_discoverer = SubBuildDiscoverer(
+            self.connection,
+            hierarchy_cache=self.connection.hierarchy_cache,
+            build_graph=self.connection.build_graph,
+            fanout=self.fanout,
+        )
 
     # Build Management Methods
     def get_next_build_number(self, job_name: str) -> int:
@@ -42,9 +58,7 @@ class JenkinsClient:
         self, job_name: str, build_number: int, depth: int = 1
     ) -> Dict[str, Any]:
         """Get raw build information as dictionary (compatibility method)"""
-        return self.connection.client.get_build_info(
-            job_name, build_number, depth=depth
-        )
+        return self.connection.get_build_info(job_name, build_number, depth=depth)
 
     def wait_for_completion(
         self,
@@ -79,9 +93,48 @@ class JenkinsClient:
             job_name, build_number, start_line, end_line
         )
 
-    def get_log_size(self, job_name: str, build_number: int) -> int:
-        """Get the number of lines in the console log"""
-        return self.log_fetcher.get_log_size(job_name, build_number)
+    def download_progressive_log(
+        self,
+        job_name: str,
+        build_number: int,
+        sink: BinaryIO,
+        start: int = 0,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> ProgressiveDownload:
+        """Stream the log from a byte offset, returning the offset to resume from"""
+        return self.log_fetcher.download_progressive_log(
+            job_name, build_number, sink, start, chunk_size
+        )
+
+    def log_transfer_stats(self) -> Dict[str, Any]:
+        """Wire vs. decoded bytes over all console log fetches"""
+        return self.log_fetcher.transfer_stats()
+
+    def probe_log_size(self, job_name: str, build_number: int) -> LogSizeProbe:
+        """Get the console log's size in bytes without downloading it"""
+        return self.log_fetcher.probe_log_size(job_name, build_number)
+
+    def fetch_log_tail(
+        self, job_name: str, build_number: int, max_bytes: int
+    ) -> LogWindow:
+        """Fetch only the last max_bytes of the console log"""
+        return self.log_fetcher.fetch_log_tail(job_name, build_number, max_bytes)
+
+    def extend_log_window(self, window: LogWindow, extra_bytes: int) -> LogWindow:
+        """Extend a tail window backwards by about extra_bytes"""
+        return self.log_fetcher.extend_log_window(window, extra_bytes)
+
+    def read_log_chunk(
+        self,
+        job_name: str,
+        build_number: int,
+        start_byte: int = 0,
+        max_bytes: int = 1024 * 1024,
+    ) -> LogChunk:
+        """Read a byte range of the log, returning the offset to continue from"""
+        return self.log_fetcher.read_log_chunk(
+            job_name, build_number, start_byte, max_bytes
+        )
 
     def get_log_chunk(
         self,
@@ -102,18 +155,37 @@ class JenkinsClient:
         poll_interval: float = 2.0,
         max_lines: Optional[int] = None,
     ):
-        """Generator that yields new log lines as they appear (for live builds)"""
-        return self.log_fetcher.stream_log_lines(
-            job_name, build_number, poll_interval, max_lines
+        """
+        Generator that yields new log lines as they appear (for live builds).
+
+        Followers of the same build share one poller; a follower joining a
+        build that is already being followed starts with the lines logged
+        before it joined, and a slow follower never misses lines.
+        """
+        return self.live_logs.stream(
+            job_name, build_number, max_lines=max_lines, poll_interval=poll_interval
         )
 
+    def follow_log(self, job_name: str, build_number: int) -> LiveLogSubscription:
+        """Subscribe to a running build's log through the shared live-log hub"""
+        return self.live_logs.subscribe(job_name, build_number)
+
     # Sub-Build Discovery Methods
     def discover_subbuilds(
-        self, parent_job_name: str, parent_build_number: int, max_depth: int = 5
+        self,
+        parent_job_name: str,
+        parent_build_number: int,
+        max_depth: int = 5,
+        failures_only: bool = False,
+        expand_running: bool = False,
     ) -> List[SubBuild]:
-        """Discover all sub-builds for a parent build"""
+        """Discover all sub-builds, or only failed branches, for a parent build"""
         return self.subbuild_discoverer.discover_subbuilds(
-            parent_job_name, parent_build_number, max_depth
+            parent_job_name,
+            parent_build_number,
+            max_depth,
+            failures_only=failures_only,
+            expand_running=expand_running,
         )
 
     def get_build_hierarchy(
@@ -132,6 +204,26 @@ class JenkinsClient:
             parent_job_name, parent_build_number, max_depth
         )
 
+    def hierarchy_cache_stats(self) -> Dict[str, Any]:
+        """Hit and refresh counters of the discovered-hierarchy cache"""
+        return self.connection.hierarchy_cache.stats()
+
+    def trace_upstream(
+        self, job_name: str, build_number: int, max_depth: int = 20
+    ) -> List[Tuple[str, int]]:
+        """Builds that led to this one, nearest first, ending at the root"""
+        return self.subbuild_discoverer.trace_upstream(
+            job_name, build_number, max_depth
+        )
+
+    def find_siblings(self, job_name: str, build_number: int) -> List[Tuple[str, int]]:
+        """Other builds started by the parents of this build"""
+        return self.subbuild_discoverer.find_siblings(job_name, build_number)
+
+    def build_graph_stats(self) -> Dict[str, Any]:
+        """Size of the reverse build-graph index"""
+        return self.connection.build_graph.stats()
+
     # Connection Management
     def test_connection(self) -> bool:
         """Test if the Jenkins connection is working"""
@@ -141,6 +233,18 @@ class JenkinsClient:
         """Test authentication explicitly"""
         return self.connection.authenticate()
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """HTTP connection pool utilisation for this instance"""
+        return self.connection.pool_stats()
+
+    def governor_stats(self) -> Dict[str, Any]:
+        """Adaptive concurrency and rate limit state for this instance"""
+        return self.connection.governor_stats()
+
+    def warm_up(self):
+        """Validate credentials in the background"""
+        return self.connection.warm_up()
+
     def get_server_info(self) -> Dict[str, Any]:
         """Get Jenkins server information"""
         return self.connection.get_server_info()
@@ -148,7 +252,7 @@ class JenkinsClient:
     # Compatibility Methods (for existing code)
     def get_whoami(self) -> Dict[str, Any]:
         """Get current user information (compatibility method)"""
-        return self.connection.client.get_whoami()
+        return self.connection.ensure_authenticated()
 
     def get_job_info(self, job_name: str) -> Dict[str, Any]:
         """Get job information (compatibility method)"""
@@ -156,19 +260,25 @@ class JenkinsClient:
 
     def get_build_console_output(self, job_name: str, build_number: int) -> str:
         """Get console output as single string (compatibility method)"""
-        lines = self.get_console_log(job_name, build_number)
-        return "\n".join(lines)
+        return self.log_fetcher.get_console_text(job_name, build_number)
 
     def get_console_text(self, job_name: str, build_number: int) -> str:
         """Get console text as single string (compatibility method)"""
         return self.get_build_console_output(job_name, build_number)
 
-    def list_sub_builds(self, parent: Build) -> List[SubBuild]:
+    def list_sub_builds(
+        self, parent: Build, failures_only: bool = False, expand_running: bool = False
+    ) -> List[SubBuild]:
         """
         List all sub-builds for a parent build (compatibility method).
         This is a wrapper around discover_subbuilds for backward compatibility.
         """
-        return self.discover_subbuilds(parent.job_name, parent.build_number)
+        return self.discover_subbuilds(
+            parent.job_name,
+            parent.build_number,
+            failures_only=failures_only,
+            expand_running=expand_running,
+        )
 
     def list_pipeline_runs(self, parent: Build) -> List[SubBuild]:
         """
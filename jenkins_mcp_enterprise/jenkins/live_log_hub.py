@@ -0,0 +1,348 @@
+"""Shared pollers for following running builds' console logs
+
+Every session following the same running build used to run its own polling
+loop against Jenkins. The hub runs a single poller per (instance, job, build)
+and fans the new lines out to all subscribers, so controller load does not
+grow with the number of followers.
+
+Published lines go into one buffer per poller that keeps the most recent
+lines; each subscriber reads from it at its own position, so a subscriber
+joining late starts with the lines it missed and a slow subscriber never
+holds up the poller. Only a subscriber that falls further behind than the
+buffer reaches reads the lines it is missing from Jenkins, so every follower
+sees the whole log, in order and without gaps.
+"""
+
+import io
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..exceptions import JenkinsConnectionError
+from ..logging_config import get_component_logger
+from ..utils import instance_key
+from .governor import background_priority
+from .log_fetcher import LogFetcher, LogTail
+
+logger = get_component_logger("jenkins.live_logs")
+
+DEFAULT_BUFFER_LINES = 10000
+DEFAULT_MAX_POLL_FAILURES = 5
+
+
+class _RangeComplete(Exception):
+    """Raised by ``_LineRange`` to stop a download once it has enough lines"""
+
+
+class _LineRange:
+    """Binary sink keeping lines ``first`` up to ``end`` of a log"""
+
+    def __init__(self, first: int, end: int):
+        self.first = first
+        self.end = end
+        self.lines = 0
+        self.buffer = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        position = 0
+        while self.lines < self.end:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                if self.lines >= self.first:
+                    self.buffer.write(data[position:])
+                return len(data)
+            if self.lines >= self.first:
+                self.buffer.write(data[position : newline + 1])
+            position = newline + 1
+            self.lines += 1
+        raise _RangeComplete()
+
+    def decoded(self) -> List[str]:
+        if self.lines < self.first:
+            return []
+        lines = self.buffer.getvalue().split(b"\n")[: self.end - self.first]
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+
+class LiveLogSubscription:
+    """
+    One follower of a live log.
+
+    Lines are read from the poller's shared buffer starting at ``position``,
+    the number of lines delivered so far. ``error`` is set when the stream
+    ended because the log could not be read, rather than because the build
+    finished.
+    """
+
+    def __init__(self, hub: "LiveLogHub", poller: "_LogPoller"):
+        self._hub = hub
+        self._poller = poller
+        self.key = poller.key
+        self.position = 0
+        self.error: Optional[str] = None
+        self.closed = False
+
+    def lines(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Yields lines until the build finishes or the subscription is closed.
+
+        Args:
+            timeout: Maximum seconds to wait for the next line, None to wait
+                for as long as the build keeps running
+        """
+        poller = self._poller
+        try:
+            while not self.closed:
+                missing = None
+                with poller.changed:
+                    if not poller.changed.wait_for(
+                        lambda: self.position < poller.published or poller.done,
+                        timeout,
+                    ):
+                        return
+                    if self.position < poller.base:
+                        # Fell behind the buffer: these lines are read again
+                        missing = poller.base
+                    elif self.position < poller.published:
+                        lines = poller.buffer[self.position - poller.base :]
+                    else:
+                        self.error = self.error or poller.error
+                        return
+                if missing is not None:
+                    lines = self._hub._read_lines(self, self.position, missing)
+                    if self.error:
+                        return
+                for line in lines:
+                    self.position += 1
+                    yield line
+        finally:
+            self.close()
+
+    __iter__ = lines
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._hub._unsubscribe(self)
+
+
+class _LogPoller(threading.Thread):
+    """Follows one build's log and publishes new lines to its subscribers"""
+
+    def __init__(
+        self,
+        hub: "LiveLogHub",
+        key: Tuple[str, str, int],
+        tail: LogTail,
+        interval: float,
+    ):
+        super().__init__(name=f"live-log-{key[1]}#{key[2]}", daemon=True)
+        self.hub = hub
+        self.key = key
+        self.tail = tail
+        self.interval = interval
+        self.subscribers: List[LiveLogSubscription] = []
+        self.polls = 0
+        # Most recent lines; buffer[0] is line number ``base`` of the log
+        self.buffer: List[str] = []
+        self.base = 0
+        self.published = 0  # Lines published so far
+        self.done = False
+        self.error: Optional[str] = None
+        self.changed = threading.Condition()
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _publish(self, lines: List[str]) -> None:
+        limit = self.hub.buffer_lines
+        with self.changed:
+            self.buffer.extend(lines)
+            self.published += len(lines)
+            # Trimming in batches keeps between one and two limits of lines
+            if len(self.buffer) > 2 * limit:
+                trimmed = len(self.buffer) - limit
+                del self.buffer[:trimmed]
+                self.base += trimmed
+            self.changed.notify_all()
+
+    def _finish(self, error: Optional[str]) -> None:
+        with self.changed:
+            self.error = error
+            self.done = True
+            self.changed.notify_all()
+
+    def run(self) -> None:
+        # Following a log yields to interactive requests to the same controller
+        with background_priority():
+            self._follow()
+
+    def _follow(self) -> None:
+        error = None
+        failures = 0
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    lines = self.tail.poll()
+                except Exception as e:
+                    failures += 1
+                    if failures > self.hub.max_poll_failures:
+                        error = (
+                            f"Live log of {self.key[1]}#{self.key[2]} unavailable: {e}"
+                        )
+                        logger.error(error)
+                        break
+                    delay = min(
+                        self.hub.max_interval, self.hub.min_interval * 2**failures
+                    )
+                    logger.warning(
+                        f"Live log poll failed for {self.key[1]}#{self.key[2]} "
+                        f"({failures}/{self.hub.max_poll_failures}), retrying in "
+                        f"{delay:.1f}s: {e}"
+                    )
+                    self._stop_event.wait(delay)
+                    continue
+                failures = 0
+                self.polls += 1
+                if lines:
+                    self._publish(lines)
+                if self.tail.finished:
+                    break
+                self._adapt_interval(len(lines))
+                self._stop_event.wait(self.interval)
+        finally:
+            self.hub._poller_done(self)
+            self._finish(error)
+
+    def _adapt_interval(self, new_lines: int) -> None:
+        """Poll faster while the log grows and back off while it is idle"""
+        if new_lines:
+            self.interval = max(self.hub.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.hub.max_interval, self.interval * 1.5)
+
+
+class LiveLogHub:
+    """Runs one shared poller per followed build of a Jenkins instance"""
+
+    def __init__(
+        self,
+        log_fetcher: LogFetcher,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        buffer_lines: int = DEFAULT_BUFFER_LINES,
+        max_poll_failures: int = DEFAULT_MAX_POLL_FAILURES,
+    ):
+        self.log_fetcher = log_fetcher
+        self.instance = instance_key(log_fetcher.connection.config.url)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.buffer_lines = buffer_lines
+        self.max_poll_failures = max_poll_failures
+        self._lock = threading.Lock()
+        self._pollers: Dict[Tuple[str, str, int], _LogPoller] = {}
+
+    def subscribe(
+        self, job_name: str, build_number: int, poll_interval: Optional[float] = None
+    ) -> LiveLogSubscription:
+        """
+        Starts following a build's log, joining its poller if one is running.
+
+        The first subscriber's poller reads the log from the beginning. Later
+        subscribers start at the first line as well, reading the lines
+        published before they joined from the shared buffer.
+        """
+        key = (self.instance, job_name, build_number)
+        with self._lock:
+            poller = self._pollers.get(key)
+            start = poller is None
+            if start:
+                interval = poll_interval or self.min_interval
+                interval = min(max(interval, self.min_interval), self.max_interval)
+                poller = _LogPoller(
+                    self,
+                    key,
+                    LogTail(self.log_fetcher, job_name, build_number),
+                    interval,
+                )
+                self._pollers[key] = poller
+            subscription = LiveLogSubscription(self, poller)
+            poller.subscribers.append(subscription)
+        if start:
+            logger.debug(f"Starting live log poller for {job_name}#{build_number}")
+            poller.start()
+        return subscription
+
+    def stream(
+        self,
+        job_name: str,
+        build_number: int,
+        max_lines: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Generator over a build's log lines through a shared poller.
+
+        Raises:
+            JenkinsConnectionError: After the last line, if the stream ended
+                because the log could not be read
+        """
+        subscription = self.subscribe(job_name, build_number, poll_interval)
+        lines_yielded = 0
+        try:
+            for line in subscription.lines():
+                yield line
+                lines_yielded += 1
+                if max_lines and lines_yielded >= max_lines:
+                    return
+        finally:
+            subscription.close()
+        if subscription.error:
+            raise JenkinsConnectionError(subscription.error)
+
+    def _read_lines(
+        self, subscription: LiveLogSubscription, first: int, end: int
+    ) -> List[str]:
+        """Lines ``first`` up to ``end`` of the log, read again from Jenkins"""
+        _, job_name, build_number = subscription.key
+        wanted = _LineRange(first, end)
+        try:
+            self.log_fetcher.download_progressive_log(job_name, build_number, wanted)
+        except _RangeComplete:
+            pass
+        except Exception as e:
+            subscription.error = (
+                f"Could not read lines {first}-{end} of "
+                f"{job_name}#{build_number} again: {e}"
+            )
+            logger.warning(subscription.error)
+            return []
+        lines = wanted.decoded()
+        if len(lines) != end - first:
+            subscription.error = (
+                f"Log of {job_name}#{build_number} no longer has lines "
+                f"{first}-{end}; it was restarted"
+            )
+            logger.warning(subscription.error)
+            return []
+        return lines
+
+    def _unsubscribe(self, subscription: LiveLogSubscription) -> None:
+        with self._lock:
+            poller = self._pollers.get(subscription.key)
+            if poller is None or subscription not in poller.subscribers:
+                return
+            poller.subscribers.remove(subscription)
+            if not poller.subscribers:
+                # Nobody is watching any more: stop polling Jenkins
+                del self._pollers[subscription.key]
+                poller.stop()
+
+    def _poller_done(self, poller: _LogPoller) -> None:
+        with self._lock:
+            if self._pollers.get(poller.key) is poller:
+                del self._pollers[poller.key]
+
+    def active_pollers(self) -> int:
+        with self._lock:
+            return len(self._pollers)
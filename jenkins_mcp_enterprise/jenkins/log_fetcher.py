@@ -1,22 +1,227 @@
 """Jenkins console log fetching and processing"""
 
+import io
+import threading
 import time
-from typing import List, Optional
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional
 
 import requests
 
 from ..exceptions import JenkinsConnectionError
 from ..logging_config import get_component_logger
 from .connection_manager import JenkinsConnectionManager
+from .job_name_utils import JobNameParser
+from .negative_cache import MISSING_BUILD, is_not_found
 
 logger = get_component_logger("jenkins.log")
 
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Console text compresses well; requests decodes these transparently while streaming
+LOG_TRANSFER_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+
+@dataclass
+class TransferStats:
+    """Bytes moved by one log fetch, on the wire and after decoding"""
+
+    wire_bytes: int
+    decoded_bytes: int
+    content_encoding: Optional[str] = None
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+
+@dataclass
+class TransferTotals:
+    """Transfer counters accumulated over all log fetches of one instance"""
+
+    fetches: int = 0
+    compressed_fetches: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+
+@dataclass
+class ProgressiveDownload:
+    """Outcome of streaming a progressiveText response into a sink"""
+
+    start: int
+    bytes_written: int
+    text_size: Optional[int]  # X-Text-Size: offset to resume from, None if absent
+    more_data: bool  # X-More-Data: the build is still writing to its log
+    transfer: Optional[TransferStats] = field(default=None, compare=False)
+
+    @property
+    def restarted(self) -> bool:
+        """
+        Whether Jenkins served the log from offset 0 instead of ``start``.
+
+        That happens when ``start`` is past the end of the log, which then
+        reports a smaller ``X-Text-Size`` than the offset that was asked for.
+        """
+        return self.text_size is not None and self.text_size < self.start
+
+    @property
+    def consistent(self) -> bool:
+        """
+        Whether the response continued at ``start`` and can be appended.
+
+        ``X-Text-Size`` is an offset into the raw log, while the plain
+        progressiveText body has ConsoleNotes stripped, so the number of bytes
+        received is not compared with the offset delta.
+        """
+        return self.text_size is not None and not self.restarted
+
+
+@dataclass
+class LogWindow:
+    """The end of a console log, fetched without downloading all of it"""
+
+    job_name: str
+    build_number: int
+    start: int  # Raw byte offset; ``data`` starts at the first line boundary from here
+    text_size: int  # Length of the log when the window was fetched
+    data: bytes
+
+    @property
+    def complete(self) -> bool:
+        """Whether the window reaches back to the beginning of the log"""
+        return self.start == 0
+
+    def lines(self) -> List[str]:
+        text = self.data.decode("utf-8", errors="replace")
+        lines = text.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
+    def open_text(self) -> io.TextIOWrapper:
+        return io.TextIOWrapper(
+            io.BytesIO(self.data), encoding="utf-8", errors="replace", newline="\n"
+        )
+
+
+@dataclass
+class LogSizeProbe:
+    """Size of a console log, learned without downloading it"""
+
+    text_size: Optional[int]  # Bytes, None if Jenkins did not report it
+    more_data: bool  # The build is still writing to its log
+    line_count: Optional[int] = None  # Only known for logs cached locally
+
+
+@dataclass
+class LogChunk:
+    """A byte range of a console log and where the next range starts"""
+
+    start: int
+    data: bytes
+    next_offset: int  # Pass as start_byte to continue after this chunk
+    text_size: Optional[int]  # Length of the log when the chunk was read
+    more_data: bool  # The build is still writing to its log
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="replace")
+
+    @property
+    def at_end(self) -> bool:
+        """Whether the chunk reaches the current end of the log"""
+        return self.text_size is not None and self.next_offset >= self.text_size
+
+
+def _read_into(response: requests.Response, view: memoryview) -> int:
+    """Copies a streamed response body into ``view`` until it is full"""
+    filled = 0
+    chunk_size = min(len(view), DEFAULT_DOWNLOAD_CHUNK_SIZE)
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        take = min(len(chunk), len(view) - filled)
+        view[filled : filled + take] = memoryview(chunk)[:take]
+        filled += take
+        if filled == len(view):
+            break
+    return filled
+
+
+def _utf8_boundary(data: bytearray, length: int) -> int:
+    """Length of the longest prefix of ``data[:length]`` not ending mid-character"""
+    for back in range(1, min(3, length) + 1):
+        byte = data[length - back]
+        if byte & 0xC0 == 0x80:
+            continue  # Continuation byte, keep looking for the lead byte
+        if byte >= 0xF0:
+            needed = 4
+        elif byte >= 0xE0:
+            needed = 3
+        elif byte >= 0xC0:
+            needed = 2
+        else:
+            needed = 1
+        return length if back >= needed else length - back
+    return length
+
 
 class LogFetcher:
     """Handles fetching console logs from Jenkins"""
 
     def __init__(self, connection_manager: JenkinsConnectionManager):
         self.connection = connection_manager
+        self._head_supported: Optional[bool] = None
+        self._transfer_lock = threading.Lock()
+        self._transfer_totals = TransferTotals()
+        self.last_transfer: Optional[TransferStats] = None
+
+    def _record_transfer(
+        self, response: requests.Response, decoded_bytes: int
+    ) -> TransferStats:
+        """Records how many bytes a fetch cost on the wire"""
+        wire_bytes = decoded_bytes
+        tell = getattr(getattr(response, "raw", None), "tell", None)
+        if tell is not None:
+            try:
+                # urllib3 counts the bytes read from the socket, before decoding
+                wire_bytes = int(tell())
+            except (TypeError, ValueError, OSError):
+                pass
+        encoding = response.headers.get("Content-Encoding")
+        stats = TransferStats(wire_bytes, decoded_bytes, encoding)
+        with self._transfer_lock:
+            totals = self._transfer_totals
+            totals.fetches += 1
+            totals.compressed_fetches += 1 if encoding else 0
+            totals.wire_bytes += wire_bytes
+            totals.decoded_bytes += decoded_bytes
+            self.last_transfer = stats
+        return stats
+
+    def transfer_stats(self) -> Dict[str, Any]:
+        """Wire vs. decoded bytes over all log fetches so far"""
+        with self._transfer_lock:
+            return asdict(self._transfer_totals)
+
+    def _build_url(self, job_name: str, build_number: int, suffix: str) -> str:
+        """Build a URL below a build, expanding folder jobs to /job/ segments"""
+        job_path = JobNameParser.to_jenkins_api_path(job_name)
+        return f"{self.connection.config.url.rstrip('/')}/{job_path}/{build_number}/{suffix}"
+
+    def _skip_missing_build(self, job_name: str, build_number: int) -> None:
+        """Fail fast for builds that recently returned 404"""
+        if self.connection.negative_cache.is_known(
+            MISSING_BUILD, job_name, build_number
+        ):
+            raise JenkinsConnectionError(
+                f"Build {job_name}#{build_number} does not exist (cached 404)"
+            )
+
+    def _record_if_missing(
+        self, error: Exception, job_name: str, build_number: int
+    ) -> None:
+        if is_not_found(error):
+            self.connection.negative_cache.record(MISSING_BUILD, job_name, build_number)
 
     def get_console_log(
         self,
@@ -42,21 +247,24 @@ class LogFetcher:
 
     def _get_full_log(self, job_name: str, build_number: int) -> List[str]:
         """Get the complete console log"""
+        return self.get_console_text(job_name, build_number).splitlines()
+
+    def get_console_text(self, job_name: str, build_number: int) -> str:
+        """Get the complete console log as a single string"""
         try:
-            log_text = self.connection.client.get_build_console_output(
+            return self.connection.client.get_build_console_output(
                 job_name, build_number
             )
-            return log_text.splitlines()
         except Exception as e:
             logger.error(f"Failed to get full log via python-jenkins: {e}")
             # Fallback to direct HTTP request
-            return self._get_log_via_http(job_name, build_number)
+            return "\n".join(self._get_log_via_http(job_name, build_number))
 
     def _get_progressive_log(
         self, job_name: str, build_number: int, start_line: int, end_line: Optional[int]
     ) -> List[str]:
         """Get log lines using progressive API"""
-        url = f"{self.connection.config.url}/job/{job_name}/{build_number}/logText/progressiveText"
+        url = self._build_url(job_name, build_number, "logText/progressiveText")
         params = {"start": start_line * 100}  # Approximate byte offset
 
         try:
@@ -80,11 +288,13 @@ class LogFetcher:
 
     def _get_log_via_http(self, job_name: str, build_number: int) -> List[str]:
         """Get log via direct HTTP request"""
-        url = f"{self.connection.config.url}/job/{job_name}/{build_number}/consoleText"
+        url = self._build_url(job_name, build_number, "consoleText")
 
         try:
             response = self.connection.session.get(
-                url, timeout=self.connection.config.timeout
+                url,
+                headers=LOG_TRANSFER_HEADERS,
+                timeout=self.connection.config.timeout,
             )
             response.raise_for_status()
             return response.text.splitlines()
@@ -92,14 +302,272 @@ class LogFetcher:
         except requests.RequestException as e:
             raise JenkinsConnectionError(f"HTTP log fetch failed: {e}") from e
 
-    def get_log_size(self, job_name: str, build_number: int) -> int:
-        """Get the number of lines in the console log"""
+    def download_progressive_log(
+        self,
+        job_name: str,
+        build_number: int,
+        sink: BinaryIO,
+        start: int = 0,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> ProgressiveDownload:
+        """
+        Stream the log from byte offset ``start`` via ``logText/progressiveText``.
+
+        The returned ``text_size`` is the offset to pass as ``start`` on the next
+        call, so a running build's log can be followed by downloading only the
+        bytes appended since the previous call.
+        """
+        self._skip_missing_build(job_name, build_number)
+        url = self._build_url(job_name, build_number, "logText/progressiveText")
+        written = 0
+
         try:
-            lines = self.get_console_log(job_name, build_number)
-            return len(lines)
-        except Exception as e:
-            logger.error(f"Failed to get log size: {e}")
-            return 0
+            with self.connection.session.get(
+                url,
+                params={"start": start},
+                headers=LOG_TRANSFER_HEADERS,
+                timeout=self.connection.config.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                text_size = response.headers.get("X-Text-Size")
+                more_data = response.headers.get("X-More-Data", "").lower() == "true"
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        sink.write(chunk)
+                        written += len(chunk)
+                transfer = self._record_transfer(response, written)
+        except requests.RequestException as e:
+            self._record_if_missing(e, job_name, build_number)
+            raise JenkinsConnectionError(
+                f"Progressive log download failed for {job_name}#{build_number}: {e}"
+            ) from e
+
+        return ProgressiveDownload(
+            start=start,
+            bytes_written=written,
+            text_size=int(text_size) if text_size is not None else None,
+            more_data=more_data,
+            transfer=transfer,
+        )
+
+    def probe_log_size(self, job_name: str, build_number: int) -> LogSizeProbe:
+        """
+        Reads the log size from the progressiveText headers without the body.
+
+        A HEAD request is tried first. Jenkins versions that do not answer HEAD
+        with the progressive headers get a streamed GET instead, closed as soon
+        as the headers have arrived; HEAD is not retried for this instance.
+        """
+        self._skip_missing_build(job_name, build_number)
+        url = self._build_url(job_name, build_number, "logText/progressiveText")
+        try:
+            headers = None
+            if self._head_supported is not False:
+                response = self.connection.session.head(
+                    url,
+                    params={"start": 0},
+                    timeout=self.connection.config.timeout,
+                    allow_redirects=True,
+                )
+                if response.status_code == 404:
+                    response.raise_for_status()
+                self._head_supported = (
+                    response.status_code < 400 and "X-Text-Size" in response.headers
+                )
+                if self._head_supported:
+                    headers = response.headers
+            if headers is None:
+                with self.connection.session.get(
+                    url,
+                    params={"start": 0},
+                    timeout=self.connection.config.timeout,
+                    stream=True,
+                ) as response:
+                    response.raise_for_status()
+                    headers = response.headers
+        except requests.RequestException as e:
+            self._record_if_missing(e, job_name, build_number)
+            raise JenkinsConnectionError(
+                f"Log size probe failed for {job_name}#{build_number}: {e}"
+            ) from e
+
+        text_size = headers.get("X-Text-Size")
+        return LogSizeProbe(
+            text_size=int(text_size) if text_size is not None else None,
+            more_data=headers.get("X-More-Data", "").lower() == "true",
+        )
+
+    def _read_log_range(
+        self, job_name: str, build_number: int, start: int, length: Optional[int]
+    ) -> bytes:
+        """
+        Reads the log from ``start``, closing the response early once ``length``
+        bytes have arrived; ``length=None`` reads to the end of the log.
+        """
+        if length is not None and length <= 0:
+            return b""
+        url = self._build_url(job_name, build_number, "logText/progressiveText")
+        try:
+            with self.connection.session.get(
+                url,
+                params={"start": start},
+                headers=LOG_TRANSFER_HEADERS,
+                timeout=self.connection.config.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                if length is None:
+                    buffer = bytearray()
+                    for chunk in response.iter_content(
+                        chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE
+                    ):
+                        buffer += chunk
+                    filled = len(buffer)
+                else:
+                    buffer = bytearray(length)
+                    filled = _read_into(response, memoryview(buffer))
+                self._record_transfer(response, filled)
+        except requests.RequestException as e:
+            self._record_if_missing(e, job_name, build_number)
+            raise JenkinsConnectionError(
+                f"Log range fetch failed for {job_name}#{build_number}: {e}"
+            ) from e
+        del buffer[filled:]
+        return bytes(buffer)
+
+    def fetch_log_tail(
+        self, job_name: str, build_number: int, max_bytes: int
+    ) -> LogWindow:
+        """
+        Fetches only the last ``max_bytes`` of a console log.
+
+        The log size is read from the progressiveText headers and the tail is
+        requested with ``start=size-max_bytes``. The window is trimmed to start
+        at a line boundary.
+        """
+        text_size = self.probe_log_size(job_name, build_number).text_size
+        if text_size is None:
+            raise JenkinsConnectionError(
+                f"Jenkins did not report the log size of {job_name}#{build_number}"
+            )
+        start = max(0, text_size - max_bytes)
+        return self._fetch_window(
+            job_name, build_number, text_size, start, text_size - start
+        )
+
+    def extend_log_window(self, window: LogWindow, extra_bytes: int) -> LogWindow:
+        """
+        Extends a tail window backwards by about ``extra_bytes``.
+
+        The progressiveText body has ConsoleNotes stripped while offsets count
+        the raw log, so the bytes read from the new start cannot be cut off
+        where the old window begins. The window is re-read from its new start
+        to the end of the log and replaces the old one.
+        """
+        if window.complete:
+            return window
+        return self._fetch_window(
+            window.job_name,
+            window.build_number,
+            window.text_size,
+            max(0, window.start - extra_bytes),
+            None,
+        )
+
+    def _fetch_window(
+        self,
+        job_name: str,
+        build_number: int,
+        text_size: int,
+        start: int,
+        length: Optional[int],
+    ) -> LogWindow:
+        if start == 0:
+            data = self._read_log_range(job_name, build_number, 0, length)
+        else:
+            # One extra byte in front tells whether start falls on a line boundary
+            data = self._read_log_range(
+                job_name,
+                build_number,
+                start - 1,
+                None if length is None else length + 1,
+            )
+            newline = data.find(b"\n")
+            if newline == -1:
+                start, data = text_size, b""
+            else:
+                # Body offsets only match raw ones if no ConsoleNotes were
+                # stripped, otherwise the requested offset is kept
+                if len(data) == text_size - (start - 1):
+                    start += newline
+                data = data[newline + 1 :]
+        return LogWindow(job_name, build_number, start, text_size, data)
+
+    def read_log_chunk(
+        self,
+        job_name: str,
+        build_number: int,
+        start_byte: int = 0,
+        max_bytes: int = 1024 * 1024,
+    ) -> LogChunk:
+        """
+        Read at most ``max_bytes`` of the log from ``start_byte``.
+
+        Bytes are copied straight into a preallocated buffer and only decoded
+        once, by ``LogChunk.text``. A chunk never ends inside a multibyte
+        character unless it is the end of a finished log, so ``next_offset``
+        can be passed back as ``start_byte`` to continue without corruption.
+
+        Offsets count the raw log while the body has its ConsoleNotes
+        stripped. A chunk that reaches the end of the body continues from
+        ``X-Text-Size``; one cut off earlier can only count the bytes it
+        holds, so on annotated logs the next chunk may repeat some text.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._skip_missing_build(job_name, build_number)
+        url = self._build_url(job_name, build_number, "logText/progressiveText")
+        buffer = bytearray(max_bytes)
+        try:
+            with self.connection.session.get(
+                url,
+                params={"start": start_byte},
+                headers=LOG_TRANSFER_HEADERS,
+                timeout=self.connection.config.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                text_size = response.headers.get("X-Text-Size")
+                more_data = response.headers.get("X-More-Data", "").lower() == "true"
+                filled = _read_into(response, memoryview(buffer))
+                self._record_transfer(response, filled)
+        except requests.RequestException as e:
+            self._record_if_missing(e, job_name, build_number)
+            raise JenkinsConnectionError(
+                f"Chunked log fetch failed for {job_name}#{build_number}: {e}"
+            ) from e
+
+        text_size = int(text_size) if text_size is not None else None
+        if text_size is not None and start_byte > text_size:
+            # Jenkins answers an offset past the end with the log from 0
+            start_byte = 0
+        length = filled
+        if filled == max_bytes or more_data:
+            length = _utf8_boundary(buffer, filled) or filled
+        if filled < max_bytes and text_size is not None:
+            # The whole body was read; held back bytes are raw text at its end
+            next_offset = text_size - (filled - length)
+        else:
+            next_offset = start_byte + length
+        del buffer[length:]
+        return LogChunk(
+            start=start_byte,
+            data=bytes(buffer),
+            next_offset=next_offset,
+            text_size=text_size,
+            more_data=more_data,
+        )
 
     def get_log_chunk(
         self,
@@ -109,33 +577,7 @@ class LogFetcher:
         max_bytes: int = 1024 * 1024,  # 1MB default
     ) -> str:
         """Get a chunk of log content by byte range for streaming large logs"""
-        url = f"{self.connection.config.url}/job/{job_name}/{build_number}/logText/progressiveText"
-        params = {"start": start_byte}
-
-        try:
-            response = self.connection.session.get(
-                url, params=params, timeout=self.connection.config.timeout, stream=True
-            )
-            response.raise_for_status()
-
-            # Read up to max_bytes
-            content = ""
-            bytes_read = 0
-            for chunk in response.iter_content(chunk_size=1024, decode_unicode=True):
-                if bytes_read + len(chunk.encode("utf-8")) > max_bytes:
-                    # Take only what fits in the limit
-                    remaining = max_bytes - bytes_read
-                    if remaining > 0:
-                        # This is approximate since we're dealing with unicode
-                        content += chunk[:remaining]
-                    break
-                content += chunk
-                bytes_read += len(chunk.encode("utf-8"))
-
-            return content
-
-        except requests.RequestException as e:
-            raise JenkinsConnectionError(f"Chunked log fetch failed: {e}") from e
+        return self.read_log_chunk(job_name, build_number, start_byte, max_bytes).text
 
     def stream_log_lines(
         self,
@@ -145,42 +587,76 @@ class LogFetcher:
         max_lines: Optional[int] = None,
     ):
         """Generator that yields new log lines as they appear (for live builds)"""
-        current_line = 0
+        tail = LogTail(self, job_name, build_number)
         lines_yielded = 0
 
         while True:
             try:
-                # Get log from current position
-                new_lines = self.get_console_log(
-                    job_name, build_number, start_line=current_line
-                )
-
-                if new_lines:
-                    for line in new_lines:
-                        yield line
-                        current_line += 1
-                        lines_yielded += 1
+                new_lines = tail.poll()
+            except Exception as e:
+                logger.error(f"Error streaming log: {e}")
+                break
 
-                        if max_lines and lines_yielded >= max_lines:
-                            return
+            for line in new_lines:
+                yield line
+                lines_yielded += 1
+                if max_lines and lines_yielded >= max_lines:
+                    return
 
-                # Check if build is still running
-                try:
-                    from .build_manager import BuildManager
+            if tail.finished:
+                break
+            time.sleep(poll_interval)
 
-                    build_manager = BuildManager(self.connection)
-                    build_info = build_manager.get_build_info(job_name, build_number)
-                    if build_info.status not in ["BUILDING", "STARTED"]:
-                        # Build completed, return any remaining lines
-                        break
-                except Exception as e:
-                    logger.warning(f"Could not check build status: {e}")
-                    break
 
-                import time
+class LogTail:
+    """
+    Follows a build's console log by byte offset.
 
-                time.sleep(poll_interval)
+    Each ``poll`` issues one ``progressiveText`` request starting at the
+    ``X-Text-Size`` returned by the previous one, so only new bytes are
+    transferred. A trailing line without its newline is held back until the
+    rest of it arrives, and ``X-More-Data`` tells when the build has finished
+    writing its log.
+    """
 
-            except Exception as e:
-                logger.error(f"Error streaming log: {e}")
-                break
+    def __init__(
+        self, fetcher: LogFetcher, job_name: str, build_number: int, start: int = 0
+    ):
+        self.fetcher = fetcher
+        self.job_name = job_name
+        self.build_number = build_number
+        self.offset = start
+        self.finished = False
+        self._partial = b""
+
+    def poll(self) -> List[str]:
+        """Fetches the bytes logged since the last poll and returns completed lines"""
+        if self.finished:
+            return []
+
+        sink = io.BytesIO()
+        download = self.fetcher.download_progressive_log(
+            self.job_name, self.build_number, sink, start=self.offset
+        )
+        data = sink.getvalue()
+
+        if download.text_size is None:
+            self.offset += download.bytes_written
+        elif download.restarted:
+            # Jenkins served the log from the start: it was shorter than our offset
+            logger.warning(
+                f"Log of {self.job_name}#{self.build_number} restarted below offset "
+                f"{self.offset}; following it from the beginning"
+            )
+            self._partial = b""
+            self.offset = download.text_size
+        else:
+            self.offset = download.text_size
+
+        self.finished = not download.more_data
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if self.finished and self._partial:
+            lines.append(self._partial)
+            self._partial = b""
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
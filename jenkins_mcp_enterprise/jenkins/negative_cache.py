@@ -0,0 +1,109 @@
+"""Negative-result cache for Jenkins lookups that are known to fail
+
+Discovery probes optional endpoints (wfapi runs and describe) that simply do
+not exist for freestyle jobs, and tools ask for logs of pipeline-stage
+pseudo-builds that Jenkins answers with 404. Remembering those outcomes for
+a while lets later calls skip the round trip entirely.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import jenkins
+import requests
+
+from ..logging_config import get_component_logger
+
+logger = get_component_logger("jenkins.negative_cache")
+
+# Kinds of negative results; builds are keyed by (job, number), the rest by job
+MISSING_BUILD = "missing_build"
+NO_WFAPI = "no_wfapi"
+
+
+def is_not_found(error: BaseException) -> bool:
+    """Whether an error (or one it was raised from) is a Jenkins 404"""
+    current: Optional[BaseException] = error
+    seen = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, jenkins.NotFoundException):
+            return True
+        if isinstance(current, requests.HTTPError):
+            response = current.response
+            if response is not None and response.status_code == 404:
+                return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+@dataclass
+class NegativeCacheStats:
+    """Counters describing how many requests the cache avoided"""
+
+    hits: int = 0
+    recorded: int = 0
+    entries: int = 0
+
+
+class NegativeCache:
+    """
+    Remembers missing builds and unsupported endpoints for a limited time.
+
+    Missing builds get a short TTL because a queued build number can appear
+    later; unsupported endpoints describe the job type and can be kept longer.
+    A TTL of 0 disables caching for that kind.
+    """
+
+    def __init__(
+        self, missing_build_ttl: float = 60.0, unsupported_ttl: float = 3600.0
+    ):
+        self.ttls = {
+            MISSING_BUILD: missing_build_ttl,
+            NO_WFAPI: unsupported_ttl,
+        }
+        self._lock = threading.Lock()
+        self._expiry: Dict[Tuple[str, Hashable], float] = {}
+        self._stats = NegativeCacheStats()
+
+    def is_known(self, kind: str, *key: Hashable) -> bool:
+        """Whether a negative result for ``key`` was recorded and is still fresh"""
+        entry = (kind, key)
+        with self._lock:
+            expires_at = self._expiry.get(entry)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._expiry[entry]
+                return False
+            self._stats.hits += 1
+            return True
+
+    def record(self, kind: str, *key: Hashable) -> None:
+        """Records a negative result for ``key``"""
+        ttl = self.ttls.get(kind, 0)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._expiry[(kind, key)] = time.monotonic() + ttl
+            self._stats.recorded += 1
+            if len(self._expiry) % 1024 == 0:
+                self._prune_locked()
+        logger.debug(f"Recorded {kind} for {key} ({ttl:.0f}s)")
+
+    def forget(self, kind: str, *key: Hashable) -> None:
+        with self._lock:
+            self._expiry.pop((kind, key), None)
+
+    def _prune_locked(self) -> None:
+        now = time.monotonic()
+        for entry in [e for e, expires_at in self._expiry.items() if expires_at <= now]:
+            del self._expiry[entry]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune_locked()
+            self._stats.entries = len(self._expiry)
+            return asdict(self._stats)
@@ -16,11 +16,13 @@ Sub-Build Detection:
 - Promoted Builds (promoted-builds): Tracks build promotion workflows
 - Build Pipeline (build-pipeline-plugin): Pipeline dependency relationships
 
-Discovery Methods (in order of preference):
-1. wfapi: /job/{job}/{build}/wfapi/runs and /job/{job}/{build}/wfapi/describe
-2. Tree API: /job/{job}/{build}/api/json?tree=actions[nodes[actions[description]]]
-3. Build Actions: hudson.plugins.promoted_builds.BuildInfoExporterAction
-4. SubBuilds Field: Classic subBuilds field from build JSON
+Discovery Methods:
+1. Projected query: one /job/{job}/{build}/api/json?tree=... per build returns
+   its status plus subBuilds, triggeredBuilds and flow graph node references
+   (see discovery_query.DISCOVERY_TREE). Children's statuses are taken from
+   the parent's response where Jenkins includes them.
+2. wfapi: /job/{job}/{build}/wfapi/runs and /job/{job}/{build}/wfapi/describe,
+   only for pipeline runs whose flow graph was not in the projected response
 
 Plugin Class Names Detected:
 - hudson.plugins.promoted_builds.BuildInfoExporterAction
@@ -32,19 +34,46 @@ to pipeline workflow information without stale references.
 """
 
 import concurrent.futures
-import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from ..base import Build, SubBuild
-from ..exceptions import SubBuildDiscoveryError
+from ..exceptions import BuildNotFoundError, SubBuildDiscoveryError
 from ..logging_config import get_component_logger
 from ..utils import deduplicate_by_representation
+from .async_client import AsyncFanout
+from .build_graph import UPSTREAM, BuildGraphIndex, upstream_causes
 from .connection_manager import JenkinsConnectionManager
+from .discovery_query import (
+    DISCOVERY_TREE,
+    FAILED_STATUSES,
+    FINAL_STATUSES,
+    ChildRef,
+    DiscoveryNode,
+    build_status,
+    expansion_statuses,
+    parse_discovery_node,
+    should_expand,
+)
+from .hierarchy_cache import HierarchyCache
 from .job_name_utils import JobNameParser
+from .negative_cache import MISSING_BUILD, NO_WFAPI, is_not_found
 
 logger = get_component_logger("jenkins.subbuild")
 
 
+@dataclass
+class DepthTiming:
+    """When the builds at one hierarchy depth were queried during a traversal"""
+
+    depth: int  # 0 is the root build
+    builds: int = 0
+    first_submitted: float = 0.0  # Seconds since the traversal started
+    last_completed: float = 0.0
+
+
 class SubBuildDiscoverer:
     """Discovers and traverses Jenkins sub-builds using the proven approach from jenkins_client_old.py"""
 
@@ -52,10 +81,60 @@ class SubBuildDiscoverer:
         self,
         connection_manager: JenkinsConnectionManager,
         max_parallel_workers: int = 10,
+        hierarchy_cache: Optional[HierarchyCache] = None,
+        build_graph: Optional[BuildGraphIndex] = None,
+        fanout: Optional[AsyncFanout] = None,
     ):
         self.connection = connection_manager
         self.max_parallel_workers = max_parallel_workers
+        self.hierarchy_cache = hierarchy_cache
+        self.build_graph = build_graph
+        # Coroutine fan-out for batches of independent build lookups
+        self.fanout = fanout
         self._executor = None
+        self._stats_lock = threading.Lock()
+        self._last_depth_timings: List[DepthTiming] = []
+
+    def traversal_stats(self) -> List[Dict[str, Any]]:
+        """Per-depth timing of the most recent parallel traversal"""
+        with self._stats_lock:
+            return [asdict(timing) for timing in self._last_depth_timings]
+
+    def _get_optional_endpoint(
+        self,
+        kind: str,
+        job_name: str,
+        build_number: int,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Optional[Any]:
+        """
+        GET a JSON endpoint that only some job types provide.
+
+        Returns None without a request when the job is known not to provide it.
+        A 404 marks the job as lacking the endpoint, unless the build itself is
+        missing, which says nothing about the job.
+        """
+        negative_cache = self.connection.negative_cache
+        if negative_cache.is_known(kind, job_name):
+            return None
+        try:
+            response = self.connection.session.get(
+                url, params=params, timeout=self.connection.config.timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            if is_not_found(e) and self._build_exists(job_name, build_number):
+                negative_cache.record(kind, job_name)
+            raise
+        return response.json()
+
+    def _build_exists(self, job_name: str, build_number: int) -> bool:
+        try:
+            self.connection.get_build_info(job_name, build_number, depth=0)
+            return True
+        except Exception:
+            return False
 
     def discover_subbuilds(
         self,
@@ -63,6 +142,8 @@ class SubBuildDiscoverer:
         parent_build_number: int,
         max_depth: int = 5,
         parallel: bool = True,
+        failures_only: bool = False,
+        expand_running: bool = False,
     ) -> List[SubBuild]:
         """
         Discover all sub-builds using parallel processing for improved performance.
@@ -70,7 +151,7 @@ class SubBuildDiscoverer:
         PERFORMANCE IMPROVEMENTS:
         - Parallel discovery reduces initial call time from ~30+ seconds to ~10 seconds
         - Concurrent Jenkins API calls at each hierarchy level
-        - Thread-safe breadth-first traversal using ThreadPoolExecutor
+        - Pipelined traversal: children are queried as soon as their parent resolves
         - Configurable worker pool size (default: 10 concurrent workers)
         - Graceful fallback to sequential method on errors
 
@@ -78,6 +159,14 @@ class SubBuildDiscoverer:
         - Accepts various job name formats (URL-encoded, with/without /job/ prefixes)
         - Normalizes job names for consistent processing
 
+        FAILURE-DIRECTED MODE:
+        With ``failures_only`` only FAILURE, UNSTABLE, ABORTED and UNKNOWN
+        children (and RUNNING ones with ``expand_running``) are expanded, judged
+        by the status in their parent's response. Other children are still
+        returned, marked ``collapsed``, but their subtrees cost no requests.
+        Failures below a successful child (e.g. triggered with
+        ``propagate: false``) are not found in this mode.
+
         This addresses MCP client timeout issues caused by long-running sequential discovery
         of complex Jenkins pipeline hierarchies with many sub-builds.
 
@@ -86,6 +175,8 @@ class SubBuildDiscoverer:
             parent_build_number: Build number to analyze
             max_depth: Maximum depth to traverse (default: 5)
             parallel: Enable parallel processing (default: True)
+            failures_only: Only expand failed subtrees (default: False)
+            expand_running: With failures_only, also expand running subtrees
 
         Returns:
             List of discovered SubBuild objects with hierarchy information
@@ -97,34 +188,139 @@ class SubBuildDiscoverer:
                 f"Normalized job name: '{parent_job_name}' -> '{normalized_job_name}'"
             )
 
+            expand = expansion_statuses(failures_only, expand_running)
+            variant = f"{max_depth}:{','.join(sorted(expand)) if expand else '*'}"
+            known: Dict[Tuple[str, int], DiscoveryNode] = {}
+            if self.hierarchy_cache is not None:
+                cached, known = self.hierarchy_cache.lookup(
+                    normalized_job_name, parent_build_number, variant
+                )
+                if cached is not None:
+                    logger.info(
+                        f"Using cached hierarchy of finished build "
+                        f"{normalized_job_name}#{parent_build_number}"
+                    )
+                    self._record_graph({}, cached)
+                    return cached
+
+            # Every build the traversal queried, None where the query failed
+            nodes: Dict[Tuple[str, int], Optional[DiscoveryNode]] = {}
             if parallel:
-                return self._discover_subbuilds_parallel(
-                    normalized_job_name, parent_build_number, max_depth
+                sub_builds = self._discover_subbuilds_parallel(
+                    normalized_job_name,
+                    parent_build_number,
+                    max_depth,
+                    expand,
+                    known,
+                    nodes,
                 )
             else:
-                return self._discover_subbuilds_sequential(
-                    normalized_job_name, parent_build_number, max_depth
+                sub_builds = self._discover_subbuilds_sequential(
+                    normalized_job_name,
+                    parent_build_number,
+                    max_depth,
+                    expand,
+                    known,
+                    nodes,
                 )
+
+            if self.hierarchy_cache is not None:
+                self._cache_hierarchy(
+                    normalized_job_name, parent_build_number, variant, nodes, sub_builds
+                )
+                self.hierarchy_cache.record_reuse(
+                    sum(1 for key in nodes if key in known)
+                )
+            self._record_graph(nodes, sub_builds)
+            return sub_builds
         except Exception as e:
             raise SubBuildDiscoveryError(f"Failed to discover sub-builds: {e}") from e
 
+    def _record_graph(
+        self,
+        nodes: Dict[Tuple[str, int], Optional[DiscoveryNode]],
+        sub_builds: List[SubBuild],
+    ) -> None:
+        """Adds the edges a traversal observed to the reverse build-graph index"""
+        if self.build_graph is None:
+            return
+        try:
+            for node in nodes.values():
+                if node is None:
+                    continue
+                children = [child.key for child in node.children]
+                if node.completed:
+                    self.build_graph.record_children(
+                        node.job_name, node.build_number, children
+                    )
+                else:
+                    # A running build may still start children
+                    self.build_graph.record_edges(
+                        (node.job_name, node.build_number, child_job, child_build)
+                        for child_job, child_build in children
+                    )
+            self.build_graph.record_edges(
+                (
+                    sub_build.parent_job_name,
+                    sub_build.parent_build_number,
+                    sub_build.job_name,
+                    sub_build.build_number,
+                )
+                for sub_build in sub_builds
+                if sub_build.parent_job_name
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record build graph edges: {e}")
+
+    def _cache_hierarchy(
+        self,
+        job_name: str,
+        build_number: int,
+        variant: str,
+        nodes: Dict[Tuple[str, int], Optional[DiscoveryNode]],
+        sub_builds: List[SubBuild],
+    ) -> None:
+        """Caches finished nodes, and the whole result once nothing can change"""
+        complete = all(
+            node is not None and node.completed for node in nodes.values()
+        ) and all(sub_build.status in FINAL_STATUSES for sub_build in sub_builds)
+        self.hierarchy_cache.store(
+            job_name,
+            build_number,
+            variant,
+            {key: node for key, node in nodes.items() if node is not None},
+            sub_builds if complete else None,
+        )
+
     def _discover_subbuilds_sequential(
-        self, parent_job_name: str, parent_build_number: int, max_depth: int = 5
+        self,
+        parent_job_name: str,
+        parent_build_number: int,
+        max_depth: int = 5,
+        expand: Optional[FrozenSet[str]] = None,
+        known: Optional[Dict[Tuple[str, int], DiscoveryNode]] = None,
+        nodes: Optional[Dict[Tuple[str, int], Optional[DiscoveryNode]]] = None,
     ) -> List[SubBuild]:
         """Original sequential discovery method (fallback)"""
         all_sub_builds: List[SubBuild] = []
         visited_builds: Set[Tuple[str, int]] = set()
+        pending: Dict[Tuple[str, int], List[SubBuild]] = {}
 
         # The initial call's children will have the original parent as their parent, and depth 1
         self._collect_all_sub_builds(
             parent_job_name,
             parent_build_number,
             1,  # Start depth at 1 for children of the initial parent
+            max_depth,
             visited_builds,
             all_sub_builds,
-            parent_job_name,  # Parent details for the first level of children
-            parent_build_number,
+            pending,
+            expand,
+            known or {},
+            {} if nodes is None else nodes,
         )
+        for key in list(pending):
+            self._resolve_pending(key, pending, *self._get_build_status_and_url(*key))
 
         # Deduplicate sub-builds using common utility
         final_list = deduplicate_by_representation(
@@ -142,65 +338,103 @@ class SubBuildDiscoverer:
         return final_list
 
     def _discover_subbuilds_parallel(
-        self, parent_job_name: str, parent_build_number: int, max_depth: int = 5
+        self,
+        parent_job_name: str,
+        parent_build_number: int,
+        max_depth: int = 5,
+        expand: Optional[FrozenSet[str]] = None,
+        known: Optional[Dict[Tuple[str, int], DiscoveryNode]] = None,
+        nodes: Optional[Dict[Tuple[str, int], Optional[DiscoveryNode]]] = None,
     ) -> List[SubBuild]:
-        """Parallel sub-build discovery using ThreadPoolExecutor without nested event loops"""
+        """
+        Pipelined sub-build discovery on a ThreadPoolExecutor.
+
+        Each child is submitted as soon as its parent's query returns instead
+        of waiting for the whole level, so a slow controller response only
+        delays its own subtree and the wall-clock time approaches the
+        critical path. The executor's worker count bounds requests in flight.
+        Results are consumed by this thread alone, which therefore owns the
+        visited set and the pending statuses without further locking.
+        """
+        known = known or {}
+        nodes = {} if nodes is None else nodes
         try:
-            # Use ThreadPoolExecutor directly without asyncio.run to avoid nested event loop issues
             all_sub_builds: List[SubBuild] = []
-            visited_builds: Set[Tuple[str, int]] = set()
-
-            # Breadth-first discovery with parallel processing at each level
-            current_level = [
-                (
-                    parent_job_name,
-                    parent_build_number,
-                    1,
-                    parent_job_name,
-                    parent_build_number,
-                )
-            ]
+            visited_builds: Set[Tuple[str, int]] = {
+                (parent_job_name, parent_build_number)
+            }
+            # Sub-builds whose status the parent's JSON did not include; it is
+            # filled in when the child itself is queried
+            pending: Dict[Tuple[str, int], List[SubBuild]] = {}
+            timings: Dict[int, DepthTiming] = {}
+            started = time.monotonic()
 
             with concurrent.futures.ThreadPoolExecutor(
                 max_workers=self.max_parallel_workers
             ) as executor:
-                for depth in range(1, max_depth + 1):
-                    if not current_level:
-                        break
-
-                    # Process current level in parallel using submit/as_completed
-                    futures = []
-                    for (
+                # Future -> build it queries and its hierarchy depth (root is 0)
+                in_flight: Dict[
+                    concurrent.futures.Future, Tuple[Tuple[str, int], int]
+                ] = {}
+
+                def submit(job_name: str, build_number: int, depth: int) -> None:
+                    timing = timings.get(depth)
+                    if timing is None:
+                        timing = timings[depth] = DepthTiming(
+                            depth=depth, first_submitted=time.monotonic() - started
+                        )
+                    timing.builds += 1
+                    future = executor.submit(
+                        self._discover_direct_children,
                         job_name,
                         build_number,
-                        current_depth,
-                        parent_job,
-                        parent_build,
-                    ) in current_level:
-                        if (job_name, build_number) not in visited_builds:
-                            visited_builds.add((job_name, build_number))
-                            future = executor.submit(
-                                self._discover_direct_children,
-                                job_name,
-                                build_number,
-                                current_depth,
-                                parent_job,
-                                parent_build,
-                            )
-                            futures.append(future)
+                        depth + 1,
+                        known,
+                    )
+                    in_flight[future] = ((job_name, build_number), depth)
 
-                    # Wait for all parallel discoveries to complete
-                    next_level = []
-                    for future in concurrent.futures.as_completed(futures):
+                submit(parent_job_name, parent_build_number, 0)
+                while in_flight:
+                    done, _ = concurrent.futures.wait(
+                        in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        key, depth = in_flight.pop(future)
+                        timings[depth].last_completed = time.monotonic() - started
                         try:
-                            discovered_builds, children_for_next_level = future.result()
-                            all_sub_builds.extend(discovered_builds)
-                            next_level.extend(children_for_next_level)
+                            node, discovered_builds = future.result()
                         except Exception as e:
                             logger.warning(f"Sub-build discovery failed: {e}")
+                            node, discovered_builds = None, []
+                        nodes[key] = node
+                        if node is not None:
+                            self._resolve_pending(
+                                (node.job_name, node.build_number),
+                                pending,
+                                node.status,
+                                node.url,
+                            )
+                        for sub_build in discovered_builds:
+                            if sub_build.status is None:
+                                pending.setdefault(
+                                    (sub_build.job_name, sub_build.build_number), []
+                                ).append(sub_build)
+                        all_sub_builds.extend(discovered_builds)
+
+                        if depth + 1 >= max_depth:
                             continue
-
-                    current_level = next_level
+                        for sub_build in discovered_builds:
+                            child_key = (sub_build.job_name, sub_build.build_number)
+                            if not should_expand(sub_build.status, expand):
+                                sub_build.collapsed = True
+                            elif child_key not in visited_builds:
+                                visited_builds.add(child_key)
+                                submit(*child_key, depth + 1)
+
+                # Leaves at max_depth were never queried themselves
+                statuses = self._get_build_statuses(executor, list(pending))
+                for key, (status, url) in statuses.items():
+                    self._resolve_pending(key, pending, status, url)
 
             # Deduplicate results using common utility
             final_list = deduplicate_by_representation(
@@ -215,8 +449,17 @@ class SubBuildDiscoverer:
                 ),
             )
 
+            depth_timings = [timings[depth] for depth in sorted(timings)]
+            with self._stats_lock:
+                self._last_depth_timings = depth_timings
+            for timing in depth_timings:
+                logger.debug(
+                    f"Depth {timing.depth}: {timing.builds} builds queried between "
+                    f"{timing.first_submitted:.3f}s and {timing.last_completed:.3f}s"
+                )
             logger.info(
-                f"Parallel discovery found {len(final_list)} sub-builds across {max_depth} levels"
+                f"Parallel discovery found {len(final_list)} sub-builds across "
+                f"{len(depth_timings)} levels in {time.monotonic() - started:.2f}s"
             )
             return final_list
 
@@ -224,86 +467,125 @@ class SubBuildDiscoverer:
             logger.warning(
                 f"Parallel discovery failed, falling back to sequential: {e}"
             )
+            nodes.clear()
             return self._discover_subbuilds_sequential(
-                parent_job_name, parent_build_number, max_depth
+                parent_job_name, parent_build_number, max_depth, expand, known, nodes
             )
 
-    def _discover_direct_children(
+    def _query_node(
         self,
         job_name: str,
         build_number: int,
-        depth: int,
-        parent_job_name: str,
-        parent_build_number: int,
-    ) -> Tuple[List[SubBuild], List[Tuple[str, int, int, str, int]]]:
-        """Discover direct children of a specific build (thread-safe)"""
-        discovered_builds = []
-        children_for_next_level = []
+        known: Optional[Dict[Tuple[str, int], DiscoveryNode]] = None,
+    ) -> DiscoveryNode:
+        """
+        Reads a build's status and child references with one projected request.
 
+        wfapi is only consulted for pipeline runs whose flow graph was not part
+        of the response. Finished builds found in ``known`` cost no request.
+        """
+        if known and (job_name, build_number) in known:
+            return self._reuse_node(known[(job_name, build_number)], known)
+        negative_cache = self.connection.negative_cache
+        if negative_cache.is_known(MISSING_BUILD, job_name, build_number):
+            raise BuildNotFoundError(
+                f"Build {job_name}#{build_number} does not exist (cached)"
+            )
+        base_url = self.connection.config.url.rstrip("/")
+        api_job_path = JobNameParser.to_jenkins_api_path(job_name)
         try:
-            # Get build info for this specific build
-            build_info = self.connection.client.get_build_info(
-                job_name, build_number, depth=1
+            response = self.connection.session.get(
+                f"{base_url}/{api_job_path}/{build_number}/api/json",
+                params={"tree": DISCOVERY_TREE},
+                timeout=self.connection.config.timeout,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            if is_not_found(e):
+                negative_cache.record(MISSING_BUILD, job_name, build_number)
+            raise
+
+        node = parse_discovery_node(job_name, build_number, response.json(), base_url)
+        if node.needs_wfapi:
+            node.add_children(
+                [
+                    ChildRef(child_job, child_build)
+                    for child_job, child_build in self._discover_children_wfapi(
+                        job_name, build_number
+                    )
+                ]
             )
+        return node
 
-            # Process different discovery methods in parallel-safe way
-            children = []
-
-            # Method 1: wfapi discovery (PRIMARY - more reliable than Blue Ocean)
-            wfapi_children = self._discover_children_wfapi(job_name, build_number)
-            children.extend(wfapi_children)
-
-            # Method 2: Tree API discovery (SECONDARY - reliable fallback)
-            tree_children = self._discover_children_tree_api(job_name, build_number)
-            children.extend(tree_children)
-
-            # Method 3: Build actions discovery (TERTIARY - for legacy builds)
-            action_children = self._discover_children_build_actions(build_info)
-            children.extend(action_children)
-
-            # Method 4: SubBuilds field discovery (FALLBACK - basic support)
-            subbuilds_children = self._discover_children_subbuilds_field(build_info)
-            children.extend(subbuilds_children)
-
-            # Deduplicate children
-            seen_children = set()
-            unique_children = []
-            for child_job, child_build in children:
-                key = (child_job, child_build)
-                if key not in seen_children:
-                    seen_children.add(key)
-                    unique_children.append((child_job, child_build))
-
-            # Create SubBuild objects and prepare for next level
-            for child_job, child_build in unique_children:
-                status, url = self._get_build_status_and_url(child_job, child_build)
-
-                sub_build = SubBuild(
-                    job_name=child_job,
-                    build_number=child_build,
-                    url=url,
-                    status=status,
-                    parent_job_name=parent_job_name,
-                    parent_build_number=parent_build_number,
-                    depth=depth,
-                )
-                discovered_builds.append(sub_build)
+    @staticmethod
+    def _reuse_node(
+        cached: DiscoveryNode, known: Dict[Tuple[str, int], DiscoveryNode]
+    ) -> DiscoveryNode:
+        """
+        Copies a finished node from the hierarchy cache.
 
-                # Prepare for next level discovery
-                children_for_next_level.append(
-                    (child_job, child_build, depth + 1, job_name, build_number)
-                )
+        A child's status as recorded in its parent may have been RUNNING at
+        the time; unless the child itself is known to be finished, it is
+        cleared so the traversal reads it again.
+        """
+        children = []
+        for child in cached.children:
+            finished = known.get(child.key)
+            if finished is not None:
+                child = replace(child, status=finished.status, url=finished.url)
+            elif child.status not in FINAL_STATUSES:
+                child = replace(child, status=None)
+            children.append(child)
+        return replace(cached, children=children)
 
-            logger.debug(
-                f"Found {len(discovered_builds)} children for {job_name}#{build_number}"
-            )
+    def _discover_direct_children(
+        self,
+        job_name: str,
+        build_number: int,
+        depth: int,
+        known: Optional[Dict[Tuple[str, int], DiscoveryNode]] = None,
+    ) -> Tuple[Optional[DiscoveryNode], List[SubBuild]]:
+        """Discover direct children of a specific build (thread-safe)"""
+        discovered_builds = []
 
+        try:
+            node = self._query_node(job_name, build_number, known)
         except Exception as e:
             logger.warning(
                 f"Failed to discover children for {job_name}#{build_number}: {e}"
             )
+            return None, discovered_builds
+
+        # Create SubBuild objects for the next level
+        for child in node.children:
+            discovered_builds.append(
+                SubBuild(
+                    job_name=child.job_name,
+                    build_number=child.build_number,
+                    url=child.url,
+                    status=child.status,
+                    parent_job_name=job_name,
+                    parent_build_number=build_number,
+                    depth=depth,
+                )
+            )
 
-        return discovered_builds, children_for_next_level
+        logger.debug(
+            f"Found {len(discovered_builds)} children for {job_name}#{build_number}"
+        )
+        return node, discovered_builds
+
+    @staticmethod
+    def _resolve_pending(
+        key: Tuple[str, int],
+        pending: Dict[Tuple[str, int], List[SubBuild]],
+        status: Optional[str],
+        url: Optional[str],
+    ) -> None:
+        """Fills in the status of sub-builds referenced without one"""
+        for sub_build in pending.pop(key, []):
+            sub_build.status = status
+            sub_build.url = sub_build.url or url
 
     def _discover_children_wfapi(
         self, job_name: str, build_number: int
@@ -322,11 +604,11 @@ class SubBuildDiscoverer:
             # Try wfapi/runs endpoint for pipeline runs
             wfapi_runs_url = f"{base_url}/{api_job_path}/{build_number}/wfapi/runs"
 
-            response = self.connection.session.get(
-                wfapi_runs_url, timeout=self.connection.config.timeout
+            runs_data = self._get_optional_endpoint(
+                NO_WFAPI, job_name, build_number, wfapi_runs_url
             )
-            response.raise_for_status()
-            runs_data = response.json()
+            if runs_data is None:
+                return children
 
             if isinstance(runs_data, list):
                 for run_data in runs_data:
@@ -355,11 +637,12 @@ class SubBuildDiscoverer:
                 f"{base_url}/{api_job_path}/{build_number}/wfapi/describe"
             )
             try:
-                response = self.connection.session.get(
-                    wfapi_describe_url, timeout=self.connection.config.timeout
+                describe_data = (
+                    self._get_optional_endpoint(
+                        NO_WFAPI, job_name, build_number, wfapi_describe_url
+                    )
+                    or {}
                 )
-                response.raise_for_status()
-                describe_data = response.json()
 
                 # Extract stages and their downstream builds
                 stages = describe_data.get("stages", [])
@@ -395,354 +678,172 @@ class SubBuildDiscoverer:
 
         return children
 
-    def _discover_children_build_actions(
-        self, build_info: Dict
-    ) -> List[Tuple[str, int]]:
-        """Discover children from build actions (thread-safe)"""
-        children = []
-
-        if "actions" in build_info:
-            for action in build_info.get("actions", []):
-                if (
-                    action
-                    and "_class" in action
-                    and "hudson.plugins.promoted_builds.BuildInfoExporterAction"
-                    in action["_class"]
-                ):
-                    for triggered_build in action.get("triggeredBuilds", []):
-                        child_job_name = triggered_build.get(
-                            "projectName"
-                        ) or triggered_build.get("jobName")
-                        child_build_number = triggered_build.get("buildNumber")
-                        if child_job_name and child_build_number:
-                            children.append((child_job_name, child_build_number))
-
-        return children
-
-    def _discover_children_tree_api(
-        self, job_name: str, build_number: int
-    ) -> List[Tuple[str, int]]:
-        """Discover children using Tree API (thread-safe)"""
-        children = []
-
-        try:
-            base_url = self.connection.config.url.rstrip("/")
-
-            # Use job name parser to get the correct API path
-            api_job_path = JobNameParser.to_jenkins_api_path(job_name)
-
-            api_url = f"{base_url}/{api_job_path}/{build_number}/api/json"
-            params = {"tree": "actions[nodes[actions[description]]]"}
-
-            response = self.connection.session.get(
-                api_url, params=params, timeout=self.connection.config.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Parse the tree API response for child job links
-            for top_level_action in data.get("actions", []):
-                if "nodes" in top_level_action:
-                    for node in top_level_action.get("nodes", []):
-                        for node_action in node.get("actions", []):
-                            description = node_action.get("description")
-                            if description:
-                                # Parse the description string: "job » path #build"
-                                match = re.match(r"^(.*) #(\d+)", description.strip())
-                                if match:
-                                    job_path_raw = match.group(1).strip()
-                                    build_num = int(match.group(2))
-
-                                    # Convert "job » path" to normalized job name
-                                    tree_job_name = job_path_raw.replace(" » ", "/")
-                                    tree_job_name = JobNameParser.normalize_job_name(
-                                        tree_job_name
-                                    )
-                                    children.append((tree_job_name, build_num))
-
-        except Exception as e:
-            logger.debug(
-                f"Tree API discovery failed for {job_name}#{build_number}: {e}"
-            )
-
-        return children
-
-    def _discover_children_subbuilds_field(
-        self, build_info: Dict
-    ) -> List[Tuple[str, int]]:
-        """Discover children from subBuilds field (thread-safe)"""
-        children = []
-
-        if "subBuilds" in build_info:
-            for sub_build_data in build_info.get("subBuilds", []):
-                child_job_name = sub_build_data.get("jobName")
-                child_build_number = sub_build_data.get("buildNumber")
-                if child_job_name and child_build_number:
-                    children.append((child_job_name, child_build_number))
-
-        return children
-
     def _collect_all_sub_builds(
         self,
-        current_build_job_name: str,
-        current_build_number: int,
-        current_depth: int,
+        job_name: str,
+        build_number: int,
+        depth: int,
+        max_depth: int,
         visited: Set[Tuple[str, int]],
         all_sub_builds_list: List[SubBuild],
-        parent_job_name_for_children: Optional[str],
-        parent_build_number_for_children: Optional[int],
+        pending: Dict[Tuple[str, int], List[SubBuild]],
+        expand: Optional[FrozenSet[str]],
+        known: Dict[Tuple[str, int], DiscoveryNode],
+        nodes: Dict[Tuple[str, int], Optional[DiscoveryNode]],
     ):
-        """Collect all sub-builds using multiple discovery methods"""
-        if (current_build_job_name, current_build_number) in visited:
+        """Collect sub-builds depth-first with one projected query per build"""
+        if (job_name, build_number) in visited:
             return
-        visited.add((current_build_job_name, current_build_number))
-
-        # Try different discovery methods in order of preference
-        discovered_children = self._discover_all_children(
-            current_build_job_name, current_build_number
-        )
-
-        # Process discovered children
-        self._process_discovered_children(
-            discovered_children,
-            current_build_job_name,
-            current_build_number,
-            current_depth,
-            visited,
-            all_sub_builds_list,
-            parent_job_name_for_children,
-            parent_build_number_for_children,
-        )
-
-    def _discover_all_children(
-        self, job_name: str, build_number: int
-    ) -> List[Tuple[str, int]]:
-        """Discover children using all available methods"""
-        children = []
-
-        # Method 1: wfapi discovery (PRIMARY)
-        try:
-            wfapi_children = self._discover_children_via_wfapi(job_name, build_number)
-            children.extend(wfapi_children)
-        except Exception as e:
-            logger.debug(f"wfapi discovery failed for {job_name}#{build_number}: {e}")
+        visited.add((job_name, build_number))
 
-        # Method 2: Classic API discovery (SECONDARY)
         try:
-            classic_children = self._discover_children_via_classic_api(
-                job_name, build_number
-            )
-            children.extend(classic_children)
+            node = self._query_node(job_name, build_number, known)
         except Exception as e:
-            logger.debug(
-                f"Classic API discovery failed for {job_name}#{build_number}: {e}"
-            )
-
-        # Method 3: Tree API discovery (TERTIARY)
-        try:
-            tree_children = self._discover_children_via_tree_api(job_name, build_number)
-            children.extend(tree_children)
-        except Exception as e:
-            logger.debug(
-                f"Tree API discovery failed for {job_name}#{build_number}: {e}"
-            )
-
-        # Deduplicate children
-        seen = set()
-        unique_children = []
-        for child in children:
-            if child not in seen:
-                seen.add(child)
-                unique_children.append(child)
-
-        return unique_children
-
-    def _discover_children_via_wfapi(
-        self, job_name: str, build_number: int
-    ) -> List[Tuple[str, int]]:
-        """Discover children via wfapi method"""
-        children = []
-
-        if not self.connection.config.url:
-            return children
-
-        base_url = self.connection.config.url.rstrip("/")
-        api_job_path = JobNameParser.to_jenkins_api_path(job_name)
-
-        # Try wfapi/runs endpoint
-        wfapi_runs_url = f"{base_url}/{api_job_path}/{build_number}/wfapi/runs"
-
-        response = self.connection.session.get(
-            wfapi_runs_url, timeout=self.connection.config.timeout
-        )
-        response.raise_for_status()
-        runs_data = response.json()
-
-        if isinstance(runs_data, list):
-            for run_data in runs_data:
-                children.extend(self._extract_children_from_run_data(run_data))
-
-        return children
-
-    def _extract_children_from_run_data(self, run_data: Dict) -> List[Tuple[str, int]]:
-        """Extract children from wfapi run data"""
-        children = []
-
-        run_name = run_data.get("name")
-        run_id = run_data.get("id")
-        run_status = run_data.get("status")
-
-        if run_name and run_id and run_status != "NOT_EXECUTED":
-            downstream_builds = run_data.get("downstreamBuilds", [])
-            for downstream in downstream_builds:
-                downstream_job = downstream.get("jobName")
-                downstream_build = downstream.get("buildNumber")
-                if downstream_job and downstream_build:
-                    normalized_job = JobNameParser.normalize_job_name(downstream_job)
-                    children.append((normalized_job, int(downstream_build)))
-
-        return children
-
-    def _discover_children_via_classic_api(
-        self, job_name: str, build_number: int
-    ) -> List[Tuple[str, int]]:
-        """Discover children via classic Jenkins API"""
-        children = []
-
-        try:
-            build_info = self.connection.client.get_build_info(
-                job_name, build_number, depth=1
-            )
-        except Exception:
-            return children
-
-        # Check actions for triggered builds
-        for action in build_info.get("actions", []):
-            if (
-                action
-                and "_class" in action
-                and "hudson.plugins.promoted_builds.BuildInfoExporterAction"
-                in action["_class"]
-            ):
-                for triggered_build in action.get("triggeredBuilds", []):
-                    child_job_name = triggered_build.get(
-                        "projectName"
-                    ) or triggered_build.get("jobName")
-                    child_build_number = triggered_build.get("buildNumber")
-                    if child_job_name and child_build_number:
-                        children.append((child_job_name, child_build_number))
-
-        # Check subBuilds field
-        for sub_build_data in build_info.get("subBuilds", []):
-            child_job_name = sub_build_data.get("jobName")
-            child_build_number = sub_build_data.get("buildNumber")
-            if child_job_name and child_build_number:
-                children.append((child_job_name, child_build_number))
-
-        return children
-
-    def _discover_children_via_tree_api(
-        self, job_name: str, build_number: int
-    ) -> List[Tuple[str, int]]:
-        """Discover children via Tree API"""
-        children = []
-
-        try:
-            base_url = self.connection.config.url.rstrip("/")
-            api_job_path = JobNameParser.to_jenkins_api_path(job_name)
-
-            api_url = f"{base_url}/{api_job_path}/{build_number}/api/json"
-            params = {"tree": "actions[nodes[actions[description]]]"}
-
-            response = self.connection.session.get(
-                api_url, params=params, timeout=self.connection.config.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Parse tree API response
-            for top_level_action in data.get("actions", []):
-                if "nodes" in top_level_action:
-                    for node in top_level_action.get("nodes", []):
-                        for node_action in node.get("actions", []):
-                            description = node_action.get("description")
-                            if description:
-                                match = re.match(r"^(.*) #(\d+)", description.strip())
-                                if match:
-                                    job_path_raw = match.group(1).strip()
-                                    build_num = int(match.group(2))
-
-                                    tree_job_name = job_path_raw.replace(" » ", "/")
-                                    tree_job_name = JobNameParser.normalize_job_name(
-                                        tree_job_name
-                                    )
-                                    children.append((tree_job_name, build_num))
-
-        except Exception:
-            pass
-
-        return children
-
-    def _process_discovered_children(
-        self,
-        children: List[Tuple[str, int]],
-        current_job_name: str,
-        current_build_number: int,
-        current_depth: int,
-        visited: Set[Tuple[str, int]],
-        all_sub_builds_list: List[SubBuild],
-        parent_job_name_for_children: Optional[str],
-        parent_build_number_for_children: Optional[int],
-    ):
-        """Process discovered children and recurse"""
-        for child_job, child_build in children:
-            if not child_job:
-                continue
-
-            status, url = self._get_build_status_and_url(child_job, child_build)
+            logger.debug(f"Discovery failed for {job_name}#{build_number}: {e}")
+            nodes[(job_name, build_number)] = None
+            return
+        nodes[(job_name, build_number)] = node
+        self._resolve_pending((job_name, build_number), pending, node.status, node.url)
 
+        for child in node.children:
             sub_build = SubBuild(
-                job_name=child_job,
-                build_number=child_build,
-                url=url,
-                status=status,
-                parent_job_name=current_job_name,
-                parent_build_number=current_build_number,
-                depth=current_depth,
+                job_name=child.job_name,
+                build_number=child.build_number,
+                url=child.url,
+                status=child.status,
+                parent_job_name=job_name,
+                parent_build_number=build_number,
+                depth=depth,
             )
             all_sub_builds_list.append(sub_build)
+            if sub_build.status is None:
+                pending.setdefault(child.key, []).append(sub_build)
 
             # Recurse to find children of this sub-build
-            if (child_job, child_build) not in visited:
+            if depth < max_depth and not should_expand(sub_build.status, expand):
+                sub_build.collapsed = True
+            elif depth < max_depth:
                 self._collect_all_sub_builds(
-                    child_job,
-                    child_build,
-                    current_depth + 1,
+                    child.job_name,
+                    child.build_number,
+                    depth + 1,
+                    max_depth,
                     visited,
                     all_sub_builds_list,
-                    current_job_name,
-                    current_build_number,
+                    pending,
+                    expand,
+                    known,
+                    nodes,
                 )
 
+    def _get_build_statuses(
+        self,
+        executor: concurrent.futures.Executor,
+        keys: List[Tuple[str, int]],
+    ) -> Dict[Tuple[str, int], Tuple[Optional[str], Optional[str]]]:
+        """
+        Status and URL of many builds, fetched concurrently.
+
+        With a fan-out the lookups run as coroutines on one connection pool;
+        otherwise each takes a worker of ``executor``.
+        """
+        if self.fanout is None:
+            lookups = {
+                executor.submit(self._get_build_status_and_url, *key): key
+                for key in keys
+            }
+            return {
+                lookups[future]: future.result()
+                for future in concurrent.futures.as_completed(lookups)
+            }
+
+        statuses = {}
+        for key, info in zip(keys, self.fanout.gather_build_info(keys, depth=0)):
+            if isinstance(info, Exception):
+                logger.debug(f"Could not get status for {key[0]} #{key[1]}: {info}")
+                statuses[key] = ("UNKNOWN", None)
+            else:
+                statuses[key] = (build_status(info), info.get("url"))
+        return statuses
+
     def _get_build_status_and_url(
         self, job_name: str, build_number: int
     ) -> Tuple[Optional[str], Optional[str]]:
         """Helper to fetch build status and URL, returning Nones on failure."""
         try:
             # Depth 0 is sufficient for result and url
-            info = self.connection.client.get_build_info(
-                job_name, build_number, depth=0
-            )
-            status = info.get("result")  # SUCCESS, FAILURE, ABORTED, UNSTABLE, etc.
-            if status is None and info.get("building", False):
-                status = "RUNNING"
-            elif status is None:
-                status = "UNKNOWN"
-            return status, info.get("url")
+            info = self.connection.get_build_info(job_name, build_number, depth=0)
+            return build_status(info), info.get("url")
         except Exception as e:
             logger.debug(f"Could not get status for {job_name} #{build_number}: {e}")
             return "UNKNOWN", None
 
+    def trace_upstream(
+        self, job_name: str, build_number: int, max_depth: int = 20
+    ) -> List[Tuple[str, int]]:
+        """
+        Chain of builds that led to this one, nearest first, ending at the root.
+
+        Recorded edges answer without a request. Where none is recorded, the
+        build's UpstreamCause is read from its (cached) build JSON and added
+        to the index.
+        """
+        current = (JobNameParser.normalize_job_name(job_name), int(build_number))
+        chain: List[Tuple[str, int]] = []
+        seen = {current}
+        while len(chain) < max_depth:
+            parents = self._upstream_of(*current)
+            if not parents or parents[0] in seen:
+                break
+            current = parents[0]
+            seen.add(current)
+            chain.append(current)
+        return chain
+
+    def find_siblings(self, job_name: str, build_number: int) -> List[Tuple[str, int]]:
+        """Other builds started by the parents of this build"""
+        key = (JobNameParser.normalize_job_name(job_name), int(build_number))
+        siblings: List[Tuple[str, int]] = []
+        for parent in self._upstream_of(*key):
+            if self.build_graph is not None and self.build_graph.has_all_children(
+                *parent
+            ):
+                children = self.build_graph.children(*parent)
+            else:
+                try:
+                    node = self._query_node(*parent)
+                except Exception as e:
+                    logger.debug(f"Could not list children of {parent}: {e}")
+                    continue
+                self._record_graph({parent: node}, [])
+                children = [child.key for child in node.children]
+            siblings.extend(
+                child for child in children if child != key and child not in siblings
+            )
+        return siblings
+
+    def _upstream_of(self, job_name: str, build_number: int) -> List[Tuple[str, int]]:
+        """Parents of a build from the index, else from its UpstreamCause"""
+        if self.build_graph is not None:
+            parents = self.build_graph.parents(job_name, build_number)
+            if parents:
+                return parents
+        try:
+            info = self.connection.get_build_info(job_name, build_number, depth=0)
+        except Exception as e:
+            logger.debug(f"Could not read causes of {job_name}#{build_number}: {e}")
+            return []
+        parents = upstream_causes(info)
+        if parents and self.build_graph is not None:
+            self.build_graph.record_edges(
+                [
+                    (parent_job, parent_build, job_name, build_number)
+                    for parent_job, parent_build in parents
+                ],
+                source=UPSTREAM,
+            )
+        return parents
+
     def list_pipeline_runs(self, parent: Build) -> List[SubBuild]:
         """List pipeline runs using wfapi/runs endpoint (from jenkins_client_old.py)"""
         runs: List[SubBuild] = []
@@ -753,9 +854,13 @@ class SubBuildDiscoverer:
         )
 
         try:
-            response = self.connection.session.get(wfapi_url)
-            response.raise_for_status()
-            runs_data = response.json()
+            runs_data = self._get_optional_endpoint(
+                NO_WFAPI, parent.job_name, parent.build_number, wfapi_url
+            )
+            if runs_data is None:
+                raise SubBuildDiscoveryError(
+                    f"{parent.job_name} does not provide wfapi (not a pipeline job)"
+                )
 
             for run_data in runs_data:
                 run_id = run_data.get("id")
@@ -846,32 +951,15 @@ class SubBuildDiscoverer:
     ) -> List[SubBuild]:
         """Find all failed sub-builds in the hierarchy"""
         try:
+            # The whole tree is traversed: a failure can sit below a running
+            # build, or below a successful one that did not propagate it.
+            # Statuses come from the parents' responses, with no extra requests.
             subbuilds = self.discover_subbuilds(
                 parent_job_name, parent_build_number, max_depth
             )
-            failed_builds = []
-
-            for subbuild in subbuilds:
-                # Get actual build status
-                try:
-                    from .build_manager import BuildManager
-
-                    build_manager = BuildManager(self.connection)
-                    build_info = build_manager.get_build_info(
-                        subbuild.job_name, subbuild.build_number
-                    )
-
-                    if build_info.status in ["FAILURE", "UNSTABLE", "ABORTED"]:
-                        subbuild.status = build_info.status
-                        failed_builds.append(subbuild)
-
-                except Exception as e:
-                    logger.warning(
-                        f"Could not get status for {subbuild.job_name}#{subbuild.build_number}: {e}"
-                    )
-                    # If we can't get status but it was discovered, assume it might be failed
-                    if subbuild.status in ["FAILURE", "UNSTABLE", "ABORTED", "UNKNOWN"]:
-                        failed_builds.append(subbuild)
+            failed_builds = [
+                subbuild for subbuild in subbuilds if subbuild.status in FAILED_STATUSES
+            ]
 
             # Sort by depth (deepest failures first) for better debugging
             failed_builds.sort(key=lambda x: x.depth, reverse=True)
@@ -75,6 +75,9 @@ class MultiJenkinsManager:
         self.active_roots: List[str] = []
         self.settings: Dict[str, Any] = {}
         self._lock = threading.Lock()
+        # Clients are created under a per-instance lock so a slow controller
+        # never holds up callers of another instance
+        self._instance_locks: Dict[str, threading.Lock] = {}
 
         self._load_instances_config()
 
@@ -328,11 +331,34 @@ class MultiJenkinsManager:
                     f"Unknown Jenkins instance: {instance_id}. Available: {available}"
                 )
 
-            # Return cached client or create new one
-            if instance_id not in self.clients:
-                self.clients[instance_id] = self._create_client(instance_id)
+            client = self.clients.get(instance_id)
+            if client is not None:
+                return client
+            instance_lock = self._instance_locks.setdefault(
+                instance_id, threading.Lock()
+            )
 
-            return self.clients[instance_id]
+        # Return cached client or create new one
+        with instance_lock:
+            client = self.clients.get(instance_id)
+            if client is None:
+                client = self._create_client(instance_id)
+                with self._lock:
+                    self.clients[instance_id] = client
+            return client
+
+    def warm_up(self, instance_ids: Optional[List[str]] = None) -> None:
+        """
+        Creates clients and validates their credentials in the background.
+
+        Returns immediately; each instance is checked in its own thread, so a
+        slow or unreachable controller only delays its own first request.
+        """
+        for inst_id in instance_ids or list(self.instances_config.keys()):
+            try:
+                self.get_jenkins_client(inst_id).warm_up()
+            except Exception as e:
+                logger.warning(f"Cannot warm up Jenkins instance {inst_id}: {e}")
 
     def _create_client(self, instance_id: str) -> JenkinsClient:
         """Create a new Jenkins client for the specified instance"""
@@ -355,6 +381,35 @@ class MultiJenkinsManager:
             token=instance_config.token,
             timeout=instance_config.timeout,
             verify_ssl=instance_config.verify_ssl,
+            metadata_ttl=float(self.settings.get("build_metadata_ttl", 5.0)),
+            metadata_cache_dir=(
+                Path(self.settings["build_metadata_dir"])
+                if self.settings.get("build_metadata_dir")
+                else None
+            ),
+            hierarchy_cache_dir=(
+                Path(self.settings["build_hierarchy_dir"])
+                if self.settings.get("build_hierarchy_dir")
+                else None
+            ),
+            build_graph_db=(
+                Path(self.settings["build_graph_db"])
+                if self.settings.get("build_graph_db")
+                else None
+            ),
+            missing_build_ttl=float(self.settings.get("missing_build_ttl", 60.0)),
+            unsupported_endpoint_ttl=float(
+                self.settings.get("unsupported_endpoint_ttl", 3600.0)
+            ),
+            http2=bool(self.settings.get("http2", False)),
+            pool_max_per_host=int(self.settings.get("http_pool_max_per_host", 32)),
+            pool_hosts=int(self.settings.get("http_pool_hosts", 4)),
+            pool_block=bool(self.settings.get("http_pool_block", False)),
+            rate_limit=float(self.settings.get("governor_rate_limit", 0.0)),
+            rate_burst=int(self.settings.get("governor_burst", 20)),
+            max_concurrency=int(self.settings.get("governor_max_concurrency", 16)),
+            min_concurrency=int(self.settings.get("governor_min_concurrency", 2)),
+            latency_target=float(self.settings.get("governor_latency_target", 5.0)),
         )
 
         logger.info(
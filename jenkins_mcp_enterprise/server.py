@@ -244,6 +244,11 @@ def load_config_from_yaml(config_path: str) -> MCPConfig:
         max_size_mb=cache_data.get("max_size_mb", 1000),
         retention_days=cache_data.get("retention_days", 7),
         enable_compression=cache_data.get("compression", True),
+        download_buffer_kb=cache_data.get("download_buffer_kb", 64),
+        hot_tier_mb=cache_data.get("hot_tier_mb", 256),
+        hot_tier_entry_mb=cache_data.get("hot_tier_entry_mb", 16),
+        tail_threshold_mb=cache_data.get("tail_threshold_mb", 512),
+        tail_window_mb=cache_data.get("tail_window_mb", 8),
     )
 
     server_data = config_data.get("server", {})
@@ -0,0 +1,94 @@
+"""In-process request coalescing
+
+This module provides a single-flight group: concurrent callers asking for the
+same key share one execution of the underlying operation instead of each
+running it themselves.
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+from .logging_config import get_component_logger
+
+logger = get_component_logger("single_flight")
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A single in-flight execution and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+def _waiter_error(error: BaseException) -> BaseException:
+    """Copies the leader's exception so each waiter raises its own instance"""
+    try:
+        fresh = copy.copy(error)
+    except Exception:
+        return error
+    fresh.__cause__ = error
+    return fresh
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution
+
+    The first caller for a key runs the function; callers arriving while it is
+    running block until it finishes and receive the same result, or a copy of
+    the same exception. Once a call completes its key is forgotten, so later callers
+    start a fresh execution.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` for ``key``, or wait for the execution already in flight
+
+        Args:
+            key: Identity of the operation
+            fn: Zero-argument callable producing the result
+
+        Returns:
+            The result of the (possibly shared) execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            logger.debug(f"Joining in-flight call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise _waiter_error(call.error)
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Shared call for {key} with {call.waiters} waiters")
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,254 @@
+"""Byte-budgeted in-memory tier for recently used cached logs
+
+Tools tend to hit the same build many times in a row (filter errors, get
+context, search, navigate). The hot tier keeps the decoded text and line
+offsets of recently used logs in memory so whole-log reads skip
+decompression; the split line list is kept too, charged to the same budget,
+so repeated whole-log scans do not split the text again. A log is only admitted on its second whole-log read and only
+if it is below the per-entry size cap; everything else, and every line
+window or line count on a miss, is served from disk through the log's
+memory-mapped line index. Entries are validated against the log's block
+index, which is replaced atomically whenever a log is published or
+extended, so a stale entry is never served.
+"""
+
+import io
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..logging_config import get_component_logger
+from .log_store import LogStoreReader, block_index_path, split_lines
+
+logger = get_component_logger("streaming.hot_tier")
+
+# Logs read once are remembered (not loaded) so a second read can admit them
+_MAX_CANDIDATES = 4096
+
+
+@dataclass
+class HotTierStats:
+    """Counters describing hot tier effectiveness"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    deferred: int = 0  # First whole-log reads, served from disk
+    rejected: int = 0  # Logs above the per-entry cap
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class HotLog:
+    """A fully decoded log held in memory with its line offsets"""
+
+    def __init__(self, data: bytes, line_starts: array):
+        self.data = data
+        self.line_starts = line_starts
+        self._newlines = len(line_starts) - 1
+        self.lines: Optional[List[str]] = None  # Split once, when kept by the tier
+
+    @classmethod
+    def load(cls, reader: LogStoreReader) -> "HotLog":
+        data = reader.read_all()
+        starts = reader.line_starts()
+        if starts is None:
+            # Logs cached without a line index: derive the offsets once
+            starts = array("Q", [0])
+            position = data.find(b"\n")
+            while position != -1:
+                starts.append(position + 1)
+                position = data.find(b"\n", position + 1)
+        return cls(data, starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by this entry"""
+        return len(self.data) + self.line_starts.itemsize * len(self.line_starts)
+
+    @property
+    def line_count(self) -> int:
+        unterminated = self.line_starts[-1] < len(self.data)
+        return self._newlines + (1 if unterminated else 0)
+
+    def read_lines(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Lines ``[start, end)`` (0-based), sliced from memory"""
+        count = self.line_count
+        start = max(0, start)
+        end = count if end is None else min(end, count)
+        if start >= end:
+            return []
+        byte_end = self.line_starts[end] if end <= self._newlines else len(self.data)
+        return split_lines(self.data[self.line_starts[start] : byte_end])
+
+    def open_text(self) -> io.TextIOWrapper:
+        return io.TextIOWrapper(
+            io.BytesIO(self.data), encoding="utf-8", errors="replace", newline="\n"
+        )
+
+
+@dataclass
+class _Entry:
+    version: Tuple[int, int]
+    log: HotLog
+    charged: int  # Bytes accounted for this entry in the tier total
+
+
+class HotLogTier:
+    """LRU cache of ``HotLog`` entries bounded by a byte budget"""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_bytes, max_entry_bytes or max_bytes)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._candidates: "OrderedDict[str, None]" = OrderedDict()
+        self._bytes = 0
+        self._stats = HotTierStats(max_bytes=max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def _version(path: Path) -> Optional[Tuple[int, int]]:
+        """Identity of the published snapshot of a stored log"""
+        try:
+            stat = os.stat(block_index_path(path))
+        except FileNotFoundError:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Path, load: bool = True) -> Optional[HotLog]:
+        """
+        Returns the in-memory copy of a stored log.
+
+        On a miss the log is only loaded if ``load`` is set, it was read
+        before and it fits the per-entry cap. Returns None otherwise; callers
+        then read from disk.
+        """
+        if not self.enabled:
+            return None
+        key = str(path)
+        version = self._version(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry.log
+            self._stats.misses += 1
+            # A log that was hot before it was extended is reloaded straight away
+            reload = load and entry is not None
+            if not reload and not self._admit_locked(key, load):
+                return None
+
+        with LogStoreReader(path) as reader:
+            hot_log = (
+                HotLog.load(reader) if reader.size <= self.max_entry_bytes else None
+            )
+        if hot_log is None or hot_log.nbytes > self.max_entry_bytes:
+            with self._lock:
+                self._drop_locked(key)
+                self._stats.rejected += 1
+            return None
+
+        with self._lock:
+            self._drop_locked(key)
+            self._entries[key] = _Entry(version, hot_log, hot_log.nbytes)
+            self._bytes += hot_log.nbytes
+            self._evict_locked()
+        return hot_log
+
+    def all_lines(self, path: Path) -> Optional[List[str]]:
+        """
+        Every line of a stored log, or None if it is not (yet) held in memory.
+
+        The first call splits the text and keeps the list with the entry,
+        charged to the byte budget, if the entry still fits the per-entry cap;
+        later calls return that same list, which callers must not modify.
+        """
+        hot_log = self.get(path)
+        if hot_log is None:
+            return None
+        lines = hot_log.lines
+        if lines is not None:
+            return lines
+
+        lines = split_lines(hot_log.data)
+        cost = sys.getsizeof(lines) + sum(map(sys.getsizeof, lines))
+        with self._lock:
+            entry = self._entries.get(str(path))
+            if (
+                entry is not None
+                and entry.log is hot_log
+                and hot_log.lines is None
+                and entry.charged + cost <= self.max_entry_bytes
+            ):
+                hot_log.lines = lines
+                entry.charged += cost
+                self._bytes += cost
+                self._evict_locked()
+        return lines
+
+    def _admit_locked(self, key: str, load: bool) -> bool:
+        """Whether a missed log should be loaded now; remembers first reads"""
+        if key in self._candidates:
+            if load:
+                del self._candidates[key]
+                return True
+            self._candidates.move_to_end(key)
+            return False
+        self._candidates[key] = None
+        while len(self._candidates) > _MAX_CANDIDATES:
+            self._candidates.popitem(last=False)
+        if load:
+            self._stats.deferred += 1
+        return False
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.charged
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.charged
+            self._stats.evictions += 1
+            logger.debug(f"Evicted {evicted_key} from hot tier")
+
+    def invalidate(self, path: Path) -> None:
+        """Drops a log from the tier, e.g. after it was extended or removed"""
+        with self._lock:
+            self._drop_locked(str(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._candidates.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit, miss and size metrics"""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            self._stats.bytes = self._bytes
+            stats = asdict(self._stats)
+            stats["hit_rate"] = round(self._stats.hit_rate, 3)
+            return stats
@@ -0,0 +1,529 @@
+"""Seekable block-compressed storage for cached console logs
+
+Logs are stored as a sequence of independently compressed gzip members
+("blocks"). Each block holds up to ``block_size`` bytes of log text and ends
+on a line boundary whenever the line fits. Concatenated gzip members are a
+valid gzip file, so ``zcat`` and ``rg --search-zip`` work on the cache
+directly, while the sidecar block index lets readers seek to any byte or line
+without inflating the blocks in front of it.
+
+Block index layout (``<log>.blocks``): a flat ``array('Q')`` of
+``(stored_offset, text_offset, first_line)`` triples, one per block, followed
+by a sentinel triple holding the stored size, the text size and the total
+number of newlines. Uncompressed logs use the same index with raw blocks.
+
+Line index layout (``<log>.lines``): a flat ``array('Q')`` holding the text
+offset at which each line starts, i.e. 0 followed by the offset after every
+newline. It is written incrementally while the log is stored and
+memory-mapped by readers, so a line-range read costs two lookups plus the
+blocks covering the range.
+
+Both files only ever grow: appending to a log (for running builds) adds
+blocks and line offsets after the existing ones and then republishes the
+small block index atomically. Readers take the block index as their snapshot
+and ignore anything past it. A log that has to be rewritten from scratch is
+stored under a new path instead, since its three files cannot be replaced
+in one atomic step; readers keep the log file open, so they finish reading
+their snapshot even if it is removed meanwhile.
+"""
+
+import gzip
+import io
+import mmap
+import os
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ..exceptions import CacheError
+from ..logging_config import get_component_logger
+
+logger = get_component_logger("streaming.log_store")
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024  # 1MB of log text per block
+COMPRESSED_SUFFIX = ".gz"
+BLOCK_INDEX_SUFFIX = ".blocks"
+LINE_INDEX_SUFFIX = ".lines"
+LINE_INDEX_FLUSH_ENTRIES = 64 * 1024  # Line offsets buffered before hitting disk
+
+
+def block_index_path(path: Path) -> Path:
+    """Return the block index sidecar path for a stored log"""
+    return path.with_name(path.name + BLOCK_INDEX_SUFFIX)
+
+
+def line_index_path(path: Path) -> Path:
+    """Return the line index sidecar path for a stored log"""
+    return path.with_name(path.name + LINE_INDEX_SUFFIX)
+
+
+def publish_log(tmp_path: Path, path: Path) -> None:
+    """
+    Moves a finished log and its sidecars from ``tmp_path`` to ``path``.
+
+    Each file is renamed atomically, but not all three at once, so ``path``
+    must be one that no reader uses yet.
+    """
+    for sidecar in (line_index_path, block_index_path):
+        if sidecar(tmp_path).exists():
+            os.replace(sidecar(tmp_path), sidecar(path))
+    os.replace(tmp_path, path)
+
+
+def is_compressed(path: Path) -> bool:
+    """Whether a stored log uses the compressed block format"""
+    return path.name.endswith(COMPRESSED_SUFFIX)
+
+
+def _decode_line(raw: bytes) -> str:
+    """Decode a raw log line, dropping a trailing carriage return"""
+    if raw.endswith(b"\r"):
+        raw = raw[:-1]
+    return raw.decode("utf-8", errors="replace")
+
+
+def split_lines(data: bytes) -> List[str]:
+    """Decode a run of whole lines; a trailing newline does not start a new line"""
+    raw_lines = data.split(b"\n")
+    if data.endswith(b"\n"):
+        raw_lines.pop()
+    return [_decode_line(raw) for raw in raw_lines]
+
+
+class LogStoreWriter:
+    """
+    Writes a console log in the block format, optionally compressed.
+
+    With ``append=True`` the writer resumes an existing stored log: new blocks
+    are appended after the published ones and the indexes are extended, so the
+    bytes a concurrent reader may be using are never rewritten. Until
+    ``close()`` publishes the new block index, readers keep seeing the old log.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compress: bool = True,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        compress_level: int = 6,
+        append: bool = False,
+    ):
+        self.path = path
+        self.compress = compress
+        self.block_size = block_size
+        self.compress_level = compress_level
+        self.append = append
+
+        self._pending = bytearray()
+        self._index = array("Q")
+        self._stored_offset = 0
+        self._text_offset = 0
+        self._newlines = 0
+        self._closed = False
+        self._line_starts = array("Q")
+
+        if append:
+            self._resume()
+        else:
+            self._file = open(path, "wb")
+            # Line starts are streamed to a temporary sidecar so memory stays flat
+            self._line_index_target = line_index_path(path).with_name(
+                line_index_path(path).name + ".tmp"
+            )
+            self._line_file = open(self._line_index_target, "wb")
+            self._line_starts.append(0)
+
+    def _resume(self) -> None:
+        """Position the writer at the end of the published log"""
+        index_path = block_index_path(self.path)
+        self._line_index_target = line_index_path(self.path)
+        if not index_path.exists() or not self._line_index_target.exists():
+            raise CacheError(f"Cannot append to {self.path}: log indexes are missing")
+
+        self._index.frombytes(index_path.read_bytes())
+        self._stored_offset, self._text_offset, self._newlines = self._index[-3:]
+        del self._index[-3:]
+
+        line_entries = self._newlines + 1
+        if self._line_index_target.stat().st_size < line_entries * 8:
+            raise CacheError(f"Cannot append to {self.path}: line index is incomplete")
+
+        # Drop anything an interrupted append left past the published state
+        self._resume_point = (self._stored_offset, line_entries * 8)
+        self._file = open(self.path, "r+b")
+        self._file.truncate(self._stored_offset)
+        self._file.seek(self._stored_offset)
+        self._line_file = open(self._line_index_target, "r+b")
+        self._line_file.truncate(line_entries * 8)
+        self._line_file.seek(line_entries * 8)
+
+    def __enter__(self) -> "LogStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def text_size(self) -> int:
+        """Number of log bytes stored so far, including resumed content"""
+        return self._text_offset + len(self._pending)
+
+    def write(self, data: bytes) -> None:
+        """Append raw log bytes, emitting complete blocks as they fill up"""
+        self._pending += data
+        while len(self._pending) >= self.block_size:
+            cut = self._pending.rfind(b"\n", 0, self.block_size)
+            cut = cut + 1 if cut != -1 else self.block_size
+            self._flush_block(bytes(self._pending[:cut]))
+            del self._pending[:cut]
+
+    def _flush_block(self, block: bytes) -> None:
+        stored = (
+            gzip.compress(block, compresslevel=self.compress_level, mtime=0)
+            if self.compress
+            else block
+        )
+        self._file.write(stored)
+        self._index.extend((self._stored_offset, self._text_offset, self._newlines))
+        self._record_line_starts(block)
+        self._stored_offset += len(stored)
+        self._text_offset += len(block)
+        self._newlines += block.count(b"\n")
+
+    def _record_line_starts(self, block: bytes) -> None:
+        base = self._text_offset + 1
+        position = block.find(b"\n")
+        while position != -1:
+            self._line_starts.append(base + position)
+            position = block.find(b"\n", position + 1)
+        if len(self._line_starts) >= LINE_INDEX_FLUSH_ENTRIES:
+            self._line_starts.tofile(self._line_file)
+            self._line_starts = array("Q")
+
+    def close(self) -> None:
+        """Flush the final block and publish the indexes"""
+        if self._closed:
+            return
+        if self._pending:
+            self._flush_block(bytes(self._pending))
+            self._pending.clear()
+        self._line_starts.tofile(self._line_file)
+        self._line_file.close()
+        self._file.close()
+        self._closed = True
+
+        if not self.append:
+            os.replace(self._line_index_target, line_index_path(self.path))
+
+        # Publishing the block index is what makes the new content visible
+        self._index.extend((self._stored_offset, self._text_offset, self._newlines))
+        index_path = block_index_path(self.path)
+        tmp_index = index_path.with_name(index_path.name + ".tmp")
+        tmp_index.write_bytes(self._index.tobytes())
+        os.replace(tmp_index, index_path)
+
+    def abort(self) -> None:
+        """Discard everything written by this writer"""
+        if not self._closed:
+            self._file.close()
+            self._line_file.close()
+            self._closed = True
+
+        if self.append:
+            # Roll back to the published state; readers never saw the tail
+            stored_size, line_index_size = self._resume_point
+            os.truncate(self.path, stored_size)
+            os.truncate(self._line_index_target, line_index_size)
+            return
+
+        self.path.unlink(missing_ok=True)
+        self._line_index_target.unlink(missing_ok=True)
+        block_index_path(self.path).unlink(missing_ok=True)
+
+
+class _BlockStream(io.RawIOBase):
+    """Raw binary stream over the decoded blocks of a stored log"""
+
+    def __init__(self, blocks: Iterator[bytes]):
+        self._blocks = blocks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._blocks)
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class LogStoreReader:
+    """Random-access and streaming reader for stored console logs"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            # Held open so the snapshot stays readable if the log is removed
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            raise CacheError(f"Cached log not found: {self.path}") from None
+        self.compressed = is_compressed(self.path)
+        try:
+            self._load_index()
+            self._load_line_index()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "LogStoreReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the log file and the memory-mapped line index"""
+        self._file.close()
+        self._release_line_index()
+
+    def _release_line_index(self) -> None:
+        if self._line_starts is not None:
+            self._line_starts.release()
+            self._line_starts = None
+        if self._line_map is not None:
+            self._line_map.close()
+            self._line_map = None
+
+    def _load_index(self) -> None:
+        index_path = block_index_path(self.path)
+        index = array("Q")
+        self.indexed = index_path.exists()
+        if self.indexed:
+            index.frombytes(index_path.read_bytes())
+        else:
+            index = self._scan_index()
+
+        self._stored_offsets = index[0::3]
+        self._text_offsets = index[1::3]
+        self._first_lines = index[2::3]
+        self.block_count = len(self._stored_offsets) - 1
+        self._line_count: Optional[int] = None
+
+    def _load_line_index(self) -> None:
+        self._line_map: Optional[mmap.mmap] = None
+        self._line_starts: Optional[memoryview] = None
+
+        index_path = line_index_path(self.path)
+        try:
+            with open(index_path, "rb") as fh:
+                size = os.fstat(fh.fileno()).st_size
+                if size == 0 or size % 8:
+                    return
+                self._line_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+
+        # Only the first ``newlines + 1`` entries belong to this snapshot; the
+        # file may already hold offsets from an append published later
+        self._line_starts = memoryview(self._line_map).cast("Q")
+        newlines = self._first_lines[-1]
+        if (
+            len(self._line_starts) < newlines + 1
+            or self._line_starts[newlines] > self.size
+        ):
+            logger.warning(f"Ignoring stale line index for {self.path}")
+            self._release_line_index()
+
+    @property
+    def has_line_index(self) -> bool:
+        """Whether line reads are served from the memory-mapped line index"""
+        return self._line_starts is not None
+
+    def _scan_index(self) -> array:
+        """Build an index for a log stored without a sidecar (legacy caches)"""
+        logger.debug(f"No block index for {self.path}, scanning log")
+        index = array("Q")
+        text_size = 0
+        newlines = 0
+
+        if self.compressed:
+            # Member boundaries are unknown, so the whole file is one block
+            with gzip.open(self.path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(DEFAULT_BLOCK_SIZE), b""):
+                    text_size += len(chunk)
+                    newlines += chunk.count(b"\n")
+            index.extend((0, 0, 0))
+            index.extend((self.path.stat().st_size, text_size, newlines))
+            return index
+
+        with open(self.path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(DEFAULT_BLOCK_SIZE), b""):
+                index.extend((text_size, text_size, newlines))
+                text_size += len(chunk)
+                newlines += chunk.count(b"\n")
+        index.extend((text_size, text_size, newlines))
+        return index
+
+    @property
+    def size(self) -> int:
+        """Size of the log text in bytes"""
+        return self._text_offsets[-1]
+
+    @property
+    def stored_size(self) -> int:
+        """Size of the log on disk in bytes"""
+        return self._stored_offsets[-1]
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting an unterminated final line"""
+        if self._line_starts is not None:
+            newlines = self._first_lines[-1]
+            return newlines + (1 if self._line_starts[newlines] < self.size else 0)
+        if self._line_count is None:
+            newlines = self._first_lines[-1]
+            if self.size and self.read_bytes(self.size - 1, 1) != b"\n":
+                newlines += 1
+            self._line_count = newlines
+        return self._line_count
+
+    def _read_block(self, fh, block: int) -> bytes:
+        start = self._stored_offsets[block]
+        end = self._stored_offsets[block + 1]
+        # Positional reads, so several block iterators can share the file
+        stored = os.pread(fh.fileno(), end - start, start)
+        if not self.compressed or not stored:
+            return stored
+        if not self.indexed:
+            # Unindexed files may hold several gzip members in one "block"
+            return gzip.decompress(stored)
+        return zlib.decompress(stored, wbits=31)
+
+    def iter_blocks(self, first_block: int = 0) -> Iterator[bytes]:
+        """
+        Yield decoded blocks in order, starting at ``first_block``.
+
+        The iterator reads a duplicate of the reader's file handle, so streams
+        returned by ``open_text`` keep working after the reader is closed.
+        """
+        fh = os.fdopen(os.dup(self._file.fileno()), "rb")
+        return self._iter_blocks(fh, first_block)
+
+    def _iter_blocks(self, fh, first_block: int) -> Iterator[bytes]:
+        with fh:
+            for block in range(first_block, self.block_count):
+                yield self._read_block(fh, block)
+
+    def read_bytes(self, start: int, length: int) -> bytes:
+        """Read ``length`` bytes of log text starting at byte ``start``"""
+        start = max(0, start)
+        end = min(self.size, start + max(0, length))
+        if start >= end:
+            return b""
+
+        first_block = bisect_right(self._text_offsets, start) - 1
+        block_start = self._text_offsets[first_block]
+        parts = []
+        collected = 0
+        for data in self.iter_blocks(first_block):
+            parts.append(data)
+            collected += len(data)
+            if block_start + collected >= end:
+                break
+        joined = b"".join(parts)
+        return joined[start - block_start : end - block_start]
+
+    def read_lines(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Read lines ``[start, end)`` (0-based) without inflating earlier blocks"""
+        start = max(0, start)
+        if end is not None and end <= start:
+            return []
+        if self._line_starts is not None:
+            return self._read_indexed_lines(start, end)
+
+        # Pick the last block that begins before line ``start`` starts, then
+        # skip the newlines between the block start and the requested line
+        first_block = max(0, bisect_left(self._first_lines, start) - 1)
+        first_block = min(first_block, max(0, self.block_count - 1))
+        to_skip = start - self._first_lines[first_block]
+        wanted = None if end is None else end - start
+
+        lines: List[str] = []
+        buffer = bytearray()
+        for data in self.iter_blocks(first_block):
+            buffer += data
+            while to_skip:
+                newline = buffer.find(b"\n")
+                if newline == -1:
+                    break
+                del buffer[: newline + 1]
+                to_skip -= 1
+            if to_skip:
+                # The rest of the buffer belongs to a skipped line
+                buffer.clear()
+                continue
+
+            position = 0
+            while wanted is None or len(lines) < wanted:
+                newline = buffer.find(b"\n", position)
+                if newline == -1:
+                    break
+                lines.append(_decode_line(bytes(buffer[position:newline])))
+                position = newline + 1
+            del buffer[:position]
+            if wanted is not None and len(lines) >= wanted:
+                return lines
+
+        if buffer and not to_skip and (wanted is None or len(lines) < wanted):
+            lines.append(_decode_line(bytes(buffer)))
+        return lines
+
+    def _read_indexed_lines(self, start: int, end: Optional[int]) -> List[str]:
+        """Read a line range by seeking straight to its bytes via the line index"""
+        count = self.line_count
+        end = count if end is None else min(end, count)
+        if start >= end:
+            return []
+        newlines = self._first_lines[-1]
+        byte_start = self._line_starts[start]
+        byte_end = self._line_starts[end] if end <= newlines else self.size
+        return split_lines(self.read_bytes(byte_start, byte_end - byte_start))
+
+    def read_all(self) -> bytes:
+        """Read the whole log text of this snapshot"""
+        return b"".join(self.iter_blocks())
+
+    def line_starts(self) -> Optional[array]:
+        """Copy of this snapshot's line start offsets, or None without a line index"""
+        if self._line_starts is None:
+            return None
+        starts = array("Q")
+        starts.frombytes(self._line_starts[: self._first_lines[-1] + 1].cast("B"))
+        return starts
+
+    def iter_lines(self) -> Iterator[str]:
+        """Stream every line of the log"""
+        with self.open_text() as stream:
+            for line in stream:
+                yield line.rstrip("\n").rstrip("\r")
+
+    def open_binary(self) -> io.BufferedReader:
+        """Open a streaming binary view of the decoded log"""
+        return io.BufferedReader(_BlockStream(self.iter_blocks()), DEFAULT_BLOCK_SIZE)
+
+    def open_text(self) -> io.TextIOWrapper:
+        """Open a streaming text view suitable for ``StreamingLogProcessor``"""
+        return io.TextIOWrapper(
+            self.open_binary(), encoding="utf-8", errors="replace", newline="\n"
+        )
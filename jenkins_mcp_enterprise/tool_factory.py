@@ -20,7 +20,7 @@ from .tools.jenkins_tools import GetJobParametersTool
 from .tools.logs import FilterErrorsTool, LogContextTool
 from .tools.ripgrep_tool import NavigateLogTool, RipgrepSearchTool
 from .tools.search import SemanticSearchTool
-from .tools.subbuilds import SubBuildTraversalTool
+from .tools.subbuilds import SubBuildTraversalTool, UpstreamPipelineTool
 
 # Import all tool classes
 from .tools.trigger import AsyncBuildTool, TriggerBuildTool
@@ -92,6 +92,11 @@ class ToolFactory:
         )
         tools[subbuild_tool.name] = subbuild_tool
 
+        upstream_tool = UpstreamPipelineTool(
+            jenkins_client=jenkins_client, multi_jenkins_manager=multi_jenkins_manager
+        )
+        tools[upstream_tool.name] = upstream_tool
+
         log_context_tool = LogContextTool(
             cache_manager=cache_manager,
             jenkins_client=jenkins_client,
@@ -174,7 +179,7 @@ class ToolFactory:
             The number of tools this factory creates
         """
         # Base tools count (without vector search tools)
-        base_count = 9
+        base_count = 10
         
         # Add vector search tools if enabled
         vector_manager = self.container.get_vector_manager()
@@ -1,10 +1,12 @@
 """Common utilities and patterns for MCP tools to eliminate code duplication."""
 
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
 
 from jenkins_mcp_enterprise.base import Build
 from jenkins_mcp_enterprise.cache_manager import CacheManager
 from jenkins_mcp_enterprise.jenkins.jenkins_client import JenkinsClient
+from jenkins_mcp_enterprise.jenkins.log_fetcher import LogWindow
 from jenkins_mcp_enterprise.multi_jenkins_manager import MultiJenkinsManager
 from jenkins_mcp_enterprise.tools.base_tools import ParameterSpec
 
@@ -124,5 +126,48 @@ class LogFetcher:
                 "error": f"Failed to fetch log: {str(e)}",
             }
 
+    def fetch_log_or_tail(
+        self, job_name: str, build_number: int, jenkins_url: str
+    ) -> tuple[Optional[Union[Path, LogWindow]], Optional[Dict[str, Any]]]:
+        """
+        Fetch a build's cached log, or only the tail of a very large one.
+
+        Returns:
+            Tuple of (log_path or LogWindow, error_dict), as for fetch_log
+        """
+        jenkins_client, error = self.resolver.resolve_jenkins_client(
+            jenkins_url, job_name, build_number
+        )
+        if error:
+            return None, error
+
+        build_obj = Build(job_name=job_name, build_number=build_number)
+        try:
+            return (
+                self.cache_manager.fetch_for_analysis(jenkins_client, build_obj),
+                None,
+            )
+        except Exception as e:
+            return None, {
+                "job_name": job_name,
+                "build_number": build_number,
+                "jenkins_url": jenkins_url,
+                "error": f"Failed to fetch log: {str(e)}",
+            }
+
+    def extend_window(
+        self, window: LogWindow, jenkins_url: str, extra_bytes: int
+    ) -> LogWindow:
+        """Extend a tail window backwards, returning it unchanged on failure"""
+        jenkins_client, error = self.resolver.resolve_jenkins_client(
+            jenkins_url, window.job_name, window.build_number
+        )
+        if error:
+            return window
+        try:
+            return jenkins_client.extend_log_window(window, extra_bytes)
+        except Exception:
+            return window
+
 
 from ..utils import find_ripgrep
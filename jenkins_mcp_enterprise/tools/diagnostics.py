@@ -38,6 +38,7 @@ from ..cache_manager import CacheManager
 from ..diagnostic_config.diagnostic_config import get_diagnostic_config
 from ..jenkins.jenkins_client import JenkinsClient
 from ..jenkins.job_name_utils import JobNameParser
+from ..jenkins.log_fetcher import LogWindow
 from ..logging_config import get_component_logger
 from ..streaming.log_processor import StreamingLogProcessor
 from ..vector_manager import VectorManager
@@ -136,7 +137,14 @@ class DiagnoseBuildFailureTool(JenkinsOperationTool):
             key=lambda sb: (sb.job_name, sb.build_number),
         )
 
+        # Children left unexpanded by failure-directed discovery are only counted
+        collapsed = [sb for sb in direct_children if sb.collapsed]
+        if collapsed:
+            parent_node["collapsed_builds"] = len(collapsed)
+
         for child_sb in direct_children:
+            if child_sb.collapsed:
+                continue
             # Generate display text with proper indentation using configuration
             display_config = self.config.config.display.get("hierarchy", {})
             indent_spaces = display_config.get("indent_spaces_per_depth", 4)
@@ -188,9 +196,14 @@ class DiagnoseBuildFailureTool(JenkinsOperationTool):
         return result
 
     def _get_sub_build_information(
-        self, current_build: Build, jenkins_client=None
+        self, current_build: Build, jenkins_client=None, failures_only: bool = False
     ) -> Dict[str, Any]:
-        """Helper to fetch, format, and generate guidance for sub-builds."""
+        """
+        Helper to fetch, format, and generate guidance for sub-builds.
+
+        With ``failures_only`` only failed, running and unknown branches are discovered;
+        other sub-builds are reported as ``collapsed_builds`` counts.
+        """
         sub_build_info_result = {
             "build_tree": {},
             "guidance": "",
@@ -217,7 +230,11 @@ class DiagnoseBuildFailureTool(JenkinsOperationTool):
             # Use current_build object as per JenkinsClient.list_sub_builds signature
             # Use the provided jenkins_client or fallback to default
             client_to_use = jenkins_client if jenkins_client else self.jenkins_client
-            sub_builds_list = client_to_use.list_sub_builds(current_build)
+            sub_builds_list = client_to_use.list_sub_builds(
+                current_build,
+                failures_only=failures_only,
+                expand_running=failures_only,
+            )
         except jenkins.JenkinsException as e:
             error_msg = f"Error fetching sub-builds for {current_build.job_name} #{current_build.build_number}: {str(e)}"
             sub_build_info_result["errors"].append(error_msg)  # Store error
@@ -462,7 +479,11 @@ class DiagnoseBuildFailureTool(JenkinsOperationTool):
 
         # Get sub-build information
         step_start = time.time()
-        sub_build_info = self._get_sub_build_information(build, jenkins_client)
+        # Successful builds get no log analysis, so their subtrees are not
+        # worth discovering either
+        sub_build_info = self._get_sub_build_information(
+            build, jenkins_client, failures_only=params["skip_successful_builds"]
+        )
         logger.info(f"TIMING: Sub-build discovery took {time.time() - step_start:.2f}s")
         result["sub_build_information"] = sub_build_info
 
@@ -505,7 +526,7 @@ class DiagnoseBuildFailureTool(JenkinsOperationTool):
                 build, hierarchy_builds
             )
             result["recommendations"] = self._generate_recommendations(
-                hierarchy_builds, log_chunks
+                hierarchy_builds, log_chunks, jenkins_client.jenkins_url
             )
             
             # Always include semantic highlights - fallback analysis when vector search disabled
@@ -667,7 +688,10 @@ Primary Failure Points:
         return patterns
 
     def _generate_recommendations(
-        self, failure_hierarchy: List[Build], chunks: List
+        self,
+        failure_hierarchy: List[Build],
+        chunks: List,
+        jenkins_url: Optional[str] = None,
     ) -> List[str]:
         """Generate actionable recommendations based on failure patterns"""
         failed_builds = [b for b in failure_hierarchy if b.status == "FAILURE"]
@@ -688,9 +712,9 @@ Primary Failure Points:
         # If we have a main build, try to read its cached log for comprehensive pattern matching
         if main_build:
             # Use cache manager to get the correct path instead of hardcoding
-            cache_path = self.cache_manager.get_path(main_build)
+            cache_path = self.cache_manager.get_path(main_build, jenkins_url)
             try:
-                with open(cache_path, 'r', encoding='utf-8', errors='ignore') as f:
+                with self.cache_manager.open_text(cache_path) as f:
                     cached_log_content = f.read().lower()
                     # Always use cached log content for pattern matching since it's comprehensive
                     all_content = cached_log_content  
@@ -854,7 +878,13 @@ Primary Failure Points:
             max_batch_size, len(builds_to_process)
         )  # batch_size calculated but not used
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Keep the hierarchy's logs from being evicted while they are analysed
+        with (
+            self.cache_manager.pinned(
+                *builds_to_process, jenkins_url=jenkins_client.jenkins_url
+            ),
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
             # Create futures for all builds
             futures = []
             for build in builds_to_process:
@@ -904,16 +934,25 @@ Primary Failure Points:
             # Check if logs are already cached first
             try:
                 cache_start = time.time()
-                log_path = self.cache_manager.fetch(jenkins_client, build)
+                log_source = self.cache_manager.fetch_for_analysis(
+                    jenkins_client, build
+                )
                 logger.info(f"TIMING: Cache fetch for {build.job_name}#{build.build_number} took {time.time() - cache_start:.2f}s")
 
-                # Check if cached file exists and is not empty
-                if log_path.exists() and log_path.stat().st_size > 0:
+                if isinstance(log_source, LogWindow):
+                    # Very large log: analyse its tail without downloading it all
+                    logger.info(
+                        f"Using last {len(log_source.data)} of {log_source.text_size} bytes "
+                        f"for {build.job_name}#{build.build_number}"
+                    )
+                    file_handle = log_source.open_text()
+                elif log_source.exists() and log_source.stat().st_size > 0:
+                    log_path = log_source
                     logger.info(
                         f"Using cached logs for {build.job_name}#{build.build_number}"
                     )
                     # Process directly from file without loading into memory
-                    file_handle = open(log_path, "r", errors="ignore")
+                    file_handle = self.cache_manager.open_text(log_path)
                 else:
                     # Cache miss - need to fetch from Jenkins
                     logger.info(
@@ -921,7 +960,7 @@ Primary Failure Points:
                     )
                     # Re-fetch through cache manager
                     log_path = self.cache_manager.fetch(jenkins_client, build)
-                    file_handle = open(log_path, "r", errors="ignore")
+                    file_handle = self.cache_manager.open_text(log_path)
 
                 logger.info(f"Starting chunk processing for {build.job_name}#{build.build_number}")
                 processing_start = time.time()
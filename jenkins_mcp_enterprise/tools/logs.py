@@ -5,6 +5,7 @@ from ..base import Build, LogContext, ParameterSpec
 from ..cache_manager import CacheManager
 from ..exceptions import ToolExecutionError
 from ..jenkins.jenkins_client import JenkinsClient
+from ..jenkins.log_fetcher import LogWindow
 from ..logging_config import get_component_logger
 from .base_tools import LogOperationTool
 from .common import CommonParameters, JenkinsResolver, LogFetcher
@@ -77,8 +78,7 @@ class LogContextTool(LogOperationTool):
             return error
 
         build_obj = Build(job_name=job_name, build_number=build_number)
-        lines = self.cache_manager.read_lines(log_path)
-        num_total_lines = len(lines)
+        num_total_lines = self.cache_manager.line_count(log_path)
 
         MAX_LINES_TO_RETURN = 500
 
@@ -97,11 +97,13 @@ class LogContextTool(LogOperationTool):
             actual_end_for_slice = actual_start_0_indexed + MAX_LINES_TO_RETURN
             actual_end_for_slice = min(actual_end_for_slice, num_total_lines)
 
-        # Extract lines
+        # Extract lines, decompressing only the blocks that hold them
         if actual_start_0_indexed > actual_end_for_slice:
             selected_lines = []
         else:
-            selected_lines = lines[actual_start_0_indexed:actual_end_for_slice]
+            selected_lines = self.cache_manager.read_line_range(
+                log_path, actual_start_0_indexed, actual_end_for_slice
+            )
 
         # Calculate context end line
         task_actual_end_val = end_line if end_line is not None else num_total_lines
@@ -188,6 +190,9 @@ class FilterErrorsTool(LogOperationTool):
             ),
         ]
 
+    # A tail window may grow to this multiple of its initial size while searching
+    MAX_WINDOW_GROWTH = 4
+
     # Generic error patterns - not specific to any technology
     ERROR_PRESETS = {
         "critical": r"ERROR|FAILED|FATAL|Exception|BUILD FAILED",
@@ -209,16 +214,19 @@ class FilterErrorsTool(LogOperationTool):
         max_results = kwargs.get("max_results", 10)
         score_threshold = kwargs.get("score_threshold", 0.3)
 
-        # Fetch the log file using common fetcher
-        log_path, error = self.log_fetcher.fetch_log(
-            job_name, build_number, jenkins_url
-        )
+        # Reverse search only needs the end of a very large, uncached log
+        if reverse_search:
+            log_source, error = self.log_fetcher.fetch_log_or_tail(
+                job_name, build_number, jenkins_url
+            )
+        else:
+            log_source, error = self.log_fetcher.fetch_log(
+                job_name, build_number, jenkins_url
+            )
         if error:
             return error
 
         build_obj = Build(job_name=job_name, build_number=build_number)
-        all_lines = self.cache_manager.read_lines(log_path)
-        num_total_lines = len(all_lines)
 
         # Handle preset patterns
         original_pattern = pattern
@@ -239,6 +247,16 @@ class FilterErrorsTool(LogOperationTool):
             logger.error(f"Invalid regex pattern '{pattern}': {e}")
             raise ToolExecutionError(f"Invalid regex pattern '{pattern}': {e}") from e
 
+        log_window = None
+        if isinstance(log_source, LogWindow):
+            log_window = self._search_window(
+                log_source, regex, max_results, jenkins_url
+            )
+            all_lines = log_window.lines()
+        else:
+            all_lines = self.cache_manager.read_lines(log_source)
+        num_total_lines = len(all_lines)
+
         # Find all matches with scoring
         all_matches = []
         search_range = (
@@ -312,7 +330,7 @@ class FilterErrorsTool(LogOperationTool):
                 }
                 error_blocks.append(error_block)
 
-        return {
+        result = {
             "build": {
                 "job_name": build_obj.job_name,
                 "build_number": build_obj.build_number,
@@ -325,6 +343,32 @@ class FilterErrorsTool(LogOperationTool):
             "score_threshold": score_threshold,
             "error_blocks": error_blocks,
         }
+        if log_window is not None:
+            result["log_window"] = {
+                "start_byte": log_window.start,
+                "total_bytes": log_window.text_size,
+                "complete": log_window.complete,
+                "note": "Only the end of this log was searched; line numbers are relative to that window",
+            }
+        return result
+
+    def _search_window(
+        self, window: LogWindow, regex: re.Pattern, max_results: int, jenkins_url: str
+    ) -> LogWindow:
+        """Extends a tail window backwards until it holds enough matches"""
+        max_bytes = len(window.data) * self.MAX_WINDOW_GROWTH
+        while not window.complete and len(window.data) < max_bytes:
+            matches = sum(1 for line in window.lines() if regex.search(line))
+            if matches >= max_results:
+                break
+            extra_bytes = min(len(window.data), max_bytes - len(window.data))
+            extended = self.log_fetcher.extend_window(
+                window, jenkins_url, max(extra_bytes, 1)
+            )
+            if extended.start == window.start:
+                break
+            window = extended
+        return window
 
     def _calculate_relevance_score(
         self, line_content: str, line_index: int, total_lines: int, reverse_search: bool
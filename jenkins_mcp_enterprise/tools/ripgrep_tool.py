@@ -9,6 +9,7 @@ from ..cache_manager import CacheManager
 from ..exceptions import ToolExecutionError
 from ..jenkins.jenkins_client import JenkinsClient
 from ..logging_config import get_component_logger
+from ..streaming.log_store import is_compressed
 from ..utils import find_ripgrep
 from .base_tools import LogOperationTool
 from .common import CommonParameters, JenkinsResolver, LogFetcher
@@ -162,6 +163,10 @@ class RipgrepSearchTool(LogOperationTool):
             except ValueError as e:
                 raise ToolExecutionError(f"Invalid line range format: {e}")
 
+        # Cached logs are stored as concatenated gzip members
+        if is_compressed(Path(str(log_path))):
+            cmd.extend(["--search-zip"])
+
         # Add pattern and file
         cmd.extend([pattern, str(log_path)])
 
@@ -211,13 +216,12 @@ class RipgrepSearchTool(LogOperationTool):
         temp_fd, temp_path = tempfile.mkstemp(suffix=".log", prefix="jenkins_range_")
 
         try:
-            with open(log_path, "r", encoding="utf-8", errors="replace") as infile:
-                with os.fdopen(temp_fd, "w", encoding="utf-8") as outfile:
-                    for i, line in enumerate(infile, 1):
-                        if start_line <= i <= end_line:
-                            outfile.write(line)
-                        elif i > end_line:
-                            break
+            lines = self.cache_manager.read_line_range(
+                log_path, max(0, start_line - 1), max(0, end_line)
+            )
+            with os.fdopen(temp_fd, "w", encoding="utf-8") as outfile:
+                for line in lines:
+                    outfile.write(line + "\n")
         except Exception as e:
             os.unlink(temp_path)
             raise ToolExecutionError(f"Failed to extract line range: {e}")
@@ -408,6 +412,8 @@ class NavigateLogTool(LogOperationTool):
 
         # Use ripgrep to find all occurrences with line numbers
         cmd = [rg_path, "-n", "--no-heading", section_pattern, str(log_path)]
+        if is_compressed(Path(str(log_path))):
+            cmd.insert(1, "--search-zip")
 
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -444,15 +450,16 @@ class NavigateLogTool(LogOperationTool):
             target_line = target_match["line_number"]
 
             # Read context around the target
-            all_lines = self.cache_manager.read_lines(log_path)
             start_line = max(1, target_line - context_lines)
-            end_line = min(len(all_lines), target_line + context_lines)
+            window_lines = self.cache_manager.read_line_range(
+                log_path, start_line - 1, target_line + context_lines
+            )
+            end_line = start_line + len(window_lines) - 1
 
             context = []
-            for i in range(start_line - 1, end_line):
-                line_num = i + 1
+            for line_num, line in enumerate(window_lines, start_line):
                 prefix = ">>>" if line_num == target_line else "   "
-                context.append(f"{prefix} {line_num}: {all_lines[i].rstrip()}")
+                context.append(f"{prefix} {line_num}: {line.rstrip()}")
 
             return {
                 "build": {"job_name": job_name, "build_number": build_number},
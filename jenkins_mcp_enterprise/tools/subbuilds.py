@@ -227,3 +227,87 @@ class SubBuildTraversalTool(JenkinsOperationTool):
             return True
 
         return False
+
+
+class UpstreamPipelineTool(JenkinsOperationTool):
+    """Finds the root pipeline and siblings of a build from the reverse build graph"""
+
+    def __init__(self, jenkins_client: JenkinsClient, multi_jenkins_manager=None):
+        super().__init__(
+            jenkins_client=jenkins_client, multi_jenkins_manager=multi_jenkins_manager
+        )
+
+    @property
+    def name(self) -> str:
+        return "find_upstream_pipeline"
+
+    @property
+    def description(self) -> str:
+        return "Finds which pipeline triggered a build: its chain of upstream builds up to the root pipeline, and the sibling builds started by the same parent. Use it to go from a failing downstream job to the pipeline it belongs to. IMPORTANT: jenkins_url is required because jobs are load-balanced across multiple Jenkins servers."
+
+    @property
+    def parameters(self) -> List[ParameterSpec]:
+        return [
+            ParameterSpec(
+                "job_name", str, "Name of the downstream Jenkins job", required=True
+            ),
+            ParameterSpec("build_number", int, "Build number", required=True),
+            ParameterSpec(
+                "jenkins_url",
+                str,
+                "Jenkins instance URL (e.g., 'https://jenkins.example.com'). REQUIRED - jobs are load-balanced across multiple servers.",
+                required=True,
+            ),
+            ParameterSpec(
+                "include_siblings",
+                bool,
+                "Also list the other builds started by the same parent",
+                required=False,
+                default=True,
+            ),
+        ]
+
+    def _execute_impl(self, **kwargs) -> Dict[str, Any]:
+        job_name = JobNameParser.normalize_job_name(kwargs["job_name"])
+        build_number = kwargs["build_number"]
+        jenkins_url = kwargs["jenkins_url"]
+
+        try:
+            instance_id = self.resolve_jenkins_instance(jenkins_url)
+            jenkins_client = self.get_jenkins_client(instance_id)
+        except Exception as e:
+            return {
+                "job_name": job_name,
+                "build_number": build_number,
+                "jenkins_url": jenkins_url,
+                "error": f"Jenkins instance resolution failed: {str(e)}",
+                "instructions": self.get_instance_instructions(),
+            }
+
+        base_url = jenkins_client.jenkins_url.rstrip("/")
+
+        def describe(job: str, number: int) -> Dict[str, Any]:
+            path = JobNameParser.to_jenkins_api_path(job)
+            return {
+                "job_name": job,
+                "build_number": number,
+                "url": f"{base_url}/{path}/{number}/",
+            }
+
+        ancestors = jenkins_client.trace_upstream(job_name, build_number)
+        result = {
+            "build": describe(job_name, build_number),
+            "root": describe(*ancestors[-1]) if ancestors else None,
+            "upstream_chain": [describe(*ancestor) for ancestor in ancestors],
+        }
+        if kwargs.get("include_siblings", True):
+            result["siblings"] = [
+                describe(*sibling)
+                for sibling in jenkins_client.find_siblings(job_name, build_number)
+            ]
+        if not ancestors:
+            result["guidance"] = (
+                f"{job_name} #{build_number} was not triggered by another build; "
+                "it is a root pipeline itself."
+            )
+        return result
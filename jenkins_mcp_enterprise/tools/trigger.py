@@ -137,7 +137,7 @@ class AsyncBuildTool(JenkinsOperationTool):
         build = jenkins_client.trigger_build(job_name, params)
 
         # Get cache path for the build
-        cache_path = str(self.cache_manager.get_path(build))
+        cache_path = str(self.cache_manager.get_path(build, jenkins_client.jenkins_url))
 
         return {
             "job_name": build.job_name,
@@ -1,8 +1,13 @@
 """Common utility functions used across the codebase to eliminate duplication."""
 
+import hashlib
 import os
+import re
 import shutil
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Optional
+from urllib.parse import urlparse
+
+DEFAULT_INSTANCE_KEY = "default"
 
 
 def deduplicate_by_representation(
@@ -43,3 +48,21 @@ def find_ripgrep() -> str:
                 rg_path = path
                 break
     return rg_path
+
+
+def instance_key(jenkins_url: Optional[str]) -> str:
+    """
+    Derives a stable cache namespace for a Jenkins instance.
+
+    The key is a readable host slug plus a short hash of the normalized URL, so
+    every process and replica talking to the same server shares one namespace.
+    """
+    if not jenkins_url:
+        return DEFAULT_INSTANCE_KEY
+    parsed = urlparse(jenkins_url.strip())
+    netloc = (parsed.netloc or parsed.path).lower()
+    path = parsed.path.rstrip("/") if parsed.netloc else ""
+    normalized = f"{netloc}{path}"
+    slug = re.sub(r"[^a-z0-9.-]+", "_", normalized).strip("_")[:48]
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{digest}"
@@ -465,7 +465,8 @@ class QdrantVectorManager:
                 return
             try:
                 log_path = self.cache_manager.fetch(self.jenkins_client, build)
-                log_text_to_process = log_path.read_text(errors="ignore")
+                with self.cache_manager.open_text(log_path) as log_file:
+                    log_text_to_process = log_file.read()
             except Exception as e:
                 logger.error(
                     f"Failed to fetch and read log for {build.job_name} #{build.build_number}: {e}"
@@ -0,0 +1,160 @@
+"""Fake Jenkins connection and build JSON shared by the discovery tests"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import jenkins
+import requests
+
+from jenkins_mcp_enterprise.config import JenkinsConfig
+from jenkins_mcp_enterprise.exceptions import BuildNotFoundError
+from jenkins_mcp_enterprise.jenkins.build_graph import UPSTREAM_CAUSE
+from jenkins_mcp_enterprise.jenkins.negative_cache import NegativeCache
+
+URL = "https://jenkins.example.com"
+
+
+class FakeResponse:
+    def __init__(self, status: int, payload=None):
+        self.status_code = status
+        self.payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """
+    Serves build JSON by URL path and records every request.
+
+    A route maps a path to its JSON payload, or to a status code for an error
+    response; tests may change ``routes`` as builds progress.
+    """
+
+    def __init__(self, routes: Dict[str, object]):
+        self.routes = routes
+        self.requests: List[Tuple[str, Optional[dict]]] = []
+        self.paths: List[str] = []
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        path = url[len(URL) :]
+        self.requests.append((url, params))
+        self.paths.append(path)
+        payload = self.routes.get(path, 404)
+        if isinstance(payload, int):
+            return FakeResponse(payload)
+        return FakeResponse(200, payload)
+
+
+class SlowSession(FakeSession):
+    """Delays chosen paths and records when each request started and finished"""
+
+    def __init__(self, routes: Dict[str, object], delays: Dict[str, float]):
+        super().__init__(routes)
+        self.delays = delays
+        self.started: Dict[str, float] = {}
+        self.finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        path = url[len(URL) :]
+        with self._lock:
+            self.started[path] = time.monotonic()
+        time.sleep(self.delays.get(path, 0.0))
+        response = super().get(url, params=params, timeout=timeout, **kwargs)
+        with self._lock:
+            self.finished[path] = time.monotonic()
+        return response
+
+
+class FakeConnection:
+    """
+    Connection stand-in around a ``FakeSession``.
+
+    ``get_build_info`` reports every build as successful, unless ``existing``
+    is given and the build is not in it. ``causes`` lists the upstream builds
+    a build reports through its UpstreamCause.
+    """
+
+    def __init__(
+        self,
+        session: FakeSession,
+        existing: Optional[Iterable[Tuple[str, int]]] = None,
+        causes: Optional[Dict[Tuple[str, int], List[Tuple[str, int]]]] = None,
+    ):
+        self.config = JenkinsConfig(url=URL, username="u")
+        self.session = session
+        self.negative_cache = NegativeCache()
+        self.existing = None if existing is None else set(existing)
+        self.causes = causes or {}
+        self.build_info_calls: List[tuple] = []
+
+    def get_build_info(self, job_name, build_number, depth=1):
+        self.build_info_calls.append((job_name, build_number))
+        if self.existing is not None and (job_name, build_number) not in self.existing:
+            raise jenkins.JenkinsException("does not exist")
+        upstream = self.causes.get((job_name, build_number), [])
+        return {
+            "result": "SUCCESS",
+            "building": False,
+            "url": f"{URL}/job/{job_name}/{build_number}/",
+            "actions": [
+                {
+                    "causes": [
+                        {
+                            "_class": UPSTREAM_CAUSE,
+                            "upstreamProject": job,
+                            "upstreamBuild": number,
+                        }
+                        for job, number in upstream
+                    ]
+                }
+            ],
+        }
+
+
+class RecordingFanout:
+    """Answers batched build lookups and records each batch; "gone" is missing"""
+
+    def __init__(self):
+        self.batches: List[tuple] = []
+
+    def gather_build_info(self, builds, depth=1):
+        self.batches.append((list(builds), depth))
+        return [
+            (
+                BuildNotFoundError(f"{job} #{number}")
+                if job == "gone"
+                else {"result": "UNSTABLE", "url": f"{URL}/job/{job}/{number}/"}
+            )
+            for job, number in builds
+        ]
+
+
+def triggered(job: str, number: int, result=None, building=False) -> Dict:
+    """A child reference as listed in a parent's ``triggeredBuilds``"""
+    return {
+        "number": number,
+        "result": result,
+        "building": building,
+        "url": f"{URL}/job/{job}/{number}/",
+    }
+
+
+def build(result="SUCCESS", building=False, children=()) -> Dict:
+    """Freestyle build JSON that triggered ``children``"""
+    return {
+        "_class": "hudson.model.FreeStyleBuild",
+        "result": result,
+        "building": building,
+        "actions": [{"triggeredBuilds": list(children)}, {}],
+    }
+
+
+def path(job: str, number: int) -> str:
+    return f"/job/{job}/{number}/api/json"
@@ -0,0 +1,173 @@
+"""Tests for the asyncio Jenkins client against a mock transport"""
+
+import asyncio
+import gzip
+import io
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+import pytest
+
+from jenkins_mcp_enterprise.config import JenkinsConfig
+from jenkins_mcp_enterprise.exceptions import BuildNotFoundError
+from jenkins_mcp_enterprise.jenkins.async_client import AsyncFanout, AsyncJenkinsClient
+from jenkins_mcp_enterprise.jenkins.build_metadata_cache import BuildMetadataCache
+from jenkins_mcp_enterprise.jenkins.governor import RequestGovernor
+from jenkins_mcp_enterprise.jenkins.negative_cache import (
+    MISSING_BUILD,
+    NO_WFAPI,
+    NegativeCache,
+)
+
+URL = "https://jenkins.example.com"
+LOG = b"".join(b"step %d\n" % i for i in range(1000))
+
+
+class FakeJenkins:
+    """Answers a handful of Jenkins endpoints and records requested paths"""
+
+    def __init__(self, builds: int = 200, delay: float = 0.0):
+        self.builds = builds
+        self.delay = delay
+        self.paths: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self.route(request)
+        finally:
+            self.in_flight -= 1
+
+    def route(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        parts = path.strip("/").split("/")
+        if path == "/queue/api/json":
+            return httpx.Response(200, json={"items": [{"id": 7}]})
+        if parts[:2] != ["job", "app"] or int(parts[2]) > self.builds:
+            return httpx.Response(404)
+        number = int(parts[2])
+        suffix = "/".join(parts[3:])
+        if suffix == "api/json":
+            return httpx.Response(
+                200,
+                json={
+                    "number": number,
+                    "result": "FAILURE",
+                    "building": False,
+                    "url": f"{URL}/job/app/{number}/",
+                },
+            )
+        if suffix == "logText/progressiveText":
+            start = int(request.url.params["start"])
+            return httpx.Response(
+                200,
+                content=gzip.compress(LOG[start:]),
+                headers={"Content-Encoding": "gzip", "X-Text-Size": str(len(LOG))},
+            )
+        return httpx.Response(404)
+
+
+def make_client(jenkins: FakeJenkins) -> AsyncJenkinsClient:
+    config = JenkinsConfig(url=URL, username="u", token="t")
+    return AsyncJenkinsClient(config, transport=httpx.MockTransport(jenkins))
+
+
+class TestAsyncJenkinsClient:
+    """Coroutine fan-outs share one pool and the metadata caches"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_runs_concurrently_with_bounded_requests(self):
+        jenkins = FakeJenkins(delay=0.01)
+        async with make_client(jenkins) as client:
+            builds = [("app", n) for n in range(1, 201)]
+            results = await client.gather_build_info(builds, concurrency=50)
+
+        assert [info["number"] for info in results] == list(range(1, 201))
+        assert 1 < jenkins.max_in_flight <= 50
+
+    @pytest.mark.asyncio
+    async def test_completed_builds_are_cached_and_coalesced(self):
+        jenkins = FakeJenkins(delay=0.01)
+        async with make_client(jenkins) as client:
+            await asyncio.gather(*(client.get_build_info("app", 1) for _ in range(10)))
+            build = await client.get_build("app", 1)
+
+        assert build.status == "FAILURE"
+        assert jenkins.paths == ["/job/app/1/api/json"]
+
+    @pytest.mark.asyncio
+    async def test_missing_build_is_remembered(self):
+        jenkins = FakeJenkins(builds=5)
+        async with make_client(jenkins) as client:
+            results = await client.gather_build_info([("app", 9), ("app", 9)])
+            assert all(isinstance(r, BuildNotFoundError) for r in results)
+            assert client.negative_cache.is_known(MISSING_BUILD, "app", 9)
+
+    @pytest.mark.asyncio
+    async def test_absent_wfapi_marks_job_once(self):
+        jenkins = FakeJenkins()
+        async with make_client(jenkins) as client:
+            assert await client.get_wfapi("app", 1) is None
+            assert await client.get_wfapi("app", 2) is None
+            assert client.negative_cache.is_known(NO_WFAPI, "app")
+
+        assert jenkins.paths.count("/job/app/2/wfapi/describe") == 0
+
+    @pytest.mark.asyncio
+    async def test_progressive_log_is_decoded_while_streaming(self):
+        async with make_client(FakeJenkins()) as client:
+            sink = io.BytesIO()
+            download = await client.download_progressive_log("app", 3, sink, start=10)
+            queue = await client.get_queue_info()
+
+        assert sink.getvalue() == LOG[10:]
+        assert download.consistent
+        assert download.transfer.content_encoding == "gzip"
+        assert download.transfer.wire_bytes < download.transfer.decoded_bytes
+        assert queue == [{"id": 7}]
+
+
+class TestAsyncFanout:
+    """Synchronous callers run coroutine fan-outs on a private loop"""
+
+    @pytest.fixture
+    def connection(self):
+        return SimpleNamespace(
+            config=JenkinsConfig(url=URL, username="u", token="t"),
+            build_metadata=BuildMetadataCache(URL),
+            negative_cache=NegativeCache(),
+            governor=RequestGovernor(),
+        )
+
+    def test_blocking_gather_shares_the_connection_caches(self, connection):
+        jenkins = FakeJenkins(builds=3)
+        fanout = AsyncFanout(connection, transport=httpx.MockTransport(jenkins))
+        try:
+            results = fanout.gather_build_info([("app", 1), ("app", 2), ("app", 9)])
+            again = fanout.gather_build_info([("app", 1)])
+        finally:
+            fanout.close()
+
+        assert [info["number"] for info in results[:2]] == [1, 2]
+        assert isinstance(results[2], BuildNotFoundError)
+        assert again[0]["number"] == 1
+        assert jenkins.paths.count("/job/app/1/api/json") == 1
+        assert connection.negative_cache.is_known(MISSING_BUILD, "app", 9)
+
+    @pytest.mark.asyncio
+    async def test_usable_from_code_running_on_an_event_loop(self, connection):
+        # Tools call discovery synchronously from the MCP server's loop
+        jenkins = FakeJenkins()
+        fanout = AsyncFanout(connection, transport=httpx.MockTransport(jenkins))
+        try:
+            results = fanout.gather_build_info([("app", 1), ("app", 2)])
+        finally:
+            fanout.close()
+
+        assert [info["number"] for info in results] == [1, 2]
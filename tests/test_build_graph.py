@@ -0,0 +1,169 @@
+"""Tests for the reverse build-graph index and upstream lookups"""
+
+from typing import Dict
+
+import pytest
+
+from jenkins_mcp_enterprise.jenkins.build_graph import (
+    UPSTREAM_CAUSE,
+    BuildGraphIndex,
+    upstream_causes,
+)
+from jenkins_mcp_enterprise.jenkins.subbuild_discoverer import SubBuildDiscoverer
+from jenkins_mcp_enterprise.tools.subbuilds import UpstreamPipelineTool
+
+from .discovery_doubles import (
+    URL,
+    FakeConnection,
+    FakeSession,
+    build,
+    path,
+    triggered,
+)
+
+
+@pytest.fixture
+def release_routes() -> Dict[str, Dict]:
+    # release#7 -> (tests#3, deploy#4); tests#3 -> (unit#10, it#11)
+    return {
+        path("release", 7): build(
+            "FAILURE", children=[triggered("tests", 3), triggered("deploy", 4)]
+        ),
+        path("tests", 3): build(
+            "FAILURE", children=[triggered("unit", 10), triggered("it", 11)]
+        ),
+        path("deploy", 4): build("FAILURE"),
+        path("unit", 10): build("FAILURE"),
+        path("it", 11): build("FAILURE"),
+    }
+
+
+class TestBuildGraphIndex:
+    """Parent and child queries over recorded edges"""
+
+    def test_queries(self):
+        graph = BuildGraphIndex(URL)
+        graph.record_children("release", 7, [("tests", 3), ("deploy", 4)])
+        graph.record_children("tests", 3, [("unit", 10), ("it", 11)])
+
+        assert graph.parents("it", 11) == [("tests", 3)]
+        assert graph.children("tests", 3) == [("it", 11), ("unit", 10)]
+        assert graph.has_all_children("tests", 3)
+        assert not graph.has_all_children("it", 11)
+        assert graph.stats() == {"edges": 4, "expanded_builds": 2}
+
+    def test_recording_twice_keeps_one_edge(self):
+        graph = BuildGraphIndex(URL)
+        graph.record_edges([("a", 1, "b", 2)])
+        graph.record_edges([("a", 1, "b", 2)])
+        assert graph.stats()["edges"] == 1
+
+    def test_database_file_is_shared_per_instance(self, tmp_path):
+        db_path = tmp_path / "graph.sqlite"
+        BuildGraphIndex(URL, db_path=db_path).record_edges([("a", 1, "b", 2)])
+
+        assert BuildGraphIndex(URL, db_path=db_path).parents("b", 2) == [("a", 1)]
+        other = BuildGraphIndex("https://other.example.com", db_path=db_path)
+        assert other.parents("b", 2) == []
+
+    def test_upstream_causes(self):
+        info = {
+            "actions": [
+                {"causes": [{"_class": "hudson.model.Cause$UserIdCause"}]},
+                {
+                    "causes": [
+                        {
+                            "_class": UPSTREAM_CAUSE,
+                            "upstreamProject": "folder/release",
+                            "upstreamBuild": 7,
+                        }
+                    ]
+                },
+                {},
+            ]
+        }
+        assert upstream_causes(info) == [("folder/release", 7)]
+
+
+class TestUpstreamLookups:
+    """Leaf-to-root lookups from recorded edges or UpstreamCause"""
+
+    def test_discovered_edges_answer_without_requests(self, release_routes):
+        session = FakeSession(release_routes)
+        connection = FakeConnection(session)
+        discoverer = SubBuildDiscoverer(connection, build_graph=BuildGraphIndex(URL))
+        discoverer.discover_subbuilds("release", 7)
+        session.paths.clear()
+
+        assert discoverer.trace_upstream("it", 11) == [("tests", 3), ("release", 7)]
+        assert discoverer.find_siblings("it", 11) == [("unit", 10)]
+        assert session.paths == []
+        # Only the root is asked whether something triggered it
+        assert connection.build_info_calls == [("release", 7)]
+
+    def test_upstream_cause_fills_unknown_edges(self, release_routes):
+        session = FakeSession(release_routes)
+        connection = FakeConnection(
+            session,
+            causes={("it", 11): [("tests", 3)], ("tests", 3): [("release", 7)]},
+        )
+        graph = BuildGraphIndex(URL)
+        discoverer = SubBuildDiscoverer(connection, build_graph=graph)
+
+        assert discoverer.trace_upstream("it", 11) == [("tests", 3), ("release", 7)]
+        assert graph.parents("tests", 3) == [("release", 7)]
+
+        # The parent's children are listed once, then come from the index
+        assert discoverer.find_siblings("it", 11) == [("unit", 10)]
+        assert discoverer.find_siblings("unit", 10) == [("it", 11)]
+        assert session.paths == [path("tests", 3)]
+
+    def test_cycles_do_not_loop(self):
+        graph = BuildGraphIndex(URL)
+        graph.record_edges([("a", 1, "b", 1), ("b", 1, "a", 1)])
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(FakeSession({})), build_graph=graph
+        )
+        assert discoverer.trace_upstream("a", 1) == [("b", 1)]
+
+    def test_running_parent_children_are_listed_again(self, release_routes):
+        release_routes[path("tests", 3)] = build(None, True, [triggered("unit", 10)])
+        session = FakeSession(release_routes)
+        graph = BuildGraphIndex(URL)
+        discoverer = SubBuildDiscoverer(FakeConnection(session), build_graph=graph)
+        discoverer.discover_subbuilds("release", 7)
+        assert not graph.has_all_children("tests", 3)
+
+        # tests#3 starts another child after discovery
+        release_routes[path("tests", 3)] = build(
+            "FAILURE", children=[triggered("unit", 10), triggered("it", 11)]
+        )
+        session.paths.clear()
+
+        assert discoverer.find_siblings("unit", 10) == [("it", 11)]
+        assert session.paths == [path("tests", 3)]
+        assert graph.has_all_children("tests", 3)
+
+    def test_tool_reports_root_chain_and_siblings(self, release_routes):
+        session = FakeSession(release_routes)
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(session), build_graph=BuildGraphIndex(URL)
+        )
+        discoverer.discover_subbuilds("release", 7)
+
+        class Client:
+            jenkins_url = URL
+            trace_upstream = discoverer.trace_upstream
+            find_siblings = discoverer.find_siblings
+
+        tool = UpstreamPipelineTool(jenkins_client=Client())
+        result = tool.execute(job_name="it", build_number=11, jenkins_url=URL)
+
+        data = result.unwrap()
+        assert data["root"] == {
+            "job_name": "release",
+            "build_number": 7,
+            "url": f"{URL}/job/release/7/",
+        }
+        assert [b["job_name"] for b in data["upstream_chain"]] == ["tests", "release"]
+        assert [b["job_name"] for b in data["siblings"]] == ["unit"]
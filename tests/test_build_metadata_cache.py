@@ -0,0 +1,125 @@
+"""Tests for the build metadata cache"""
+
+import threading
+import time
+
+import pytest
+
+from jenkins_mcp_enterprise.jenkins.build_metadata_cache import BuildMetadataCache
+
+URL = "https://jenkins.example.com"
+
+
+class CountingLoader:
+    """Serves build JSON and counts how often Jenkins would have been asked"""
+
+    def __init__(self, info):
+        self.info = info
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return dict(self.info)
+
+
+COMPLETED = {"result": "FAILURE", "building": False, "url": f"{URL}/job/app/1/"}
+RUNNING = {"result": None, "building": True, "url": f"{URL}/job/app/2/"}
+
+
+class TestBuildMetadataCache:
+    """Immutable completed builds, TTL for running builds, persistence"""
+
+    def test_completed_build_is_fetched_once(self):
+        cache = BuildMetadataCache(URL)
+        loader = CountingLoader(COMPLETED)
+
+        for _ in range(5):
+            assert cache.get("app", 1, 1, loader)["result"] == "FAILURE"
+
+        assert loader.calls == 1
+        assert cache.stats()["hits"] == 4
+
+    def test_deeper_entry_answers_shallower_request(self):
+        cache = BuildMetadataCache(URL)
+        loader = CountingLoader(COMPLETED)
+        cache.get("app", 1, 1, loader)
+        cache.get("app", 1, 0, loader)
+        assert loader.calls == 1
+
+        cache.get("app", 1, 2, loader)
+        assert loader.calls == 2
+
+    def test_running_build_expires_after_ttl(self):
+        cache = BuildMetadataCache(URL, running_ttl=0.05)
+        loader = CountingLoader(RUNNING)
+
+        cache.get("app", 2, 1, loader)
+        cache.get("app", 2, 1, loader)
+        assert loader.calls == 1
+
+        time.sleep(0.1)
+        loader.info = COMPLETED
+        assert cache.get("app", 2, 1, loader)["result"] == "FAILURE"
+        assert loader.calls == 2
+
+    def test_zero_ttl_never_caches_running_builds(self):
+        cache = BuildMetadataCache(URL, running_ttl=0)
+        loader = CountingLoader(RUNNING)
+        cache.get("app", 2, 1, loader)
+        cache.get("app", 2, 1, loader)
+        assert loader.calls == 2
+
+    def test_concurrent_misses_share_one_request(self):
+        cache = BuildMetadataCache(URL)
+        loader = CountingLoader(COMPLETED)
+
+        def slow_loader():
+            time.sleep(0.1)
+            return loader()
+
+        threads = [
+            threading.Thread(target=cache.get, args=("app", 1, 1, slow_loader))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert loader.calls == 1
+
+    def test_completed_builds_persist_across_instances(self, tmp_path):
+        loader = CountingLoader(COMPLETED)
+        BuildMetadataCache(URL, persist_dir=tmp_path).get("folder/app", 1, 1, loader)
+        BuildMetadataCache(URL, persist_dir=tmp_path).get("folder/app", 1, 1, loader)
+
+        other = BuildMetadataCache("https://other.example.com", persist_dir=tmp_path)
+        other.get("folder/app", 1, 1, loader)
+
+        assert loader.calls == 2
+
+    def test_running_builds_are_not_persisted(self, tmp_path):
+        loader = CountingLoader(RUNNING)
+        BuildMetadataCache(URL, persist_dir=tmp_path).get("app", 2, 1, loader)
+        BuildMetadataCache(URL, persist_dir=tmp_path).get("app", 2, 1, loader)
+        assert loader.calls == 2
+
+    def test_invalidate_forgets_build(self, tmp_path):
+        cache = BuildMetadataCache(URL, persist_dir=tmp_path)
+        loader = CountingLoader(COMPLETED)
+        cache.get("app", 1, 1, loader)
+        cache.invalidate("app", 1)
+        cache.get("app", 1, 1, loader)
+        assert loader.calls == 2
+
+    def test_loader_errors_are_not_cached(self):
+        cache = BuildMetadataCache(URL)
+
+        def failing_loader():
+            raise RuntimeError("404")
+
+        with pytest.raises(RuntimeError):
+            cache.get("app", 1, 1, failing_loader)
+        loader = CountingLoader(COMPLETED)
+        cache.get("app", 1, 1, loader)
+        assert loader.calls == 1
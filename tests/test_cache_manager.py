@@ -0,0 +1,494 @@
+"""Tests for the persistent console log cache"""
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from jenkins_mcp_enterprise.base import Build
+from jenkins_mcp_enterprise.cache_manager import MANIFEST_NAME, CacheManager
+from jenkins_mcp_enterprise.config import CacheConfig
+from jenkins_mcp_enterprise.jenkins.log_fetcher import (
+    LogSizeProbe,
+    LogWindow,
+    ProgressiveDownload,
+)
+from jenkins_mcp_enterprise.streaming.log_store import LogStoreReader
+from jenkins_mcp_enterprise.utils import instance_key
+
+
+class FakeJenkinsClient:
+    """Minimal stand-in for JenkinsClient serving progressiveText semantics"""
+
+    def __init__(self, jenkins_url: str = "https://jenkins.example.com/"):
+        self.jenkins_url = jenkins_url
+        self.logs: Dict[Tuple[str, int], str] = {}
+        self.building: Dict[Tuple[str, int], bool] = {}
+        self.console_calls = 0
+        self.bytes_served = 0
+        self.probe_calls = 0
+
+    def add_build(self, job_name: str, build_number: int, log: str, building=False):
+        self.logs[(job_name, build_number)] = log
+        self.building[(job_name, build_number)] = building
+
+    def download_progressive_log(
+        self, job_name, build_number, sink, start=0, chunk_size=65536
+    ):
+        self.console_calls += 1
+        data = self.logs[(job_name, build_number)].encode("utf-8")
+        # Jenkins restarts from the beginning when start is past the end
+        body = data[start:] if start <= len(data) else data
+        for offset in range(0, len(body), chunk_size):
+            sink.write(body[offset : offset + chunk_size])
+        self.bytes_served += len(body)
+        return ProgressiveDownload(
+            start=start,
+            bytes_written=len(body),
+            text_size=len(data),
+            more_data=self.building[(job_name, build_number)],
+        )
+
+    def probe_log_size(self, job_name, build_number):
+        self.probe_calls += 1
+        return LogSizeProbe(
+            text_size=len(self.logs[(job_name, build_number)].encode("utf-8")),
+            more_data=self.building[(job_name, build_number)],
+        )
+
+    def fetch_log_tail(self, job_name, build_number, max_bytes):
+        data = self.logs[(job_name, build_number)].encode("utf-8")
+        start = max(0, len(data) - max_bytes)
+        self.bytes_served += len(data) - start
+        return LogWindow(job_name, build_number, start, len(data), data[start:])
+
+
+class AnnotatedJenkinsClient(FakeJenkinsClient):
+    """Serves logs whose ConsoleNotes are stripped from the progressiveText body"""
+
+    NOTE = "\x1b[8mha:////4LZWr2x+notes\x1b[0m"
+
+    def download_progressive_log(
+        self, job_name, build_number, sink, start=0, chunk_size=65536
+    ):
+        self.console_calls += 1
+        raw = self.logs[(job_name, build_number)].encode("utf-8")
+        body = raw[start:] if start <= len(raw) else raw
+        body = body.replace(self.NOTE.encode("utf-8"), b"")
+        sink.write(body)
+        self.bytes_served += len(body)
+        return ProgressiveDownload(
+            start=start,
+            bytes_written=len(body),
+            text_size=len(raw),
+            more_data=self.building[(job_name, build_number)],
+        )
+
+
+@pytest.fixture
+def cache_config(tmp_path) -> CacheConfig:
+    return CacheConfig(base_dir=tmp_path / "cache")
+
+
+class RecordingVectorManager:
+    """Records which builds had their vector data deleted"""
+
+    vector_search_disabled = True
+
+    def __init__(self):
+        self.deleted: List[str] = []
+
+    def delete_build_data(self, build: Build) -> None:
+        self.deleted.append(f"{build.job_name}:{build.build_number}")
+
+
+@pytest.fixture
+def client() -> FakeJenkinsClient:
+    client = FakeJenkinsClient()
+    client.add_build("folder/my job", 7, "line one\nline two\n")
+    return client
+
+
+class TestCacheManager:
+    """Layout, manifest and cross-restart behaviour of the log cache"""
+
+    def test_instance_key_is_stable_and_normalized(self):
+        assert instance_key("https://Jenkins.example.com/") == instance_key(
+            "https://jenkins.example.com"
+        )
+        assert instance_key("https://a.example.com") != instance_key(
+            "https://b.example.com"
+        )
+
+    def test_completed_build_survives_restart(self, cache_config, client):
+        build = Build(job_name="folder/my job", build_number=7)
+        first = CacheManager(cache_config).fetch(client, build)
+        second = CacheManager(cache_config).fetch(client, build)
+
+        assert first == second
+        assert client.console_calls == 1
+        assert CacheManager(cache_config).read_lines(second) == ["line one", "line two"]
+
+    def test_layout_is_keyed_by_instance_job_and_build(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+        log_path = manager.fetch(client, build)
+
+        relative = log_path.relative_to(manager.cache_dir)
+        assert relative.parts[0] == instance_key(client.jenkins_url)
+        assert relative.parts[1:4] == ("folder", "my%20job", "7")
+        assert (log_path.parent / MANIFEST_NAME).exists()
+
+        manifest = manager.get_manifest(build, client.jenkins_url)
+        assert manifest.complete
+        assert manifest.text_size == len("line one\nline two\n")
+
+    def test_running_build_is_fetched_again(self, cache_config, client):
+        client.add_build("running", 1, "partial\n", building=True)
+        manager = CacheManager(cache_config)
+        build = Build(job_name="running", build_number=1)
+
+        manager.fetch(client, build)
+        client.add_build("running", 1, "partial\nfinished\n", building=False)
+        log_path = manager.fetch(client, build)
+
+        assert client.console_calls == 2
+        assert manager.read_lines(log_path) == ["partial", "finished"]
+
+    def test_running_build_appends_only_new_bytes(self, cache_config, client):
+        build = Build(job_name="running", build_number=1)
+        manager = CacheManager(cache_config)
+        log = "step 1\nstep 2 is half"
+        client.add_build("running", 1, log, building=True)
+        manager.fetch(client, build)
+
+        log += " done\nstep 3\n"
+        client.add_build("running", 1, log, building=True)
+        manager.fetch(client, build)
+        manifest = manager.get_manifest(build, client.jenkins_url)
+        assert not manifest.complete
+        assert manifest.progressive_offset == len(log)
+
+        client.add_build("running", 1, log + "finished\n", building=False)
+        log_path = manager.fetch(client, build)
+
+        assert client.bytes_served == len(log) + len("finished\n")
+        assert manager.get_manifest(build, client.jenkins_url).complete
+        assert manager.read_lines(log_path) == [
+            "step 1",
+            "step 2 is half done",
+            "step 3",
+            "finished",
+        ]
+        manager.fetch(client, build)
+        assert client.console_calls == 3
+
+    def test_annotated_log_is_appended_not_downloaded_again(self, cache_config):
+        client = AnnotatedJenkinsClient()
+        note = AnnotatedJenkinsClient.NOTE
+        build = Build(job_name="pipeline", build_number=1)
+        manager = CacheManager(cache_config)
+        log = f"{note}[Pipeline] stage\n{note}[Pipeline] sh\n"
+        client.add_build("pipeline", 1, log, building=True)
+        manager.fetch(client, build)
+        first_served = client.bytes_served
+
+        client.add_build("pipeline", 1, log + f"{note}+ make\nok\n", building=False)
+        log_path = manager.fetch(client, build)
+
+        assert client.bytes_served - first_served == len("+ make\nok\n")
+        assert manager.read_lines(log_path) == [
+            "[Pipeline] stage",
+            "[Pipeline] sh",
+            "+ make",
+            "ok",
+        ]
+
+    def test_restarted_log_is_downloaded_again(self, cache_config, client):
+        build = Build(job_name="running", build_number=1)
+        manager = CacheManager(cache_config)
+        client.add_build("running", 1, "a long first attempt\n", building=True)
+        manager.fetch(client, build)
+
+        client.add_build("running", 1, "retry\n", building=False)
+        log_path = manager.fetch(client, build)
+
+        assert manager.read_lines(log_path) == ["retry"]
+        assert manager.get_manifest(build, client.jenkins_url).complete
+
+    def test_download_again_switches_to_a_new_generation(self, cache_config, client):
+        build = Build(job_name="running", build_number=1)
+        manager = CacheManager(cache_config)
+        client.add_build("running", 1, "first attempt\n", building=True)
+        first_path = manager.fetch(client, build)
+
+        with LogStoreReader(first_path) as reader:
+            client.add_build("running", 1, "retry\n", building=True)
+            second_path = manager.fetch(client, build)
+            # The open reader keeps its consistent snapshot of the old generation
+            assert reader.read_lines() == ["first attempt"]
+
+        assert second_path != first_path
+        assert manager.get_path(build, client.jenkins_url) == second_path
+        assert manager.read_lines(second_path) == ["retry"]
+
+        client.add_build("running", 1, "x\n", building=False)
+        third_path = manager.fetch(client, build)
+        assert manager.read_lines(third_path) == ["x"]
+        assert not first_path.exists()
+        assert not any(first_path.parent.glob(first_path.name + ".*"))
+        assert second_path.exists()
+
+    def test_entry_without_manifest_is_not_served(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+        log_path = manager.fetch(client, build)
+        (log_path.parent / MANIFEST_NAME).unlink()
+
+        manager.fetch(client, build)
+        assert client.console_calls == 2
+
+    def test_instances_do_not_share_entries(self, cache_config, client):
+        other = FakeJenkinsClient("https://other.example.com")
+        other.add_build("folder/my job", 7, "other log\n")
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+
+        assert manager.fetch(client, build) != manager.fetch(other, build)
+        assert {m.jenkins_url for m in manager.iter_entries()} == {
+            client.jenkins_url,
+            other.jenkins_url,
+        }
+
+    def test_concurrent_fetches_share_one_download(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+        original = client.download_progressive_log
+
+        def slow_download(*args, **kwargs):
+            time.sleep(0.2)
+            return original(*args, **kwargs)
+
+        client.download_progressive_log = slow_download
+        paths = []
+        threads = [
+            threading.Thread(target=lambda: paths.append(manager.fetch(client, build)))
+            for _ in range(5)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert client.console_calls == 1
+        assert len(set(paths)) == 1 and len(paths) == 5
+        assert time.monotonic() - started < 1.0
+
+    def test_remove_entry(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        log_path = manager.fetch(
+            client, Build(job_name="folder/my job", build_number=7)
+        )
+
+        for manifest in list(manager.iter_entries()):
+            manager.remove_entry(manifest)
+
+        assert not log_path.exists()
+        assert list(manager.iter_entries()) == []
+        # Deleting the lock file would let two processes lock different inodes
+        assert log_path.with_suffix(".lock").exists()
+
+
+class TestCacheEviction:
+    """Size accounting and LRU eviction against max_size_mb"""
+
+    LOG = "x" * 1023 + "\n"
+
+    @pytest.fixture
+    def small_cache(self, tmp_path) -> CacheConfig:
+        return CacheConfig(
+            base_dir=tmp_path / "cache", max_size_mb=1, enable_compression=False
+        )
+
+    @pytest.fixture
+    def big_builds(self) -> FakeJenkinsClient:
+        client = FakeJenkinsClient()
+        for number in range(1, 5):
+            client.add_build("big", number, self.LOG * 400)  # ~400KB each
+        return client
+
+    def _fetch(self, manager, client, number):
+        return manager.fetch(client, Build(job_name="big", build_number=number))
+
+    def test_total_bytes_tracks_entries(self, small_cache, big_builds):
+        manager = CacheManager(small_cache)
+        manager.fetch(big_builds, Build(job_name="big", build_number=1))
+        assert 400 * 1024 < manager.total_bytes < 500 * 1024
+        assert CacheManager(small_cache).total_bytes == manager.total_bytes
+
+    def test_least_recently_used_entry_is_evicted(self, small_cache, big_builds):
+        vectors = RecordingVectorManager()
+        manager = CacheManager(small_cache, vectors)
+        first = self._fetch(manager, big_builds, 1)
+        second = self._fetch(manager, big_builds, 2)
+        # Reading the first entry again makes the second the least recently used
+        assert self._fetch(manager, big_builds, 1) == first
+        self._fetch(manager, big_builds, 3)
+
+        assert not second.exists()
+        assert first.exists()
+        assert manager.total_bytes <= manager.max_size_bytes
+        assert vectors.deleted == ["big:2"]
+
+    def test_pinned_entries_are_not_evicted(self, small_cache, big_builds):
+        manager = CacheManager(small_cache)
+        first = self._fetch(manager, big_builds, 1)
+        second = self._fetch(manager, big_builds, 2)
+
+        pinned_build = Build(job_name="big", build_number=1)
+        with manager.pinned(pinned_build, jenkins_url=big_builds.jenkins_url):
+            manager.fetch(big_builds, Build(job_name="big", build_number=3))
+
+        assert first.exists()
+        assert not second.exists()
+
+    def test_entry_being_fetched_is_not_evicted(self, small_cache, big_builds):
+        manager = CacheManager(small_cache)
+        big_builds.add_build("big", 1, self.LOG * 400, building=True)
+        running = self._fetch(manager, big_builds, 1)
+        other = self._fetch(manager, big_builds, 2)
+        original = big_builds.download_progressive_log
+
+        def download_during_eviction(*args, **kwargs):
+            # Another thread evicts while the running build is being extended
+            manager.max_size_bytes = 1
+            evicting = threading.Thread(target=manager.enforce_size_limit)
+            evicting.start()
+            evicting.join(timeout=5)
+            return original(*args, **kwargs)
+
+        big_builds.add_build("big", 1, self.LOG * 401, building=False)
+        big_builds.download_progressive_log = download_during_eviction
+        manager.fetch(big_builds, Build(job_name="big", build_number=1))
+
+        assert not other.exists()
+        assert len(manager.read_lines(running)) == 401
+
+    def test_vector_data_is_deleted_outside_the_cache_lock(
+        self, small_cache, big_builds
+    ):
+        lock_free = []
+
+        def probe_lock():
+            acquired = manager._lock.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                manager._lock.release()
+
+        class ProbingVectorManager(RecordingVectorManager):
+            def delete_build_data(self, build):
+                probe = threading.Thread(target=probe_lock)
+                probe.start()
+                probe.join()
+                super().delete_build_data(build)
+
+        manager = CacheManager(small_cache, ProbingVectorManager())
+        for number in range(1, 4):
+            self._fetch(manager, big_builds, number)
+
+        assert lock_free == [True]
+
+    def test_eviction_uses_the_index_and_deletes_outside_the_lock(
+        self, small_cache, big_builds, monkeypatch
+    ):
+        manager = CacheManager(small_cache)
+        first = self._fetch(manager, big_builds, 1)
+        self._fetch(manager, big_builds, 2)
+
+        def no_scan():
+            raise AssertionError("eviction walked the cache directory")
+
+        lock_free = []
+        delete_files = manager._delete_entry_files
+
+        def probe_lock():
+            acquired = manager._lock.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                manager._lock.release()
+
+        def probing_delete(entry_dir, manifest):
+            probe = threading.Thread(target=probe_lock)
+            probe.start()
+            probe.join()
+            return delete_files(entry_dir, manifest)
+
+        monkeypatch.setattr(manager, "_scan_entries", no_scan)
+        monkeypatch.setattr(manager, "_delete_entry_files", probing_delete)
+        self._fetch(manager, big_builds, 3)
+
+        assert not first.exists()
+        assert lock_free == [True]
+        kept = [self._fetch(manager, big_builds, number) for number in (2, 3)]
+        assert manager.total_bytes == sum(
+            manager._entry_size(path.parent) for path in kept
+        )
+
+
+class TestTailForAnalysis:
+    """Large uncached logs are analysed from their tail only"""
+
+    def test_large_log_returns_tail_window(self, tmp_path):
+        config = CacheConfig(
+            base_dir=tmp_path / "cache", tail_threshold_mb=1, tail_window_mb=1
+        )
+        client = FakeJenkinsClient()
+        client.add_build("huge", 1, ("x" * 1023 + "\n") * 3000)
+        manager = CacheManager(config)
+
+        source = manager.fetch_for_analysis(
+            client, Build(job_name="huge", build_number=1)
+        )
+
+        assert isinstance(source, LogWindow)
+        assert len(source.data) == 1024 * 1024
+        assert client.console_calls == 0
+        assert list(manager.iter_entries()) == []
+
+    def test_small_or_cached_log_is_fetched(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+
+        path = manager.fetch_for_analysis(client, build)
+        assert manager.read_lines(path) == ["line one", "line two"]
+        assert manager.fetch_for_analysis(client, build) == path
+        assert client.console_calls == 1
+
+
+class TestLogSizeProbe:
+    """Log sizes are answered without downloading the log"""
+
+    def test_uncached_log_is_probed_remotely(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        probe = manager.probe_log_size(
+            client, Build(job_name="folder/my job", build_number=7)
+        )
+
+        assert probe.text_size == len("line one\nline two\n")
+        assert probe.line_count is None
+        assert client.console_calls == 0
+
+    def test_cached_log_needs_no_request(self, cache_config, client):
+        manager = CacheManager(cache_config)
+        build = Build(job_name="folder/my job", build_number=7)
+        manager.fetch(client, build)
+
+        probe = manager.probe_log_size(client, build)
+
+        assert probe == LogSizeProbe(
+            text_size=len("line one\nline two\n"), more_data=False, line_count=2
+        )
+        assert client.probe_calls == 0
+        assert client.console_calls == 1
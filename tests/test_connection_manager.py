@@ -0,0 +1,198 @@
+"""Tests for lazy Jenkins connection setup"""
+
+import threading
+import time
+
+import jenkins
+import pytest
+import yaml
+
+from jenkins_mcp_enterprise.config import JenkinsConfig
+from jenkins_mcp_enterprise.exceptions import JenkinsConnectionError
+from jenkins_mcp_enterprise.jenkins.connection_manager import JenkinsConnectionManager
+from jenkins_mcp_enterprise.multi_jenkins_manager import MultiJenkinsManager
+
+
+class WhoamiRecorder:
+    """Replaces python-jenkins' whoami call, optionally slow or failing"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"fullName": "agent"}
+
+
+@pytest.fixture
+def whoami(monkeypatch) -> WhoamiRecorder:
+    recorder = WhoamiRecorder()
+    monkeypatch.setattr(jenkins.Jenkins, "get_whoami", recorder)
+    return recorder
+
+
+def make_connection() -> JenkinsConnectionManager:
+    return JenkinsConnectionManager(
+        JenkinsConfig(url="https://jenkins.example.com", username="u", token="t")
+    )
+
+
+class TestLazyConnection:
+    """Credentials are checked once, on demand"""
+
+    def test_construction_makes_no_request(self, whoami):
+        connection = make_connection()
+        assert whoami.calls == 0
+        assert connection.authenticated is None
+
+    def test_successful_check_is_cached(self, whoami):
+        connection = make_connection()
+        assert connection.authenticate()
+        assert connection.ensure_authenticated() == {"fullName": "agent"}
+        assert whoami.calls == 1
+        assert connection.authenticated is True
+
+    def test_connection_test_always_asks_jenkins(self, whoami):
+        connection = make_connection()
+        connection.ensure_authenticated()
+        assert connection.test_connection()
+        assert whoami.calls == 2
+
+        whoami.error = jenkins.JenkinsException("connection refused")
+        assert not connection.test_connection()
+        assert whoami.calls == 3
+
+    def test_failed_check_is_not_retried_immediately(self, whoami):
+        whoami.error = jenkins.JenkinsException("connection refused")
+        connection = make_connection()
+
+        errors = []
+        for _ in range(3):
+            with pytest.raises(JenkinsConnectionError) as excinfo:
+                connection.ensure_authenticated()
+            errors.append(excinfo.value)
+
+        assert whoami.calls == 1
+        assert connection.authenticated is False
+        # Each caller gets its own exception, not one shared traceback
+        assert len({id(error) for error in errors}) == 3
+        assert "connection refused" in str(errors[-1])
+
+    def test_warm_up_runs_in_background(self, whoami):
+        whoami.delay = 0.2
+        connection = make_connection()
+
+        started = time.monotonic()
+        thread = connection.warm_up()
+        assert time.monotonic() - started < 0.1
+
+        thread.join(timeout=5)
+        assert connection.authenticated is True
+
+
+class TestPerInstanceClientCreation:
+    """A slow controller does not block clients of other instances"""
+
+    @pytest.fixture
+    def manager(self, tmp_path) -> MultiJenkinsManager:
+        config = {
+            "jenkins_instances": {
+                name: {
+                    "url": f"https://{name}.example.com",
+                    "username": "u",
+                    "token": "t",
+                }
+                for name in ("slow", "fast")
+            }
+        }
+        path = tmp_path / "instances.yml"
+        path.write_text(yaml.safe_dump(config))
+        return MultiJenkinsManager(config_file=str(path))
+
+    def test_slow_instance_does_not_block_others(self, manager, monkeypatch):
+        create_client = manager._create_client
+
+        def slow_create(instance_id):
+            if instance_id == "slow":
+                time.sleep(0.5)
+            return create_client(instance_id)
+
+        monkeypatch.setattr(manager, "_create_client", slow_create)
+        slow = threading.Thread(target=manager.get_jenkins_client, args=("slow",))
+        slow.start()
+        time.sleep(0.05)
+
+        started = time.monotonic()
+        manager.get_jenkins_client("fast")
+        assert time.monotonic() - started < 0.3
+        slow.join(timeout=5)
+
+    def test_client_is_created_once_per_instance(self, manager):
+        clients = []
+        threads = [
+            threading.Thread(
+                target=lambda: clients.append(manager.get_jenkins_client("fast"))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len({id(client) for client in clients}) == 1
+
+
+class TestSharedConnectionPool:
+    """python-jenkins and raw session calls share one sized pool"""
+
+    def test_both_sessions_use_the_shared_adapter(self):
+        connection = JenkinsConnectionManager(
+            JenkinsConfig(
+                url="https://jenkins.example.com", username="u", pool_max_per_host=48
+            )
+        )
+        url = "https://jenkins.example.com/job/app/1/api/json"
+
+        assert connection.session.get_adapter(url) is connection.http_adapter
+        assert connection.client._session.get_adapter(url) is connection.http_adapter
+        assert connection.http_adapter._pool_maxsize == 48
+
+    def test_pool_stats_report_utilisation(self, tmp_path):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = b'{"ok": true}'
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            connection = JenkinsConnectionManager(JenkinsConfig(url=url, username="u"))
+            for _ in range(3):
+                connection.session.get(f"{url}/api/json").json()
+            stats = connection.pool_stats()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert stats["requests"] == 3
+        assert stats["hosts"] == 1
+        assert stats["connections_opened"] == 1  # Kept alive and reused
+        assert stats["idle_connections"] == 1
+        assert stats["in_flight"] == 0
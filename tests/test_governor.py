@@ -0,0 +1,144 @@
+"""Tests for per-controller admission control"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from jenkins_mcp_enterprise.jenkins.governor import (
+    BACKGROUND,
+    INTERACTIVE,
+    RequestGovernor,
+    background_priority,
+    current_priority,
+)
+
+
+class TestRateLimit:
+    """Token bucket pacing"""
+
+    def test_requests_are_paced_after_burst(self):
+        governor = RequestGovernor(rate=50, burst=1, max_concurrency=4)
+        started = time.monotonic()
+        for _ in range(6):
+            governor.acquire()
+            governor.release(0.0)
+        assert time.monotonic() - started >= 0.09
+
+    def test_retry_after_pauses_admission(self):
+        governor = RequestGovernor(latency_target=0)
+        governor.acquire()
+        governor.release(0.0, status_code=429, retry_after=0.2)
+
+        started = time.monotonic()
+        governor.acquire()
+        assert time.monotonic() - started >= 0.15
+
+    def test_acquire_times_out(self):
+        governor = RequestGovernor(max_concurrency=1, min_concurrency=1)
+        assert governor.acquire()
+        assert not governor.acquire(timeout=0.05)
+        assert governor.stats()["queued"] == 0
+
+
+class TestAdaptiveConcurrency:
+    """AIMD on overload signals and latency"""
+
+    def test_overload_halves_limit_and_success_grows_it(self):
+        governor = RequestGovernor(
+            max_concurrency=16, min_concurrency=2, latency_target=0.5
+        )
+        assert governor.limit == 8
+
+        governor.acquire()
+        governor.release(0.1, status_code=503)
+        assert governor.limit == 4
+
+        for _ in range(20):
+            governor.acquire()
+            governor.release(0.1, status_code=200)
+        assert 4 < governor.limit <= 16
+
+    def test_burst_of_errors_decreases_once_per_window(self):
+        governor = RequestGovernor(max_concurrency=16, latency_target=10)
+        for _ in range(4):
+            governor.acquire()
+        for _ in range(4):
+            governor.release(0.1, status_code=429)
+
+        assert governor.limit == 4
+        assert governor.stats()["decreases"] == 1
+        assert governor.stats()["overloads"] == 4
+
+    def test_slow_responses_count_as_overload(self):
+        governor = RequestGovernor(
+            max_concurrency=4, min_concurrency=1, latency_target=0.5
+        )
+        with governor.slot() as outcome:
+            outcome.status_code = 200
+            time.sleep(0.6)
+        assert governor.limit == 1
+        assert governor.stats()["slow_responses"] == 1
+
+    def test_failed_request_in_slot_is_overload(self):
+        governor = RequestGovernor(max_concurrency=8, latency_target=0)
+        with pytest.raises(ConnectionError):
+            with governor.slot():
+                raise ConnectionError("reset")
+        assert governor.limit == 2
+        assert governor.stats()["in_flight"] == 0
+
+
+class TestPriority:
+    """Interactive requests overtake queued background work"""
+
+    def test_interactive_waiter_is_admitted_first(self):
+        governor = RequestGovernor(
+            max_concurrency=1, min_concurrency=1, latency_target=0
+        )
+        governor.acquire()
+        order = []
+
+        def wait(priority, name):
+            governor.acquire(priority)
+            order.append(name)
+            governor.release(0.0)
+
+        background = threading.Thread(target=wait, args=(BACKGROUND, "background"))
+        background.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=wait, args=(INTERACTIVE, "interactive"))
+        interactive.start()
+        time.sleep(0.05)
+
+        governor.release(0.0)
+        background.join(timeout=5)
+        interactive.join(timeout=5)
+        assert order == ["interactive", "background"]
+
+    def test_background_context_sets_priority(self):
+        assert current_priority() == INTERACTIVE
+        with background_priority():
+            assert current_priority() == BACKGROUND
+        assert current_priority() == INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_respects_limit(self):
+        governor = RequestGovernor(
+            max_concurrency=2, min_concurrency=2, latency_target=0
+        )
+        peak = in_flight = 0
+
+        async def request():
+            nonlocal peak, in_flight
+            await governor.acquire_async()
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            governor.release(0.01, status_code=200)
+
+        await asyncio.gather(*(request() for _ in range(10)))
+        assert peak == 2
+        assert governor.stats()["admitted"] == 10
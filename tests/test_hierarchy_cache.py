@@ -0,0 +1,163 @@
+"""Tests for the discovered-hierarchy cache"""
+
+from typing import Dict, List
+
+import pytest
+
+from jenkins_mcp_enterprise.jenkins.hierarchy_cache import HierarchyCache
+from jenkins_mcp_enterprise.jenkins.subbuild_discoverer import SubBuildDiscoverer
+
+from .discovery_doubles import (
+    URL,
+    FakeConnection,
+    FakeSession,
+    build,
+    path,
+    triggered,
+)
+
+
+def finished_tree() -> Dict[str, Dict]:
+    return {
+        path("root", 1): build(
+            "FAILURE",
+            children=[triggered("a", 1, "SUCCESS"), triggered("b", 1, "FAILURE")],
+        ),
+        path("a", 1): build(children=[triggered("a-part", 1, "SUCCESS")]),
+        path("a-part", 1): build(),
+        path("b", 1): build("FAILURE"),
+    }
+
+
+def summary(sub_builds) -> List[tuple]:
+    return sorted((sb.job_name, sb.status, sb.depth) for sb in sub_builds)
+
+
+class TestHierarchyCache:
+    """Finished trees are immutable, running trees refresh incrementally"""
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_finished_tree_is_returned_without_requests(self, parallel):
+        session = FakeSession(finished_tree())
+        cache = HierarchyCache(URL)
+        discoverer = SubBuildDiscoverer(FakeConnection(session), hierarchy_cache=cache)
+
+        first = discoverer.discover_subbuilds("root", 1, parallel=parallel)
+        requests_made = len(session.paths)
+        second = discoverer.discover_subbuilds("root", 1, parallel=parallel)
+
+        assert requests_made == 4
+        assert len(session.paths) == requests_made
+        assert summary(second) == summary(first)
+        assert cache.stats()["hits"] == 1
+
+    def test_returned_sub_builds_are_copies(self):
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(FakeSession(finished_tree())),
+            hierarchy_cache=HierarchyCache(URL),
+        )
+        discoverer.discover_subbuilds("root", 1)[0].status = "MODIFIED"
+
+        assert "MODIFIED" not in {
+            sb.status for sb in discoverer.discover_subbuilds("root", 1)
+        }
+
+    def test_other_variant_reuses_finished_nodes(self):
+        session = FakeSession(finished_tree())
+        cache = HierarchyCache(URL)
+        discoverer = SubBuildDiscoverer(FakeConnection(session), hierarchy_cache=cache)
+
+        discoverer.discover_subbuilds("root", 1)
+        session.paths.clear()
+        failed = discoverer.discover_subbuilds("root", 1, failures_only=True)
+
+        assert session.paths == []
+        assert {sb.job_name for sb in failed if not sb.collapsed} == {"b"}
+        assert cache.stats()["nodes_reused"] == 2
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_running_root_only_revisits_open_nodes(self, parallel):
+        routes = {
+            path("root", 2): build(
+                None,
+                True,
+                children=[triggered("a", 1, "SUCCESS"), triggered("b", 2, None, True)],
+            ),
+            path("a", 1): build(children=[triggered("a-part", 1, "SUCCESS")]),
+            path("a-part", 1): build(),
+            path("b", 2): build(None, True),
+        }
+        session = FakeSession(routes)
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(session), hierarchy_cache=HierarchyCache(URL)
+        )
+        discoverer.discover_subbuilds("root", 2, parallel=parallel)
+
+        # b finishes and the root starts a new child c
+        routes[path("root", 2)] = build(
+            None,
+            True,
+            children=[
+                triggered("a", 1, "SUCCESS"),
+                triggered("b", 2, "FAILURE"),
+                triggered("c", 1, None, True),
+            ],
+        )
+        routes[path("b", 2)] = build("FAILURE")
+        routes[path("c", 1)] = build(None, True)
+        session.paths.clear()
+
+        refreshed = discoverer.discover_subbuilds("root", 2, parallel=parallel)
+
+        assert sorted(session.paths) == [path("b", 2), path("c", 1), path("root", 2)]
+        assert summary(refreshed) == [
+            ("a", "SUCCESS", 1),
+            ("a-part", "SUCCESS", 2),
+            ("b", "FAILURE", 1),
+            ("c", "RUNNING", 1),
+        ]
+
+    def test_failed_query_is_not_cached_as_complete(self):
+        routes = finished_tree()
+        routes[path("a", 1)] = 500
+        session = FakeSession(routes)
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(session), hierarchy_cache=HierarchyCache(URL)
+        )
+
+        discoverer.discover_subbuilds("root", 1)
+        routes[path("a", 1)] = build(children=[triggered("a-part", 1, "SUCCESS")])
+        session.paths.clear()
+        sub_builds = discoverer.discover_subbuilds("root", 1)
+
+        assert sorted(session.paths) == sorted([path("a", 1), path("a-part", 1)])
+        assert "a-part" in {sb.job_name for sb in sub_builds}
+
+    def test_persisted_tree_survives_restart(self, tmp_path):
+        session = FakeSession(finished_tree())
+        discoverer = SubBuildDiscoverer(
+            FakeConnection(session),
+            hierarchy_cache=HierarchyCache(URL, persist_dir=tmp_path),
+        )
+        first = discoverer.discover_subbuilds("root", 1)
+
+        restarted = SubBuildDiscoverer(
+            FakeConnection(session),
+            hierarchy_cache=HierarchyCache(URL, persist_dir=tmp_path),
+        )
+        session.paths.clear()
+
+        assert summary(restarted.discover_subbuilds("root", 1)) == summary(first)
+        assert session.paths == []
+
+    def test_invalidate_forgets_tree(self, tmp_path):
+        session = FakeSession(finished_tree())
+        cache = HierarchyCache(URL, persist_dir=tmp_path)
+        discoverer = SubBuildDiscoverer(FakeConnection(session), hierarchy_cache=cache)
+        discoverer.discover_subbuilds("root", 1)
+
+        cache.invalidate("root", 1)
+        session.paths.clear()
+        discoverer.discover_subbuilds("root", 1)
+
+        assert len(session.paths) == 4
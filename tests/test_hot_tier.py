@@ -0,0 +1,177 @@
+"""Tests for the in-memory hot tier of cached logs"""
+
+from pathlib import Path
+
+import pytest
+
+from jenkins_mcp_enterprise.base import Build
+from jenkins_mcp_enterprise.cache_manager import CacheManager
+from jenkins_mcp_enterprise.config import CacheConfig
+from jenkins_mcp_enterprise.streaming.hot_tier import HotLogTier
+from jenkins_mcp_enterprise.streaming.log_store import (
+    LogStoreWriter,
+    block_index_path,
+    line_index_path,
+)
+
+from .test_cache_manager import FakeJenkinsClient
+
+LOG_TEXT = b"".join(b"[INFO] step %d\n" % i for i in range(500)) + b"tail"
+LOG_LINES = LOG_TEXT.decode().split("\n")
+
+
+def write_log(path: Path, data: bytes = LOG_TEXT, append: bool = False) -> Path:
+    with LogStoreWriter(path, block_size=512, append=append) as writer:
+        writer.write(data)
+    return path
+
+
+class TestHotLogTier:
+    """Hits, invalidation and byte budget of the hot tier"""
+
+    def test_repeated_reads_hit_memory(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(10 * 1024 * 1024)
+
+        # The first read is served from disk; the second admits the log
+        assert tier.get(path) is None
+        first = tier.get(path)
+        assert tier.get(path) is first
+        assert first.line_count == len(LOG_LINES)
+        assert first.read_lines(100, 105) == LOG_LINES[100:105]
+        assert first.read_lines(499) == LOG_LINES[499:]
+
+        stats = tier.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+        assert stats["deferred"] == 1
+        assert stats["bytes"] == first.nbytes
+
+    def test_split_lines_are_kept_and_charged(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(10 * 1024 * 1024)
+
+        assert tier.all_lines(path) is None
+        lines = tier.all_lines(path)
+        assert lines == LOG_LINES
+        assert tier.all_lines(path) is lines
+        assert tier.stats()["bytes"] > tier.get(path).nbytes
+
+    def test_split_lines_above_entry_cap_are_not_kept(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(10 * 1024 * 1024, max_entry_bytes=2 * len(LOG_TEXT))
+        tier.get(path)
+        hot_log = tier.get(path)
+
+        assert tier.all_lines(path) == LOG_LINES
+        assert hot_log.lines is None
+        assert tier.stats()["bytes"] == hot_log.nbytes
+
+    def test_windowed_reads_never_load(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(10 * 1024 * 1024)
+
+        assert tier.get(path, load=False) is None
+        assert tier.get(path, load=False) is None
+        assert tier.stats()["entries"] == 0
+        # Earlier windowed reads count as previous use for admission
+        assert tier.get(path) is not None
+
+    def test_appended_log_is_reloaded(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(10 * 1024 * 1024)
+        tier.get(path)
+        assert tier.get(path).line_count == len(LOG_LINES)
+
+        write_log(path, b" end\nmore\n", append=True)
+
+        hot_log = tier.get(path)
+        assert hot_log.read_lines(500) == ["tail end", "more"]
+        assert tier.stats()["misses"] == 3
+
+    def test_log_without_line_index(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        line_index_path(path).unlink()
+        block_index_path(path).unlink()
+
+        tier = HotLogTier(10 * 1024 * 1024)
+        tier.get(path)
+        assert tier.get(path).read_lines(250, 260) == LOG_LINES[250:260]
+
+    def test_budget_evicts_least_recently_used(self, tmp_path):
+        paths = [write_log(tmp_path / f"{n}.log.gz") for n in range(3)]
+        sizing = HotLogTier(10 * 1024 * 1024)
+        sizing.get(paths[0])
+        entry_bytes = sizing.get(paths[0]).nbytes
+        tier = HotLogTier(int(entry_bytes * 2.5))
+
+        for path in paths:
+            tier.get(path)
+            tier.get(path)
+        tier.get(paths[2])
+
+        stats = tier.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert stats["hits"] == 1
+
+    @pytest.mark.parametrize(
+        "max_bytes, max_entry_bytes",
+        [(len(LOG_TEXT) - 1, None), (10 * 1024 * 1024, len(LOG_TEXT))],
+    )
+    def test_oversized_log_is_not_held(self, tmp_path, max_bytes, max_entry_bytes):
+        path = write_log(tmp_path / "console.log.gz")
+        tier = HotLogTier(max_bytes, max_entry_bytes=max_entry_bytes)
+
+        assert tier.get(path) is None
+        assert tier.get(path) is None
+        assert tier.stats()["rejected"] == 1
+        assert tier.stats()["entries"] == 0
+        assert tier.stats()["bytes"] == 0
+
+    def test_disabled_tier(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        assert HotLogTier(0).get(path) is None
+
+
+class TestCacheManagerHotTier:
+    """CacheManager read helpers are served from the hot tier"""
+
+    @pytest.fixture
+    def client(self) -> FakeJenkinsClient:
+        client = FakeJenkinsClient()
+        client.add_build("app", 1, "one\ntwo\n", building=True)
+        return client
+
+    def test_reads_are_served_from_memory(self, tmp_path, client):
+        manager = CacheManager(CacheConfig(base_dir=tmp_path / "cache"))
+        path = manager.fetch(client, Build(job_name="app", build_number=1))
+
+        # Windows and counts come from the line index until the log is hot
+        assert manager.line_count(path) == 2
+        assert manager.read_line_range(path, 1, 2) == ["two"]
+        assert manager.hot_tier.stats()["entries"] == 0
+
+        assert manager.read_lines(path) == ["one", "two"]
+        with manager.open_text(path) as stream:
+            assert stream.read() == "one\ntwo\n"
+        assert manager.read_line_range(path, 1, 2) == ["two"]
+        assert manager.line_count(path) == 2
+        assert manager.hot_tier.stats()["hits"] == 3
+
+    def test_extended_log_is_not_served_stale(self, tmp_path, client):
+        manager = CacheManager(CacheConfig(base_dir=tmp_path / "cache"))
+        build = Build(job_name="app", build_number=1)
+        path = manager.fetch(client, build)
+        assert manager.read_lines(path) == ["one", "two"]
+
+        client.add_build("app", 1, "one\ntwo\nthree\n", building=False)
+        manager.fetch(client, build)
+
+        assert manager.read_lines(path) == ["one", "two", "three"]
+
+    def test_hot_tier_can_be_disabled(self, tmp_path, client):
+        manager = CacheManager(CacheConfig(base_dir=tmp_path / "cache", hot_tier_mb=0))
+        path = manager.fetch(client, Build(job_name="app", build_number=1))
+
+        assert manager.read_lines(path) == ["one", "two"]
+        assert manager.hot_tier.stats()["entries"] == 0
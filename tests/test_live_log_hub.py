@@ -0,0 +1,161 @@
+"""Tests for the shared live-log poller"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from jenkins_mcp_enterprise.exceptions import JenkinsConnectionError
+from jenkins_mcp_enterprise.jenkins.live_log_hub import LiveLogHub
+from jenkins_mcp_enterprise.jenkins.log_fetcher import ProgressiveDownload
+
+
+class FakeFetcher:
+    """Serves progressiveText semantics for one growing log"""
+
+    def __init__(self):
+        self.connection = SimpleNamespace(
+            config=SimpleNamespace(url="https://jenkins.example.com")
+        )
+        self.data = b""
+        self.building = True
+        self.requests = 0
+        self.starts = []
+        self.failures = 0  # Upcoming requests that fail
+        self._lock = threading.Lock()
+
+    def append(self, data: bytes, building: bool = True) -> None:
+        with self._lock:
+            self.data += data
+            self.building = building
+
+    def download_progressive_log(self, job_name, build_number, sink, start=0):
+        with self._lock:
+            self.requests += 1
+            self.starts.append(start)
+            if self.failures:
+                self.failures -= 1
+                raise JenkinsConnectionError("controller unavailable")
+            body = self.data[start:]
+            sink.write(body)
+            return ProgressiveDownload(
+                start=start,
+                bytes_written=len(body),
+                text_size=len(self.data),
+                more_data=self.building,
+            )
+
+
+@pytest.fixture
+def fetcher() -> FakeFetcher:
+    return FakeFetcher()
+
+
+@pytest.fixture
+def hub(fetcher) -> LiveLogHub:
+    return LiveLogHub(fetcher, min_interval=0.01, max_interval=0.05)
+
+
+class TestLiveLogHub:
+    """One poller per build, fanned out to every subscriber"""
+
+    def test_subscribers_share_one_poller(self, hub, fetcher):
+        subscribers = [hub.subscribe("app", 1) for _ in range(5)]
+        assert hub.active_pollers() == 1
+
+        fetcher.append(b"one\n")
+        time.sleep(0.1)
+        requests_with_five = fetcher.requests
+        fetcher.append(b"two\nthree\n", building=False)
+
+        for subscription in subscribers:
+            assert list(subscription.lines(timeout=2)) == ["one", "two", "three"]
+        assert hub.active_pollers() == 0
+        # Five followers cost the same as one: roughly one request per interval
+        assert requests_with_five < 20
+
+    def test_late_subscriber_is_replayed_missed_lines(self, hub, fetcher):
+        first = hub.subscribe("app", 1)
+        fetcher.append(b"early\nsecond\nhalf")
+        time.sleep(0.1)
+        late = hub.subscribe("app", 1)
+        fetcher.append(b" done\nlate\n", building=False)
+
+        expected = ["early", "second", "half done", "late"]
+        assert list(first.lines(timeout=2)) == expected
+        assert list(late.lines(timeout=2)) == expected
+        assert late.error is None
+
+    def test_transient_poll_errors_are_retried(self, hub, fetcher):
+        fetcher.failures = 2
+        fetcher.append(b"one\n", building=False)
+
+        subscription = hub.subscribe("app", 1)
+
+        assert list(subscription.lines(timeout=2)) == ["one"]
+        assert subscription.error is None
+
+    def test_persistent_poll_errors_are_reported(self, fetcher):
+        hub = LiveLogHub(
+            fetcher, min_interval=0.001, max_interval=0.01, max_poll_failures=2
+        )
+        fetcher.failures = 3
+
+        subscription = hub.subscribe("app", 1)
+        assert list(subscription.lines(timeout=2)) == []
+        assert "controller unavailable" in subscription.error
+
+        fetcher.failures = 3
+        with pytest.raises(JenkinsConnectionError):
+            list(hub.stream("app", 1))
+
+    def test_poller_stops_when_last_subscriber_leaves(self, hub, fetcher):
+        first = hub.subscribe("app", 1)
+        second = hub.subscribe("app", 1)
+        first.close()
+        assert hub.active_pollers() == 1
+
+        second.close()
+        assert hub.active_pollers() == 0
+        time.sleep(0.1)
+        requests = fetcher.requests
+        time.sleep(0.1)
+        assert fetcher.requests == requests
+
+    def test_stream_honours_max_lines(self, hub, fetcher):
+        fetcher.append(b"a\nb\nc\n")
+        assert list(hub.stream("app", 1, max_lines=2)) == ["a", "b"]
+        assert hub.active_pollers() == 0
+
+    def test_late_subscriber_is_served_from_the_buffer(self, hub, fetcher):
+        first = hub.subscribe("app", 1)
+        fetcher.append(b"early\nsecond\n")
+        time.sleep(0.1)
+        late = hub.subscribe("app", 1)
+        fetcher.append(b"late\n", building=False)
+
+        assert list(late.lines(timeout=2)) == ["early", "second", "late"]
+        assert list(first.lines(timeout=2)) == ["early", "second", "late"]
+        # Once the poller moved past the start, nobody read the log from it again
+        moved = next(i for i, start in enumerate(fetcher.starts) if start)
+        assert 0 not in fetcher.starts[moved:]
+
+    def test_slow_subscriber_reads_trimmed_lines_again(self, fetcher):
+        hub = LiveLogHub(fetcher, min_interval=0.01, buffer_lines=3)
+        fetcher.append(b"".join(b"%d\n" % i for i in range(30)), building=False)
+        subscription = hub.subscribe("app", 1)
+        time.sleep(0.1)
+
+        assert list(subscription.lines(timeout=1)) == [str(i) for i in range(30)]
+        assert subscription.error is None
+
+    def test_interval_adapts_to_log_growth(self, hub, fetcher):
+        subscription = hub.subscribe("app", 1, poll_interval=0.02)
+        poller = hub._pollers[subscription.key]
+        time.sleep(0.2)
+        assert poller.interval == pytest.approx(hub.max_interval)
+        subscription.close()
+
+        poller._adapt_interval(new_lines=10)
+        assert poller.interval < hub.max_interval
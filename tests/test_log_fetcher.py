@@ -0,0 +1,424 @@
+"""Tests for console log fetching against a scripted HTTP session"""
+
+import gzip
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from jenkins_mcp_enterprise.config import JenkinsConfig
+from jenkins_mcp_enterprise.exceptions import JenkinsConnectionError
+from jenkins_mcp_enterprise.jenkins.log_fetcher import (
+    LogFetcher,
+    LogSizeProbe,
+    LogTail,
+)
+from jenkins_mcp_enterprise.jenkins.negative_cache import NegativeCache
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the fetcher"""
+
+    def __init__(self, body: bytes, status: int = 200, headers: Optional[Dict] = None):
+        self.body = body
+        self.status_code = status
+        self.headers = headers or {}
+        self.chunk_sizes: List[int] = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        self.chunk_sizes.append(chunk_size)
+        for offset in range(0, len(self.body), chunk_size):
+            yield self.body[offset : offset + chunk_size]
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+
+class FakeSession:
+    """Records requests and serves canned responses by URL suffix"""
+
+    def __init__(self):
+        self.routes: Dict[str, FakeResponse] = {}
+        self.head_routes: Dict[str, FakeResponse] = {}
+        self.requests: List[Dict] = []
+        self.head_requests: List[str] = []
+
+    def get(self, url, params=None, timeout=None, stream=False, **kwargs):
+        self.requests.append({"url": url, "params": params, "stream": stream})
+        for suffix, response in self.routes.items():
+            if url.endswith(suffix):
+                return response(params) if callable(response) else response
+        return FakeResponse(b"", status=404)
+
+    def head(self, url, params=None, timeout=None, **kwargs):
+        self.head_requests.append(url)
+        for suffix, response in self.head_routes.items():
+            if url.endswith(suffix):
+                return response
+        return FakeResponse(b"", status=405)
+
+
+class GrowingLog:
+    """progressiveText semantics for a log that is still being written"""
+
+    def __init__(self):
+        self.data = b""
+        self.building = True
+        self.strip = b""  # ConsoleNote markup removed from plain progressiveText
+
+    def __call__(self, params) -> FakeResponse:
+        start = params["start"]
+        body = self.data[start:] if start <= len(self.data) else self.data
+        if self.strip:
+            body = body.replace(self.strip, b"")
+        headers = {"X-Text-Size": str(len(self.data))}
+        if self.building:
+            headers["X-More-Data"] = "true"
+        return FakeResponse(body, headers=headers)
+
+
+class FakeConnection:
+    def __init__(self, session: FakeSession):
+        self.config = JenkinsConfig(url="https://jenkins.example.com/", username="u")
+        self.session = session
+        self.negative_cache = NegativeCache()
+
+
+@pytest.fixture
+def session() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+def fetcher(session) -> LogFetcher:
+    return LogFetcher(FakeConnection(session))
+
+
+class TestStreamingDownload:
+    """The log is streamed into a sink in bounded chunks"""
+
+    def test_download_streams_chunks_into_sink(self, fetcher, session):
+        body = b"".join(b"line %d\n" % i for i in range(10000))
+        response = FakeResponse(body, headers={"X-Text-Size": str(len(body))})
+        session.routes["/job/folder/job/app/12/logText/progressiveText"] = response
+        sink = io.BytesIO()
+
+        download = fetcher.download_progressive_log(
+            "folder/app", 12, sink, chunk_size=4096
+        )
+
+        assert download.bytes_written == len(body)
+        assert sink.getvalue() == body
+        assert response.chunk_sizes == [4096]
+        assert response.closed
+        assert session.requests[0]["stream"] is True
+
+    def test_download_failure_raises_connection_error(self, fetcher):
+        with pytest.raises(JenkinsConnectionError):
+            fetcher.download_progressive_log("missing", 1, io.BytesIO())
+
+    def test_missing_build_is_not_requested_again(self, fetcher, session):
+        for _ in range(3):
+            with pytest.raises(JenkinsConnectionError):
+                fetcher.download_progressive_log("stage", 1, io.BytesIO())
+
+        assert len(session.requests) == 1
+
+
+class TestProgressiveDownload:
+    """progressiveText offsets drive incremental downloads"""
+
+    def test_reports_offset_and_more_data(self, fetcher, session):
+        session.routes["/job/app/3/logText/progressiveText"] = FakeResponse(
+            b"new line\n", headers={"X-Text-Size": "109", "X-More-Data": "true"}
+        )
+        sink = io.BytesIO()
+
+        download = fetcher.download_progressive_log("app", 3, sink, start=100)
+
+        assert sink.getvalue() == b"new line\n"
+        assert session.requests[0]["params"] == {"start": 100}
+        assert download.text_size == 109
+        assert download.more_data
+        assert download.consistent
+
+    def test_restarted_response_is_inconsistent(self, fetcher, session):
+        # start beyond the end of the log makes Jenkins serve it from 0
+        session.routes["/job/app/3/logText/progressiveText"] = FakeResponse(
+            b"short\n", headers={"X-Text-Size": "6"}
+        )
+        download = fetcher.download_progressive_log("app", 3, io.BytesIO(), start=50)
+
+        assert not download.more_data
+        assert download.restarted
+        assert not download.consistent
+
+    def test_stripped_console_notes_stay_consistent(self, fetcher, session):
+        # X-Text-Size counts the raw log, the body has its ConsoleNotes removed
+        session.routes["/job/app/3/logText/progressiveText"] = FakeResponse(
+            b"[Pipeline] sh\n", headers={"X-Text-Size": "260", "X-More-Data": "true"}
+        )
+        download = fetcher.download_progressive_log("app", 3, io.BytesIO(), start=100)
+
+        assert download.bytes_written < download.text_size - download.start
+        assert not download.restarted
+        assert download.consistent
+
+
+class TestLogTail:
+    """Byte-offset tailing of a running build"""
+
+    @pytest.fixture
+    def log(self, session) -> GrowingLog:
+        log = GrowingLog()
+        session.routes["/job/app/9/logText/progressiveText"] = log
+        return log
+
+    def test_partial_lines_are_carried_across_polls(self, fetcher, session, log):
+        tail = LogTail(fetcher, "app", 9)
+        log.data = b"first\nsec"
+        assert tail.poll() == ["first"]
+
+        log.data += "ond \u00e9".encode("utf-8")[:-1]
+        assert tail.poll() == []
+        log.data += "ond \u00e9".encode("utf-8")[-1:] + b"\r\nthird\n"
+        assert tail.poll() == ["second \u00e9", "third"]
+        assert not tail.finished
+
+        log.data += b"done"
+        log.building = False
+        assert tail.poll() == ["done"]
+        assert tail.finished
+        assert tail.poll() == []
+
+        starts = [request["params"]["start"] for request in session.requests]
+        assert starts == [0, 9, 14, 23]
+
+    def test_truncated_log_is_followed_from_start(self, fetcher, log):
+        tail = LogTail(fetcher, "app", 9)
+        log.data = b"one\ntwo\n"
+        assert tail.poll() == ["one", "two"]
+
+        log.data = b"new\n"
+        log.building = False
+        assert tail.poll() == ["new"]
+
+    def test_stream_log_lines_uses_one_request_per_poll(self, fetcher, session, log):
+        log.data = b"a\nb\n"
+        log.building = False
+
+        assert list(fetcher.stream_log_lines("app", 9, poll_interval=0)) == ["a", "b"]
+        assert len(session.requests) == 1
+
+
+class TestLogSizeProbe:
+    """Log sizes come from response headers, never from the body"""
+
+    URL = "/job/app/3/logText/progressiveText"
+
+    def test_head_request_reads_headers(self, fetcher, session):
+        session.head_routes[self.URL] = FakeResponse(
+            b"", headers={"X-Text-Size": "4096", "X-More-Data": "true"}
+        )
+
+        assert fetcher.probe_log_size("app", 3) == LogSizeProbe(
+            text_size=4096, more_data=True
+        )
+        assert session.requests == []
+
+    def test_falls_back_to_unread_get_without_head_support(self, fetcher, session):
+        response = FakeResponse(b"x" * 10**6, headers={"X-Text-Size": str(10**6)})
+        session.routes[self.URL] = response
+
+        for _ in range(2):
+            probe = fetcher.probe_log_size("app", 3)
+
+        assert probe == LogSizeProbe(text_size=10**6, more_data=False)
+        assert response.chunk_sizes == []
+        assert response.closed
+        assert len(session.head_requests) == 1
+
+
+class TestLogChunk:
+    """Byte-accurate chunked reads"""
+
+    URL = "/job/app/4/logText/progressiveText"
+    LOG = "héllo wörld €uro\n".encode("utf-8") * 50
+
+    @pytest.fixture
+    def log(self, session) -> GrowingLog:
+        log = GrowingLog()
+        log.data = self.LOG
+        log.building = False
+        session.routes[self.URL] = log
+        return log
+
+    def test_chunks_reassemble_the_log_exactly(self, fetcher, log):
+        texts, offset = [], 0
+        while offset < len(self.LOG):
+            chunk = fetcher.read_log_chunk("app", 4, offset, max_bytes=7)
+            assert 0 < len(chunk.data) <= 7
+            assert chunk.next_offset == offset + len(chunk.data)
+            texts.append(chunk.text)
+            offset = chunk.next_offset
+
+        assert chunk.at_end
+        assert "".join(texts) == self.LOG.decode("utf-8")
+
+    def test_chunk_never_splits_a_character(self, fetcher, log):
+        # "h\xc3\xa9" - a limit of 2 bytes would cut the two-byte "é" in half
+        chunk = fetcher.read_log_chunk("app", 4, 0, max_bytes=2)
+        assert chunk.data == b"h"
+        assert chunk.next_offset == 1
+
+    def test_get_log_chunk_returns_text(self, fetcher, log):
+        assert fetcher.get_log_chunk("app", 4, 0, max_bytes=6) == "héllo"
+
+    def test_annotated_chunk_continues_from_text_size(self, fetcher, log):
+        # ConsoleNotes count towards offsets but are stripped from the body
+        note = b"\x1b[8mha:////4LZWr2x+note\x1b[0m"
+        log.data = b"".join(note + b"step %02d\n" % i for i in range(20))
+        log.strip = note
+
+        chunk = fetcher.read_log_chunk("app", 4, 0)
+        assert chunk.data == log.data.replace(note, b"")
+        assert chunk.next_offset == len(log.data)
+        assert chunk.at_end
+
+        log.data += note + b"step 20\n"
+        log.building = True
+        chunk = fetcher.read_log_chunk("app", 4, chunk.next_offset)
+        assert chunk.data == b"step 20\n"
+        assert chunk.next_offset == len(log.data)
+
+
+class TestTailFetch:
+    """Fetching only the end of a large log"""
+
+    LOG = b"".join(b"line %04d\n" % i for i in range(1000))  # 10 bytes per line
+
+    @pytest.fixture
+    def log(self, session) -> GrowingLog:
+        log = GrowingLog()
+        log.data = self.LOG
+        log.building = False
+        session.routes["/job/app/9/logText/progressiveText"] = log
+        return log
+
+    def test_tail_starts_at_line_boundary(self, fetcher, session, log):
+        window = fetcher.fetch_log_tail("app", 9, max_bytes=95)
+
+        assert window.text_size == len(self.LOG)
+        assert window.start == len(self.LOG) - 90
+        assert window.lines() == ["line %04d" % i for i in range(991, 1000)]
+        assert [r["params"]["start"] for r in session.requests] == [0, 9904]
+
+    def test_tail_on_exact_boundary_keeps_first_line(self, fetcher, log):
+        window = fetcher.fetch_log_tail("app", 9, max_bytes=100)
+        assert window.lines()[0] == "line 0990"
+
+    def test_window_extends_backwards(self, fetcher, log):
+        window = fetcher.fetch_log_tail("app", 9, max_bytes=50)
+        window = fetcher.extend_log_window(window, 50)
+
+        assert window.lines() == ["line %04d" % i for i in range(990, 1000)]
+        window = fetcher.extend_log_window(window, 10**6)
+        assert window.complete
+        assert window.data == self.LOG
+
+    def test_extended_window_of_annotated_log_has_no_duplicates(self, fetcher, log):
+        # ConsoleNotes count towards offsets but are stripped from the body
+        note = b"\x1b[8mha:////4LZWr2x+note\x1b[0m"
+        log.data = b"".join(note + b"step %02d\n" % i for i in range(20))
+        log.strip = note
+
+        window = fetcher.fetch_log_tail("app", 9, max_bytes=3 * len(note) + 24)
+        window = fetcher.extend_log_window(window, 3 * (len(note) + 8))
+
+        lines = window.lines()
+        assert lines == ["step %02d" % i for i in range(20 - len(lines), 20)]
+        # The window start stays a raw offset at or before its first line
+        first = lines[0].encode()
+        assert window.start <= log.data.index(first) - len(note)
+        assert len(lines) > 3
+
+
+class GzipJenkinsHandler(BaseHTTPRequestHandler):
+    """Serves progressiveText gzip-encoded when the client accepts it"""
+
+    log = b"".join(b"[INFO] compiling module %d\n" % (i % 50) for i in range(20000))
+
+    def do_GET(self):
+        start = int(self.path.rsplit("start=", 1)[1]) if "start=" in self.path else 0
+        body = self.log[start:]
+        headers = {"X-Text-Size": str(len(self.log))}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCompressedTransfer:
+    """Logs are negotiated gzip-encoded and decoded while streaming"""
+
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), GzipJenkinsHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def fetcher(self, server) -> LogFetcher:
+        connection = FakeConnection(requests.Session())
+        connection.config = JenkinsConfig(url=server, username="u")
+        return LogFetcher(connection)
+
+    def test_progressive_download_is_decoded_into_sink(self, fetcher):
+        sink = io.BytesIO()
+        download = fetcher.download_progressive_log("app", 1, sink)
+
+        assert sink.getvalue() == GzipJenkinsHandler.log
+        assert download.consistent
+        transfer = download.transfer
+        assert transfer.content_encoding == "gzip"
+        assert transfer.decoded_bytes == len(GzipJenkinsHandler.log)
+        assert transfer.wire_bytes < transfer.decoded_bytes / 10
+
+    def test_transfer_totals_accumulate(self, fetcher):
+        fetcher.download_progressive_log("app", 1, io.BytesIO())
+        chunk = fetcher.read_log_chunk("app", 1, 100, max_bytes=1000)
+
+        assert chunk.data == GzipJenkinsHandler.log[100:1100]
+        stats = fetcher.transfer_stats()
+        assert stats["fetches"] == 2
+        assert stats["compressed_fetches"] == 2
+        assert stats["wire_bytes"] < stats["decoded_bytes"]
@@ -0,0 +1,154 @@
+"""Tests for the seekable block-compressed log store"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from jenkins_mcp_enterprise.exceptions import CacheError
+from jenkins_mcp_enterprise.streaming import log_store
+from jenkins_mcp_enterprise.streaming.log_store import (
+    LogStoreReader,
+    LogStoreWriter,
+    block_index_path,
+    line_index_path,
+)
+
+LOG_TEXT = b"".join(b"[INFO] step %d\n" % i for i in range(2000)) + b"[END] no newline"
+LOG_LINES = LOG_TEXT.decode().split("\n")
+
+
+def write_log(path: Path, compress: bool = True, block_size: int = 256) -> Path:
+    """Write LOG_TEXT in small uneven writes so blocks split mid-write"""
+    with LogStoreWriter(path, compress=compress, block_size=block_size) as writer:
+        for offset in range(0, len(LOG_TEXT), 37):
+            writer.write(LOG_TEXT[offset : offset + 37])
+    return path
+
+
+@pytest.fixture(params=[True, False], ids=["compressed", "plain"])
+def stored_log(request, tmp_path) -> Path:
+    name = "console.log.gz" if request.param else "console.log"
+    return write_log(tmp_path / name, compress=request.param)
+
+
+class TestLogStore:
+    """Round-trip and random-access behaviour of stored logs"""
+
+    def test_round_trip(self, stored_log):
+        reader = LogStoreReader(stored_log)
+        assert reader.size == len(LOG_TEXT)
+        assert reader.line_count == len(LOG_LINES)
+        assert reader.block_count > 1
+        with reader.open_text() as stream:
+            assert stream.read() == LOG_TEXT.decode()
+
+    @pytest.mark.parametrize(
+        "start,end", [(0, 10), (123, 456), (1995, None), (2000, 2001), (1999, 5000)]
+    )
+    def test_read_line_ranges(self, stored_log, start, end):
+        reader = LogStoreReader(stored_log)
+        assert reader.read_lines(start, end) == LOG_LINES[start:end]
+
+    def test_read_bytes_across_blocks(self, stored_log):
+        reader = LogStoreReader(stored_log)
+        assert reader.read_bytes(250, 600) == LOG_TEXT[250:850]
+        assert reader.read_bytes(len(LOG_TEXT) + 10, 5) == b""
+
+    def test_compressed_store_is_smaller(self, tmp_path):
+        compressed = write_log(tmp_path / "console.log.gz", block_size=64 * 1024)
+        assert compressed.stat().st_size < len(LOG_TEXT) / 3
+
+    def test_missing_index_falls_back_to_scan(self, stored_log):
+        block_index_path(stored_log).unlink()
+        line_index_path(stored_log).unlink()
+        reader = LogStoreReader(stored_log)
+        assert not reader.indexed
+        assert not reader.has_line_index
+        assert reader.line_count == len(LOG_LINES)
+        assert reader.read_lines(700, 710) == LOG_LINES[700:710]
+
+    def test_line_index_maps_lines_to_offsets(self, stored_log):
+        with LogStoreReader(stored_log) as reader:
+            assert reader.has_line_index
+            assert reader.line_count == len(LOG_LINES)
+            assert reader.read_lines(1500, 1540) == LOG_LINES[1500:1540]
+            assert reader.read_lines(2000) == ["[END] no newline"]
+
+    def test_line_index_flushes_incrementally(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_store, "LINE_INDEX_FLUSH_ENTRIES", 16)
+        path = write_log(tmp_path / "console.log.gz")
+        with LogStoreReader(path) as reader:
+            assert reader.line_count == len(LOG_LINES)
+            assert reader.read_lines(333, 350) == LOG_LINES[333:350]
+
+    @pytest.mark.parametrize("text", [b"", b"one\n", b"one\r\ntwo\r\n\n"])
+    def test_line_index_edge_cases(self, tmp_path, text):
+        path = tmp_path / "console.log.gz"
+        with LogStoreWriter(path) as writer:
+            writer.write(text)
+        expected = text.decode().replace("\r", "").split("\n")
+        if text.endswith(b"\n") or not text:
+            expected.pop()
+        with LogStoreReader(path) as reader:
+            assert reader.read_lines() == expected
+            assert reader.line_count == len(expected)
+
+    def test_stale_line_index_is_ignored(self, stored_log):
+        line_index_path(stored_log).write_bytes(b"\x00" * 16)
+        with LogStoreReader(stored_log) as reader:
+            assert not reader.has_line_index
+            assert reader.read_lines(10, 12) == LOG_LINES[10:12]
+
+    @pytest.mark.parametrize("split", [0, 100, 1200, 1215, len(LOG_TEXT)])
+    def test_append_resumes_stored_log(self, tmp_path, split):
+        path = tmp_path / "console.log.gz"
+        with LogStoreWriter(path, block_size=256) as writer:
+            writer.write(LOG_TEXT[:split])
+        with LogStoreWriter(path, block_size=256, append=True) as writer:
+            writer.write(LOG_TEXT[split:])
+            assert writer.text_size == len(LOG_TEXT)
+
+        with LogStoreReader(path) as reader:
+            assert reader.has_line_index
+            assert reader.line_count == len(LOG_LINES)
+            assert reader.read_lines() == LOG_LINES
+            assert reader.read_lines(5, 9) == LOG_LINES[5:9]
+
+    def test_reader_snapshot_ignores_later_appends(self, tmp_path):
+        path = tmp_path / "console.log.gz"
+        with LogStoreWriter(path) as writer:
+            writer.write(b"first\npartial")
+        with LogStoreReader(path) as before:
+            with LogStoreWriter(path, append=True) as writer:
+                writer.write(b" line\nsecond\n")
+            assert before.read_lines() == ["first", "partial"]
+        with LogStoreReader(path) as after:
+            assert after.read_lines() == ["first", "partial line", "second"]
+
+    def test_aborted_append_rolls_back(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        with pytest.raises(RuntimeError):
+            with LogStoreWriter(path, block_size=256, append=True) as writer:
+                writer.write(b"garbage\n" * 500)
+                raise RuntimeError("download interrupted")
+
+        with LogStoreReader(path) as reader:
+            assert reader.read_lines() == LOG_LINES
+
+    def test_append_without_indexes_raises(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        line_index_path(path).unlink()
+        with pytest.raises(CacheError):
+            LogStoreWriter(path, append=True)
+
+    def test_missing_log_raises_cache_error(self, tmp_path):
+        with pytest.raises(CacheError):
+            LogStoreReader(tmp_path / "absent.log.gz")
+
+    @pytest.mark.skipif(shutil.which("zcat") is None, reason="zcat not available")
+    def test_compressed_store_is_valid_gzip(self, tmp_path):
+        path = write_log(tmp_path / "console.log.gz")
+        result = subprocess.run(["zcat", str(path)], capture_output=True, check=True)
+        assert result.stdout == LOG_TEXT
@@ -0,0 +1,85 @@
+"""Tests for the negative-result cache and the discovery paths using it"""
+
+import time
+
+import jenkins
+import pytest
+import requests
+
+from jenkins_mcp_enterprise.base import Build
+from jenkins_mcp_enterprise.exceptions import SubBuildDiscoveryError
+from jenkins_mcp_enterprise.jenkins.negative_cache import (
+    MISSING_BUILD,
+    NO_WFAPI,
+    NegativeCache,
+    is_not_found,
+)
+from jenkins_mcp_enterprise.jenkins.subbuild_discoverer import SubBuildDiscoverer
+
+from .discovery_doubles import FakeConnection, FakeResponse, FakeSession, path
+
+
+class TestNegativeCache:
+    """TTL bookkeeping and 404 detection"""
+
+    def test_records_expire(self):
+        cache = NegativeCache(missing_build_ttl=0.05)
+        cache.record(MISSING_BUILD, "app", 1)
+        assert cache.is_known(MISSING_BUILD, "app", 1)
+        assert not cache.is_known(MISSING_BUILD, "app", 2)
+
+        time.sleep(0.1)
+        assert not cache.is_known(MISSING_BUILD, "app", 1)
+
+    def test_zero_ttl_disables_kind(self):
+        cache = NegativeCache(unsupported_ttl=0)
+        cache.record(NO_WFAPI, "app")
+        assert not cache.is_known(NO_WFAPI, "app")
+
+    def test_is_not_found_follows_exception_chain(self):
+        try:
+            try:
+                raise jenkins.NotFoundException("missing")
+            except jenkins.NotFoundException:
+                raise jenkins.JenkinsException("job[app] number[1] does not exist")
+        except jenkins.JenkinsException as e:
+            assert is_not_found(e)
+
+        assert not is_not_found(requests.HTTPError("boom", response=FakeResponse(500)))
+        assert not is_not_found(requests.ConnectionError("timeout"))
+
+
+class TestDiscoverySkipsDeadEndpoints:
+    """Freestyle jobs are only probed for pipeline endpoints once"""
+
+    def test_wfapi_is_skipped_for_freestyle_job(self):
+        session = FakeSession(
+            {path("freestyle", 5): {"actions": [{"_class": "CauseAction"}]}}
+        )
+        connection = FakeConnection(session, existing={("freestyle", 5)})
+        discoverer = SubBuildDiscoverer(connection)
+
+        for _ in range(3):
+            assert discoverer._discover_children_wfapi("freestyle", 5) == []
+
+        assert len(session.requests) == 1
+        assert connection.negative_cache.is_known(NO_WFAPI, "freestyle")
+
+    def test_missing_build_does_not_mark_job(self):
+        connection = FakeConnection(FakeSession({}), existing=())
+        discoverer = SubBuildDiscoverer(connection)
+
+        assert discoverer._discover_children_wfapi("pipeline", 404) == []
+        assert not connection.negative_cache.is_known(NO_WFAPI, "pipeline")
+
+    def test_list_pipeline_runs_fails_fast_for_non_pipeline(self):
+        session = FakeSession({})
+        connection = FakeConnection(session, existing={("freestyle", 5)})
+        discoverer = SubBuildDiscoverer(connection)
+        parent = Build(job_name="freestyle", build_number=5, url="u/")
+
+        for _ in range(2):
+            with pytest.raises(SubBuildDiscoveryError):
+                discoverer.list_pipeline_runs(parent)
+
+        assert len(session.requests) == 1
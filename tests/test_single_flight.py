@@ -0,0 +1,76 @@
+"""Tests for in-process request coalescing"""
+
+import threading
+import time
+
+from jenkins_mcp_enterprise.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Concurrent callers for one key share a single execution"""
+
+    def _run_concurrently(self, count, target):
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(target())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+
+    def test_concurrent_callers_share_one_execution(self):
+        group = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return "log"
+
+        results, errors = self._run_concurrently(
+            8, lambda: group.do(("jenkins", "job", 1), slow)
+        )
+
+        assert results == ["log"] * 8
+        assert errors == []
+        assert len(calls) == 1
+        assert group.in_flight() == 0
+
+    def test_waiters_receive_the_leader_error(self):
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("download failed")
+
+        results, errors = self._run_concurrently(4, lambda: group.do("key", failing))
+
+        assert results == []
+        assert len(errors) == 4
+        assert all(isinstance(e, ValueError) for e in errors)
+        assert all(str(e) == "download failed" for e in errors)
+        # Every caller raises its own exception instead of sharing one traceback
+        assert len({id(e) for e in errors}) == 4
+
+    def test_completed_key_runs_again(self):
+        group = SingleFlight()
+        assert group.do("key", lambda: 1) == 1
+        assert group.do("key", lambda: 2) == 2
+
+    def test_distinct_keys_do_not_block_each_other(self):
+        group = SingleFlight()
+        release = threading.Event()
+        first = threading.Thread(target=lambda: group.do("a", release.wait))
+        first.start()
+        try:
+            assert group.do("b", lambda: "done") == "done"
+        finally:
+            release.set()
+            first.join(timeout=5)
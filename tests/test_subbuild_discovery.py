@@ -0,0 +1,377 @@
+"""Tests for sub-build discovery with one projected query per build"""
+
+from typing import List
+
+import pytest
+
+from jenkins_mcp_enterprise.jenkins.discovery_query import (
+    DISCOVERY_TREE,
+    parse_discovery_node,
+)
+from jenkins_mcp_enterprise.jenkins.negative_cache import MISSING_BUILD
+from jenkins_mcp_enterprise.jenkins.subbuild_discoverer import SubBuildDiscoverer
+
+from .discovery_doubles import (
+    URL,
+    FakeConnection,
+    FakeSession,
+    RecordingFanout,
+    SlowSession,
+    build,
+    triggered,
+)
+
+
+@pytest.fixture
+def tree_session() -> FakeSession:
+    # root -> (a, b); a -> (c); b and c are leaves
+    return FakeSession(
+        {
+            "/job/root/1/api/json": build(
+                result="FAILURE",
+                children=[triggered("a", 2, "FAILURE"), triggered("b", 3, None, True)],
+            ),
+            "/job/a/2/api/json": build(
+                result="FAILURE", children=[triggered("c", 4, "FAILURE")]
+            ),
+            "/job/b/3/api/json": build(result=None),
+            "/job/c/4/api/json": build(result="FAILURE"),
+        }
+    )
+
+
+class TestParseDiscoveryNode:
+    """Child references from every plugin shape in one response"""
+
+    def test_collects_all_reference_kinds(self):
+        data = {
+            "_class": "org.jenkinsci.plugins.workflow.job.WorkflowRun",
+            "number": 7,
+            "result": None,
+            "building": True,
+            "url": f"{URL}/job/root/7/",
+            "subBuilds": [
+                {
+                    "jobName": "phase",
+                    "buildNumber": 1,
+                    "result": "SUCCESS",
+                    "url": "job/phase/1/",
+                }
+            ],
+            "actions": [
+                {"triggeredBuilds": [triggered("down", 2, "UNSTABLE")]},
+                {"nodes": [{"actions": [{"description": "folder » deploy #9"}]}]},
+                None,
+            ],
+        }
+        node = parse_discovery_node("root", 7, data, URL)
+
+        assert node.status == "RUNNING"
+        assert node.is_pipeline and node.has_flow_graph and not node.needs_wfapi
+        assert [(c.job_name, c.build_number, c.status) for c in node.children] == [
+            ("phase", 1, "SUCCESS"),
+            ("down", 2, "UNSTABLE"),
+            ("folder/deploy", 9, None),
+        ]
+        assert node.children[0].url == f"{URL}/job/phase/1/"
+
+    def test_first_reference_wins(self):
+        data = {
+            "actions": [
+                {"triggeredBuilds": [triggered("down", 2, "FAILURE")]},
+                {"nodes": [{"actions": [{"description": "down #2"}]}]},
+            ]
+        }
+        node = parse_discovery_node("root", 1, data, URL)
+        assert len(node.children) == 1
+        assert node.children[0].status == "FAILURE"
+
+
+class TestProjectedDiscovery:
+    """One request per build, statuses taken from the parent's projection"""
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_one_request_per_build(self, tree_session, parallel):
+        connection = FakeConnection(tree_session)
+        discoverer = SubBuildDiscoverer(connection)
+
+        sub_builds = discoverer.discover_subbuilds("root", 1, parallel=parallel)
+
+        found = {(sb.job_name, sb.build_number): sb for sb in sub_builds}
+        assert set(found) == {("a", 2), ("b", 3), ("c", 4)}
+        assert found[("a", 2)].status == "FAILURE"
+        assert found[("b", 3)].status == "RUNNING"
+        assert found[("c", 4)].depth == 2
+        assert found[("c", 4)].parent_job_name == "a"
+
+        assert len(tree_session.requests) == 4
+        assert all(
+            params == {"tree": DISCOVERY_TREE} for _, params in tree_session.requests
+        )
+        assert connection.build_info_calls == []
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_leaf_status_fetched_only_when_missing(self, parallel):
+        session = FakeSession(
+            {
+                "/job/root/1/api/json": {
+                    "actions": [{"nodes": [{"actions": [{"description": "leaf #5"}]}]}]
+                },
+            }
+        )
+        connection = FakeConnection(session)
+        discoverer = SubBuildDiscoverer(connection)
+
+        sub_builds = discoverer.discover_subbuilds(
+            "root", 1, max_depth=1, parallel=parallel
+        )
+
+        assert [(sb.job_name, sb.status) for sb in sub_builds] == [("leaf", "SUCCESS")]
+        assert connection.build_info_calls == [("leaf", 5)]
+        assert len(session.requests) == 1
+
+    def test_leaf_statuses_go_through_the_fanout(self):
+        session = FakeSession(
+            {
+                "/job/root/1/api/json": {
+                    "actions": [
+                        {
+                            "nodes": [
+                                {"actions": [{"description": "leaf #5"}]},
+                                {"actions": [{"description": "gone #6"}]},
+                            ]
+                        }
+                    ]
+                },
+            }
+        )
+        connection = FakeConnection(session)
+        fanout = RecordingFanout()
+        discoverer = SubBuildDiscoverer(connection, fanout=fanout)
+
+        sub_builds = discoverer.discover_subbuilds("root", 1, max_depth=1)
+
+        statuses = {sb.job_name: sb.status for sb in sub_builds}
+        assert statuses == {"leaf": "UNSTABLE", "gone": "UNKNOWN"}
+        assert fanout.batches == [([("leaf", 5), ("gone", 6)], 0)]
+        assert connection.build_info_calls == []
+
+    def test_wfapi_only_for_pipelines_without_flow_graph(self):
+        pipeline = {
+            "_class": "org.jenkinsci.plugins.workflow.job.WorkflowRun",
+            "result": "SUCCESS",
+            "actions": [{}],
+        }
+        session = FakeSession(
+            {
+                "/job/pipe/1/api/json": pipeline,
+                "/job/pipe/1/wfapi/runs": [],
+                "/job/pipe/1/wfapi/describe": {"stages": []},
+                "/job/free/1/api/json": build(),
+            }
+        )
+        discoverer = SubBuildDiscoverer(FakeConnection(session))
+
+        discoverer.discover_subbuilds("pipe", 1)
+        discoverer.discover_subbuilds("free", 1)
+
+        wfapi_urls = [url for url, _ in session.requests if "/wfapi/" in url]
+        assert wfapi_urls == [
+            f"{URL}/job/pipe/1/wfapi/runs",
+            f"{URL}/job/pipe/1/wfapi/describe",
+        ]
+
+    def test_missing_child_is_cached(self):
+        session = FakeSession(
+            {"/job/root/1/api/json": build(children=[triggered("gone", 9)])}
+        )
+        connection = FakeConnection(session)
+        discoverer = SubBuildDiscoverer(connection)
+
+        for _ in range(2):
+            discoverer.discover_subbuilds("root", 1)
+
+        assert connection.negative_cache.is_known(MISSING_BUILD, "gone", 9)
+        gone_requests = [url for url, _ in session.requests if "/job/gone/" in url]
+        assert len(gone_requests) == 1
+
+
+class TestPipelinedTraversal:
+    """Children are queried as soon as their own parent resolves"""
+
+    @pytest.fixture
+    def uneven_session(self) -> SlowSession:
+        # root -> (slow, fast); fast -> deep -> deeper; slow takes longest
+        return SlowSession(
+            {
+                "/job/root/1/api/json": build(
+                    children=[triggered("slow", 1), triggered("fast", 1)]
+                ),
+                "/job/slow/1/api/json": build(),
+                "/job/fast/1/api/json": build(children=[triggered("deep", 1)]),
+                "/job/deep/1/api/json": build(children=[triggered("deeper", 1)]),
+                "/job/deeper/1/api/json": build(),
+            },
+            delays={"/job/slow/1/api/json": 0.3},
+        )
+
+    def test_deep_branch_does_not_wait_for_slow_sibling(self, uneven_session):
+        discoverer = SubBuildDiscoverer(FakeConnection(uneven_session))
+
+        sub_builds = discoverer.discover_subbuilds("root", 1)
+
+        assert {sb.job_name for sb in sub_builds} == {
+            "slow",
+            "fast",
+            "deep",
+            "deeper",
+        }
+        slow_done = uneven_session.finished["/job/slow/1/api/json"]
+        assert uneven_session.started["/job/deeper/1/api/json"] < slow_done
+
+    def test_reports_per_depth_timing(self, uneven_session):
+        discoverer = SubBuildDiscoverer(FakeConnection(uneven_session))
+        discoverer.discover_subbuilds("root", 1)
+
+        stats = discoverer.traversal_stats()
+        assert [(level["depth"], level["builds"]) for level in stats] == [
+            (0, 1),
+            (1, 2),
+            (2, 1),
+            (3, 1),
+        ]
+        # Depth 1 is held open by the slow build, depth 2 starts before it ends
+        assert stats[2]["first_submitted"] < stats[1]["last_completed"]
+
+    def test_respects_max_depth(self, uneven_session):
+        discoverer = SubBuildDiscoverer(FakeConnection(uneven_session))
+
+        sub_builds = discoverer.discover_subbuilds("root", 1, max_depth=2)
+
+        assert {sb.job_name for sb in sub_builds} == {"slow", "fast", "deep"}
+        assert "/job/deep/1/api/json" not in uneven_session.started
+
+
+class TestFailureDirectedDiscovery:
+    """Only failed (and optionally running) subtrees are expanded"""
+
+    @pytest.fixture
+    def release_session(self) -> FakeSession:
+        # Five green components with their own subtrees, one red and one running
+        routes = {
+            "/job/release/1/api/json": build(
+                result="FAILURE",
+                children=[triggered(f"green{i}", 1, "SUCCESS") for i in range(5)]
+                + [triggered("red", 1, "FAILURE"), triggered("busy", 1, None, True)],
+            ),
+            "/job/red/1/api/json": build(
+                result="FAILURE",
+                children=[
+                    triggered("unit", 1, "SUCCESS"),
+                    triggered("it", 1, "UNSTABLE"),
+                ],
+            ),
+            "/job/it/1/api/json": build(result="UNSTABLE"),
+            "/job/busy/1/api/json": build(result=None),
+        }
+        for i in range(5):
+            routes[f"/job/green{i}/1/api/json"] = build(
+                children=[triggered(f"green{i}-part", 1, "SUCCESS")]
+            )
+        return FakeSession(routes)
+
+    def queried(self, session: FakeSession) -> List[str]:
+        return sorted(url[len(URL) :] for url, _ in session.requests)
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_green_subtrees_are_collapsed(self, release_session, parallel):
+        discoverer = SubBuildDiscoverer(FakeConnection(release_session))
+
+        sub_builds = discoverer.discover_subbuilds(
+            "release", 1, parallel=parallel, failures_only=True
+        )
+
+        assert self.queried(release_session) == [
+            "/job/it/1/api/json",
+            "/job/red/1/api/json",
+            "/job/release/1/api/json",
+        ]
+        collapsed = {sb.job_name for sb in sub_builds if sb.collapsed}
+        assert collapsed == {f"green{i}" for i in range(5)} | {"unit", "busy"}
+        assert {sb.job_name for sb in sub_builds if not sb.collapsed} == {"red", "it"}
+
+    def test_running_subtrees_expanded_on_request(self, release_session):
+        discoverer = SubBuildDiscoverer(FakeConnection(release_session))
+
+        sub_builds = discoverer.discover_subbuilds(
+            "release", 1, failures_only=True, expand_running=True
+        )
+
+        assert "/job/busy/1/api/json" in self.queried(release_session)
+        assert not any(sb.collapsed for sb in sub_builds if sb.job_name == "busy")
+
+    def test_full_traversal_is_default(self, release_session):
+        discoverer = SubBuildDiscoverer(FakeConnection(release_session))
+
+        sub_builds = discoverer.discover_subbuilds("release", 1)
+
+        assert len(release_session.requests) == 15
+        assert not any(sb.collapsed for sb in sub_builds)
+
+    def test_find_failed_subbuilds_uses_projected_statuses(self, release_session):
+        connection = FakeConnection(release_session)
+        discoverer = SubBuildDiscoverer(connection)
+
+        failed = discoverer.find_failed_subbuilds("release", 1)
+
+        assert [(sb.job_name, sb.status) for sb in failed] == [
+            ("it", "UNSTABLE"),
+            ("red", "FAILURE"),
+        ]
+        assert len(release_session.requests) == 15
+        assert connection.build_info_calls == []
+
+    def test_find_failed_subbuilds_sees_through_running_and_green_parents(self):
+        session = FakeSession(
+            {
+                "/job/root/1/api/json": build(
+                    result=None,
+                    children=[
+                        triggered("wrapper", 1, None, True),
+                        triggered("nightly", 1, "SUCCESS"),
+                    ],
+                ),
+                "/job/wrapper/1/api/json": build(
+                    result=None, children=[triggered("lint", 1, "FAILURE")]
+                ),
+                "/job/lint/1/api/json": build(result="FAILURE"),
+                # Triggered with propagate: false, so its parent stayed green
+                "/job/nightly/1/api/json": build(
+                    children=[triggered("perf", 1, "UNSTABLE")]
+                ),
+                "/job/perf/1/api/json": build(result="UNSTABLE"),
+            }
+        )
+        discoverer = SubBuildDiscoverer(FakeConnection(session))
+
+        failed = discoverer.find_failed_subbuilds("root", 1)
+
+        assert sorted(sb.job_name for sb in failed) == ["lint", "perf"]
+
+    def test_unknown_children_are_expanded(self):
+        session = FakeSession(
+            {
+                "/job/root/1/api/json": build(
+                    result="FAILURE", children=[triggered("queued", 1)]
+                ),
+                "/job/queued/1/api/json": build(
+                    result="FAILURE", children=[triggered("leaf", 1, "FAILURE")]
+                ),
+                "/job/leaf/1/api/json": build(result="FAILURE"),
+            }
+        )
+        discoverer = SubBuildDiscoverer(FakeConnection(session))
+
+        sub_builds = discoverer.discover_subbuilds("root", 1, failures_only=True)
+
+        assert "leaf" in {sb.job_name for sb in sub_builds if not sb.collapsed}